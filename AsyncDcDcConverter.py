@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+@package AsyncDcDcConverter
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief asyncio client for DC-DC converters from Mini-Box.com
+"""
+
+import asyncio
+import logging
+
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+if __package__:
+    from .DcDcConverter import DcDcConverter
+else:
+    from DcDcConverter import DcDcConverter
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#DcDcConverter methods mirrored one to one as coroutines
+OFFLOADED_METHODS = (
+    'OpenDevice', 'OpenDeviceByCnt', 'GetDevicePath', 'CloseDevice', 'GetConnected',
+    'GetTimeCfg', 'GetVoltageCfg', 'GetMode', 'GetState', 'GetVin', 'GetVIgn', 'GetVOut',
+    'GetEnabledPowerSwitch', 'GetEnabledOutput', 'GetEnabledAuxVOut',
+    'GetFlagsStatus1', 'GetFlagsStatus2', 'GetFlagsVoltage', 'GetFlagsTimer', 'GetFlashPointer',
+    'GetTimerWait', 'GetTimerVout', 'GetTimerVAux', 'GetTimerPwSwitch', 'GetTimerOffDelay',
+    'GetTimerHardOff', 'GetVersionMajor', 'GetVersionMinor', 'GetVersion', 'GetRefreshEpoch',
+    'GetSnapshot', 'GetSnapshotInto', 'GetSnapshotBatch',
+    'SetEnabledAuxVOut', 'SetEnabledPowerSwitch', 'SetEnabledOutput',
+    'IncDecVOutVolatile', 'SetVOutVolatile',
+    'GetLoadState', 'GetMaxVariableCnt', 'GetVariableData', 'GetVariableTable', 'SetVariableData',
+    'SaveFlashValues', 'ApplyProfile', 'RestoreVolatileSettings',
+)
+
+#Bounds of the backoff between GetLoadState polls (seconds)
+LOAD_POLL_MIN = 0.01
+LOAD_POLL_MAX = 0.25
+##@endcond
+
+
+class AsyncDcDcConverter(object):
+    """asyncio version of DcDcConverter.
+
+        Every DcDcConverter method is available as a coroutine with the same name and arguments,
+        except FlashTransaction, which returns an async context manager.
+        The blocking calls into the backend run on one dedicated worker thread, which also keeps
+        them serialised, so the event loop never waits on USB I/O.
+
+        Usage:
+
+            converter = await AsyncDcDcConverter.open(1, 1, 5)
+            snapshot = await converter.GetSnapshot()
+            await converter.close()
+    """
+
+    def __init__(self, devcount, timer, connectiontimeout, backend=None):
+        """Create the client without connecting.
+
+            @param devcount number of device to be opened
+            @param timer period (seconds) for API data refresh rate
+            @param connectiontimeout how long to keep trying to connect (seconds)
+            @param backend transport (see DcDcBackends), defaults to the DCDCUsbLib DLL
+
+            @see connect
+        """
+        self.converter = DcDcConverter(devcount, timer, connectiontimeout, backend, connect=False)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='DcDcIO')
+
+    @classmethod
+    async def open(cls, devcount, timer, connectiontimeout, backend=None):
+        """Create a client and connect it.
+
+            @return connected AsyncDcDcConverter
+
+            @exception ConnectionError no converter was found
+        """
+        client = cls(devcount, timer, connectiontimeout, backend)
+        await client.connect()
+        return client
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self):
+        """Connect to the converter without blocking the event loop.
+
+            @see DcDcConverter.Connect
+
+            @exception ConnectionError no converter was found
+        """
+        await asyncio.wrap_future(self.converter.Connect())
+
+    async def Reconnect(self):
+        """Close the device and connect again, without blocking the event loop.
+
+            @see DcDcConverter.Reconnect
+
+            @exception ConnectionError no converter was found
+        """
+        await asyncio.wrap_future(await self._call(self.converter.Reconnect))
+
+    def FlashTransaction(self, *args):
+        """Stage flash variable edits and save the flash at most once.
+
+                async with converter.FlashTransaction() as flash:
+                    flash.set('VOut', 12.5)
+
+            @see DcDcConverter.FlashTransaction
+
+            @param args same as DcDcConverter.FlashTransaction
+
+            @return AsyncFlashTransaction
+        """
+        return AsyncFlashTransaction(self, self.converter.FlashTransaction(*args))
+
+    async def close(self):
+        """Close the device and stop the worker thread."""
+        await self._call(self.converter.CloseDevice)
+        self._executor.shutdown(wait=False)
+
+    async def LoadFlashValues(self, wait=False, timeout=None):
+        """Start loading the flash values, like DcDcConverter.LoadFlashValues.
+
+            With wait, GetLoadState is polled on the worker thread with a backoff between polls,
+            so the caller simply awaits completion.
+
+            @param wait if True, return only once loading has completed
+            @param timeout maximum time to wait (seconds), None to wait forever
+
+            @return final loading state (100) with wait, otherwise None
+
+            @exception asyncio.TimeoutError loading did not complete in time
+        """
+        await self._call(self.converter.LoadFlashValues)
+        if wait:
+            return await asyncio.wait_for(self._waitLoaded(), timeout)
+
+    async def _waitLoaded(self):
+        delay = LOAD_POLL_MIN
+        while True:
+            state = await self._call(self.converter.GetLoadState)
+            if state >= 100:
+                return state
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LOAD_POLL_MAX)
+
+    def _call(self, function, *args):
+        """Run a blocking function on the worker thread.
+
+            @return asyncio future of the result
+        """
+        return asyncio.get_running_loop().run_in_executor(self._executor, partial(function, *args))
+
+
+class AsyncFlashTransaction(object):
+    """Async context manager around a DcDcFlash.FlashTransaction.
+
+        Loading the flash values on entry and writing them on exit run on the converter's worker
+        thread. Inside the block, set() only stages values in memory and does not block.
+    """
+
+    def __init__(self, client, transaction):
+        self.client = client
+        self.transaction = transaction
+
+    async def __aenter__(self):
+        await self.client._call(self._begin)
+        return self.transaction
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.client._call(self.transaction.commit)
+        else:
+            self.transaction.discard()
+
+    def _begin(self):
+        self.transaction.begin()
+        #Read the variable table now, so set() finds it cached
+        self.transaction.converter.GetVariableTable()
+
+
+def _offload(name):
+    async def method(self, *args):
+        return await self._call(getattr(self.converter, name), *args)
+    method.__name__ = name
+    method.__doc__ = getattr(DcDcConverter, name).__doc__
+    return method
+
+for _name in OFFLOADED_METHODS:
+    setattr(AsyncDcDcConverter, _name, _offload(_name))
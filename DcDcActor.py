@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcActor
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Command actor serialising every DCDCUsbLib call on one thread, with priorities
+"""
+
+import logging
+import threading
+
+from time import monotonic
+from itertools import count
+from queue import PriorityQueue
+from concurrent.futures import Future
+
+if __package__:
+    from .DcDcBackends import LibraryLayer, LibraryProxy, FUNCTION_NAMES
+else:
+    from DcDcBackends import LibraryLayer, LibraryProxy, FUNCTION_NAMES
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Call priorities, lowest first
+PRIORITY_STOP = -1
+PRIORITY_CONTROL = 0
+PRIORITY_COMMAND = 1
+PRIORITY_READ = 2
+
+#Commands that switch or adjust the output and must not wait behind telemetry reads
+CONTROL_COMMANDS = frozenset((
+    'SetEnabledOutput', 'SetEnabledPowerSwitch', 'SetEnabledAuxVOut',
+    'SetVOutVolatile', 'IncDecVOutVolatile', 'CloseDevice',
+))
+##@endcond
+
+
+def priorityOf(name):
+    """Get the default priority of a DcDcConverter method or DCDCUsbLib function.
+
+        @param name method name ('SetEnabledOutput') or library function name ('dcdcSetEnabledOutput')
+
+        @return PRIORITY_CONTROL, PRIORITY_COMMAND or PRIORITY_READ
+    """
+    if name.startswith('dcdc'):
+        name = name[4:]
+    if name in CONTROL_COMMANDS:
+        return PRIORITY_CONTROL
+    if name.startswith('Get') or name == 'read_state':
+        return PRIORITY_READ
+    return PRIORITY_COMMAND
+
+
+class CommandActor(LibraryLayer):
+    """Run every library call on one dedicated thread, most urgent first.
+
+        DCDCUsbLib keeps global state and is not documented as thread safe. With the actor
+        layer in place, calls from any thread are queued and executed one at a time by the actor
+        thread. Control commands (output, power switch, VOut) jump ahead of queued reads, so a
+        power cut is not held up by a backlog of monitoring traffic.
+
+        Calls made through DcDcConverter block until they have run. submit() returns a future
+        instead, optionally with a deadline after which the call is dropped if it has not
+        started.
+
+        @see DcDcConverter.EnableCommandActor
+    """
+
+    order = 30
+
+    def __init__(self):
+        self._queue = PriorityQueue()
+        self._sequence = count()
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='DcDcActor', daemon=True)
+        self._thread.start()
+
+    def wrap(self, library):
+        proxy = LibraryProxy(library)
+        for name in FUNCTION_NAMES + ('read_state',):
+            setattr(proxy, name, self._serialised(name, getattr(library, name)))
+        return proxy
+
+    def submit(self, function, *args, priority=None, timeout=None):
+        """Queue a call for the actor thread.
+
+            @param function callable to run, e.g. converter.SetEnabledOutput
+            @param args arguments
+            @param priority PRIORITY_CONTROL, PRIORITY_COMMAND or PRIORITY_READ; defaults to priorityOf(function name)
+            @param timeout drop the call if it has not started within this many seconds
+
+            @return concurrent.futures.Future of the result (raises TimeoutError if dropped)
+
+            @exception RuntimeError the actor has been stopped
+        """
+        if priority is None:
+            priority = priorityOf(getattr(function, '__name__', ''))
+        deadline = None if timeout is None else monotonic() + timeout
+
+        future = Future()
+        if threading.current_thread() is self._thread:
+            #Called from a call already running on the actor: run it now
+            self._execute(future, function, args, deadline)
+        else:
+            with self._lock:
+                if self._stopped:
+                    raise RuntimeError("Command actor is stopped")
+                self._queue.put((priority, next(self._sequence), future, function, args, deadline))
+        return future
+
+    def stop(self):
+        """Stop the actor thread; calls still queued are cancelled and later calls raise RuntimeError."""
+        with self._lock:
+            if not self._stopped:
+                self._stopped = True
+                self._queue.put((PRIORITY_STOP, next(self._sequence), Future(), None, (), None))
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def close(self):
+        """Stop the actor thread, see stop(); called when the layer is removed from its converter."""
+        self.stop()
+
+    def _serialised(self, name, function):
+        priority = priorityOf(name)
+
+        def call(*args):
+            if threading.current_thread() is self._thread:
+                return function(*args)
+            return self.submit(function, *args, priority=priority).result()
+
+        call.__name__ = name
+        return call
+
+    def _execute(self, future, function, args, deadline):
+        if not future.set_running_or_notify_cancel():
+            return
+        if deadline is not None and monotonic() > deadline:
+            future.set_exception(TimeoutError("Call was not started before its deadline"))
+            return
+        try:
+            future.set_result(function(*args))
+        except BaseException as err:
+            future.set_exception(err)
+
+    def _run(self):
+        while True:
+            priority, sequence, future, function, args, deadline = self._queue.get()
+            if priority == PRIORITY_STOP:
+                break
+            self._execute(future, function, args, deadline)
+
+        while not self._queue.empty():
+            self._queue.get()[2].cancel()
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcAnalytics
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Vectorized analytics over recorded telemetry: downsampling, segmentation and state durations
+
+Every function takes whole arrays of samples (TelemetryLog records, or columns() of a
+DcDcSampler window) and runs without Python-level loops over samples. TelemetrySummary
+computes the same results chunk by chunk, carrying state across chunk boundaries, so
+summarise() can go through a log far larger than memory:
+
+    summary = summarise(TelemetryLog('/var/log/dcdc'), interval=3600)
+    summary.ignition_cycles, summary.stateDurations(), summary.downsampled('vin')
+
+Requires NumPy.
+"""
+
+import logging
+
+from collections import namedtuple
+
+import numpy
+
+if __package__:
+    from .DcDcSnapshot import SNAPSHOT_COLUMNS
+else:
+    from DcDcSnapshot import SNAPSHOT_COLUMNS
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Defaults matching the converter's factory flash settings (VInLow, VIgnHigh, VIgnLow)
+BROWNOUT_THRESHOLD = 10.5
+IGNITION_ON = 11.0
+IGNITION_OFF = 10.5
+
+#Rows processed at a time by summarise
+DEFAULT_CHUNK_ROWS = 1 << 20
+##@endcond
+
+
+class Downsampled(namedtuple('Downsampled', ('time', 'min', 'max', 'mean', 'count'))):
+    """Per-interval statistics of one variable; every field is an array with one entry per interval
+        holding samples (time is the start of the interval)."""
+
+    __slots__ = ()
+
+
+def columns(window):
+    """Split a 2D snapshot array (e.g. DcDcSampler.window()) into named columns.
+
+        @param window array-like shaped (rows, SNAPSHOT_WIDTH)
+
+        @return dict of field name to column view
+    """
+    window = numpy.asarray(window)
+    return dict((field, window[:, column]) for field, column in SNAPSHOT_COLUMNS.items())
+
+def downsample(timestamps, values, interval, origin=0.0):
+    """Min, max and mean of a variable per time interval.
+
+        @param timestamps sorted sample times (seconds)
+        @param values sample values
+        @param interval interval length (seconds)
+        @param origin start of the first interval boundary (seconds)
+
+        @return Downsampled
+    """
+    buckets, minimum, maximum, total, count = _buckets(timestamps, values, interval, origin)
+    return Downsampled(buckets * interval + origin, minimum, maximum, total / numpy.maximum(count, 1), count)
+
+def runs(mask):
+    """Find the runs of True in a boolean array.
+
+        @param mask boolean array
+
+        @return (starts, ends) index arrays, ends exclusive
+    """
+    edges = numpy.diff(numpy.concatenate(([0], numpy.asarray(mask, dtype=numpy.int8), [0])))
+    return numpy.flatnonzero(edges == 1), numpy.flatnonzero(edges == -1)
+
+def segments(timestamps, mask, min_duration=0.0):
+    """Time spans during which a condition holds.
+
+        A span ends at the first sample where the condition no longer holds (or at the last
+        sample if it holds until the end).
+
+        @param timestamps sorted sample times (seconds)
+        @param mask boolean array, True where the condition holds
+        @param min_duration drop spans shorter than this (seconds)
+
+        @return (start_times, end_times) arrays
+    """
+    timestamps = numpy.asarray(timestamps)
+    if not len(timestamps):
+        return timestamps[:0], timestamps[:0]
+    starts, ends = runs(mask)
+    start_times = timestamps[starts]
+    end_times = timestamps[numpy.minimum(ends, len(timestamps) - 1)]
+    keep = end_times - start_times >= min_duration
+    return start_times[keep], end_times[keep]
+
+def hysteresis(values, on, off, initial=0):
+    """Two-level switch: 1 from a value >= on until a value <= off, 0 from then on.
+
+        @param values sample values
+        @param on level switching on
+        @param off level switching off (at most on)
+        @param initial state before the first sample
+
+        @return int8 array of 0/1 states
+    """
+    values = numpy.asarray(values)
+    state = numpy.full(len(values), -1, dtype=numpy.int8)
+    state[values >= on] = 1
+    state[values <= off] = 0
+    #Samples between the levels keep the state of the last sample outside them
+    known = numpy.where(state >= 0, numpy.arange(len(values)), -1)
+    numpy.maximum.accumulate(known, out=known)
+    filled = numpy.where(known >= 0, state[numpy.maximum(known, 0)], initial)
+    return filled.astype(numpy.int8)
+
+def brownouts(timestamps, vin, threshold=BROWNOUT_THRESHOLD, min_duration=0.0):
+    """Spans where the input voltage is below a threshold.
+
+        @param timestamps sorted sample times (seconds)
+        @param vin input voltage samples
+        @param threshold brownout voltage (V)
+        @param min_duration drop spans shorter than this (seconds)
+
+        @return (start_times, end_times) arrays
+    """
+    return segments(timestamps, numpy.asarray(vin) < threshold, min_duration)
+
+def ignitionCycles(timestamps, vign, on=IGNITION_ON, off=IGNITION_OFF, initial=0):
+    """Count ignition cycles, with hysteresis between the on and off levels.
+
+        @param timestamps sorted sample times (seconds)
+        @param vign ignition voltage samples
+        @param on ignition voltage considered ON (V)
+        @param off ignition voltage considered OFF (V)
+        @param initial ignition state before the first sample
+
+        @return (number of OFF to ON transitions, (start_times, end_times) of the ON spans)
+    """
+    state = hysteresis(vign, on, off, initial)
+    count = int(numpy.count_nonzero(numpy.diff(numpy.concatenate(([initial], state))) == 1))
+    return count, segments(timestamps, state == 1)
+
+def stateDurations(timestamps, states, max_gap=None):
+    """Time spent in each value of an enumerated variable (e.g. 'state' or 'mode').
+
+        Each interval between two samples is counted towards the value of the first one.
+
+        @param timestamps sorted sample times (seconds)
+        @param states values (0-255)
+        @param max_gap ignore intervals longer than this, e.g. while the logger was down (seconds)
+
+        @return array of 256 durations (seconds), indexed by value
+    """
+    timestamps = numpy.asarray(timestamps, dtype=numpy.float64)
+    states = numpy.asarray(states).astype(numpy.int64) & 0xFF
+    intervals = numpy.diff(timestamps)
+    if max_gap is not None:
+        intervals = numpy.where(intervals > max_gap, 0.0, intervals)
+    return numpy.bincount(states[:-1], weights=intervals, minlength=256)
+
+def _buckets(timestamps, values, interval, origin):
+    timestamps = numpy.asarray(timestamps, dtype=numpy.float64)
+    values = numpy.asarray(values, dtype=numpy.float64)
+    if not len(values):
+        empty = numpy.zeros(0)
+        return empty.astype(numpy.int64), empty, empty, empty, empty.astype(numpy.int64)
+    buckets = numpy.floor((timestamps - origin) / interval).astype(numpy.int64)
+    starts = numpy.flatnonzero(numpy.concatenate(([True], buckets[1:] != buckets[:-1])))
+    count = numpy.diff(numpy.append(starts, len(values)))
+    return (
+        buckets[starts],
+        numpy.minimum.reduceat(values, starts),
+        numpy.maximum.reduceat(values, starts),
+        numpy.add.reduceat(values, starts),
+        count,
+    )
+
+
+class TelemetrySummary(object):
+    """Streaming summary of telemetry fed in time-ordered chunks.
+
+        Produces the same results as the module functions applied to the concatenated data:
+        downsampled fields, brownouts, ignition cycles and state durations. Memory use only
+        grows with the number of intervals and events, not with the number of samples.
+    """
+
+    def __init__(self, interval=60.0, fields=('vin', 'vout'), brownout_threshold=BROWNOUT_THRESHOLD,
+                 brownout_min_duration=0.0, ignition_on=IGNITION_ON, ignition_off=IGNITION_OFF, max_gap=None):
+        """Create an empty summary.
+
+            @param interval downsampling interval (seconds)
+            @param fields fields to downsample
+            @param brownout_threshold input voltage below which a brownout is recorded (V)
+            @param brownout_min_duration shortest brownout recorded (seconds)
+            @param ignition_on ignition voltage considered ON (V)
+            @param ignition_off ignition voltage considered OFF (V)
+            @param max_gap intervals between samples longer than this are not counted in state durations (seconds)
+        """
+        self.interval = interval
+        self.fields = tuple(fields)
+        self.brownout_threshold = brownout_threshold
+        self.brownout_min_duration = brownout_min_duration
+        self.ignition_on = ignition_on
+        self.ignition_off = ignition_off
+        self.max_gap = max_gap
+
+        self.samples = 0
+        self.first_time = None
+        self.last_time = None
+        self.ignition_cycles = 0
+
+        self._state_durations = numpy.zeros(256)
+        self._mode_durations = numpy.zeros(256)
+        self._last_state = None
+        self._last_mode = None
+        self._ignition = 0
+        self._brownout_start = None
+        self._brownouts = []
+        self._buckets = dict((field, []) for field in self.fields)
+
+    def update(self, records):
+        """Add the next chunk of samples.
+
+            @param records structured array (TelemetryLog records) or dict of columns, with at
+                   least timestamp, vin, vign, state, mode and the downsampled fields
+        """
+        timestamps = numpy.asarray(records['timestamp'], dtype=numpy.float64)
+        count = len(timestamps)
+        if not count:
+            return
+
+        #Carry the previous chunk's last sample so intervals across the boundary are counted
+        if self.last_time is not None:
+            carried = numpy.concatenate(([self.last_time], timestamps))
+            self._state_durations += stateDurations(carried, numpy.concatenate(([self._last_state], records['state'])), self.max_gap)
+            self._mode_durations += stateDurations(carried, numpy.concatenate(([self._last_mode], records['mode'])), self.max_gap)
+        else:
+            self.first_time = timestamps[0]
+            self._state_durations += stateDurations(timestamps, records['state'], self.max_gap)
+            self._mode_durations += stateDurations(timestamps, records['mode'], self.max_gap)
+
+        state = hysteresis(records['vign'], self.ignition_on, self.ignition_off, self._ignition)
+        self.ignition_cycles += int(numpy.count_nonzero(numpy.diff(numpy.concatenate(([self._ignition], state))) == 1))
+        self._ignition = int(state[-1])
+
+        self._updateBrownouts(timestamps, numpy.asarray(records['vin']) < self.brownout_threshold)
+
+        for field in self.fields:
+            chunk = _buckets(timestamps, records[field], self.interval, 0.0)
+            stored = self._buckets[field]
+            if stored and stored[-1][0][-1] == chunk[0][0]:
+                #The first interval continues the previous chunk's last one: merge them
+                previous = stored.pop()
+                merged = (
+                    chunk[0],
+                    numpy.concatenate(([min(previous[1][-1], chunk[1][0])], chunk[1][1:])),
+                    numpy.concatenate(([max(previous[2][-1], chunk[2][0])], chunk[2][1:])),
+                    numpy.concatenate(([previous[3][-1] + chunk[3][0]], chunk[3][1:])),
+                    numpy.concatenate(([previous[4][-1] + chunk[4][0]], chunk[4][1:])),
+                )
+                if len(previous[0]) > 1:
+                    stored.append(tuple(part[:-1] for part in previous))
+                chunk = merged
+            stored.append(chunk)
+
+        self.samples += count
+        self.last_time = timestamps[-1]
+        self._last_state = int(records['state'][-1])
+        self._last_mode = int(records['mode'][-1])
+
+    def _updateBrownouts(self, timestamps, mask):
+        starts, ends = runs(mask)
+        start_times = list(timestamps[starts])
+        end_times = list(timestamps[numpy.minimum(ends, len(timestamps) - 1)])
+
+        if self._brownout_start is not None:
+            if len(starts) and starts[0] == 0:
+                start_times[0] = self._brownout_start
+            else:
+                #The brownout ended exactly at the chunk boundary
+                start_times.insert(0, self._brownout_start)
+                end_times.insert(0, timestamps[0])
+            self._brownout_start = None
+
+        if len(ends) and ends[-1] == len(timestamps):
+            #Still in a brownout at the end of the chunk: finish it with a later chunk
+            self._brownout_start = start_times.pop()
+            end_times.pop()
+
+        for start, end in zip(start_times, end_times):
+            if end - start >= self.brownout_min_duration:
+                self._brownouts.append((start, end))
+
+    def downsampled(self, field):
+        """@return Downsampled statistics of a field over everything fed so far"""
+        parts = self._buckets[field]
+        if not parts:
+            return downsample([], [], self.interval)
+        buckets, minimum, maximum, total, count = (numpy.concatenate(part) for part in zip(*parts))
+        return Downsampled(buckets * self.interval, minimum, maximum, total / count, count)
+
+    def brownouts(self):
+        """@return list of (start, end) times of the brownouts, including one still in progress"""
+        brownouts = list(self._brownouts)
+        if self._brownout_start is not None and self.last_time - self._brownout_start >= self.brownout_min_duration:
+            brownouts.append((self._brownout_start, self.last_time))
+        return brownouts
+
+    def stateDurations(self, field='state'):
+        """@return dict of value to time spent in it (seconds), for 'state' or 'mode'"""
+        durations = self._state_durations if field == 'state' else self._mode_durations
+        return dict((int(value), float(durations[value])) for value in numpy.flatnonzero(durations))
+
+    def as_dict(self):
+        """@return the summary as a JSON-friendly dict"""
+        result = {
+            'samples': self.samples,
+            'first_time': None if self.first_time is None else float(self.first_time),
+            'last_time': None if self.last_time is None else float(self.last_time),
+            'ignition_cycles': self.ignition_cycles,
+            'brownouts': [(float(start), float(end)) for start, end in self.brownouts()],
+            'state_durations': self.stateDurations('state'),
+            'mode_durations': self.stateDurations('mode'),
+        }
+        for field in self.fields:
+            result[field] = dict((name, values.tolist()) for name, values in self.downsampled(field)._asdict().items())
+        return result
+
+
+def summarise(log, start=None, end=None, chunk_rows=DEFAULT_CHUNK_ROWS, **kwargs):
+    """Summarise a telemetry log in chunks, never holding more than chunk_rows samples in memory.
+
+        @param log DcDcTelemetryLog.TelemetryLog
+        @param start first timestamp to include, None for the beginning
+        @param end timestamp to stop before, None for the end
+        @param chunk_rows samples processed at a time
+        @param kwargs passed to TelemetrySummary
+
+        @return TelemetrySummary
+    """
+    summary = TelemetrySummary(**kwargs)
+    for records in log.read(start, end):
+        for row in range(0, len(records), chunk_rows):
+            summary.update(records[row:row + chunk_rows])
+    return summary
@@ -0,0 +1,646 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcBackends
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Transport backends used by the DcDcConverter class
+
+A backend is any object exposing the dcdcXXX functions of DCDCUsbLib with the same
+arguments and return values as the DLL. DcDcConverter only ever talks to its backend
+through these names, so the Windows DLL, the native Linux HID transport and the simulated
+device in DcDcSimulator are interchangeable.
+"""
+
+import os
+import select
+import struct
+import logging
+import threading
+
+from time import sleep, monotonic
+from ctypes import *
+
+##@cond
+logger = logging.getLogger(__name__)
+
+module_path = os.path.dirname(os.path.abspath(__file__))
+
+#Every function exported by DCDCUsbLib that DcDcConverter uses
+FUNCTION_NAMES = (
+    'dcdcOpenDevice', 'dcdcOpenDeviceByCnt', 'dcdcGetDevicePath', 'dcdcCloseDevice',
+    'dcdcGetConnected', 'dcdcGetTimeCfg', 'dcdcGetVoltageCfg', 'dcdcGetMode', 'dcdcGetState',
+    'dcdcGetVin', 'dcdcGetVIgn', 'dcdcGetVOut',
+    'dcdcGetEnabledPowerSwitch', 'dcdcGetEnabledOutput', 'dcdcGetEnabledAuxVOut',
+    'dcdcGetFlagsStatus1', 'dcdcGetFlagsStatus2', 'dcdcGetFlagsVoltage', 'dcdcGetFlagsTimer',
+    'dcdcGetFlashPointer',
+    'dcdcGetTimerWait', 'dcdcGetTimerVout', 'dcdcGetTimerVAux', 'dcdcGetTimerPwSwitch',
+    'dcdcGetTimerOffDelay', 'dcdcGetTimerHardOff',
+    'dcdcGetVersionMajor', 'dcdcGetVersionMinor',
+    'dcdcSetEnabledAuxVOut', 'dcdcSetEnabledPowerSwitch', 'dcdcSetEnabledOutput',
+    'dcdcIncDecVOutVolatile', 'dcdcSetVOutVolatile',
+    'dcdcLoadFlashValues', 'dcdcGetLoadState', 'dcdcGetMaxVariableCnt',
+    'dcdcGetVariableData', 'dcdcSetVariableData', 'dcdcSaveFlashValues',
+)
+
+#DCDCUsbLib function prototypes as (name, return type, argument types), applied once when the
+#DLL is loaded. This avoids passing incorrect data types to the DCDCUsbLib functions, and saves
+#having to cast arguments when functions are called.
+PROTOTYPES = (
+    #Device initialisation commands
+    ('dcdcOpenDevice', c_ubyte, [c_uint]),
+    ('dcdcOpenDeviceByCnt', c_ubyte, [c_uint, c_uint]),
+    ('dcdcGetDevicePath', None, [c_char_p]),
+    ('dcdcCloseDevice', None, None),
+
+    #Get commands
+    ('dcdcGetConnected', c_ubyte, None),
+    ('dcdcGetTimeCfg', c_ubyte, None),
+    ('dcdcGetVoltageCfg', c_ubyte, None),
+    ('dcdcGetMode', c_ubyte, None),
+    ('dcdcGetState', c_ubyte, None),
+    ('dcdcGetVin', c_float, None),
+    ('dcdcGetVIgn', c_float, None),
+    ('dcdcGetVOut', c_float, None),
+    ('dcdcGetEnabledPowerSwitch', c_ubyte, None),
+    ('dcdcGetEnabledOutput', c_ubyte, None),
+    ('dcdcGetEnabledAuxVOut', c_ubyte, None),
+    ('dcdcGetFlagsStatus1', c_ubyte, None),
+    ('dcdcGetFlagsStatus2', c_ubyte, None),
+    ('dcdcGetFlagsVoltage', c_ubyte, None),
+    ('dcdcGetFlagsTimer', c_ubyte, None),
+    ('dcdcGetFlashPointer', c_ubyte, None),
+    ('dcdcGetTimerWait', c_uint, None),
+    ('dcdcGetTimerVout', c_uint, None),
+    ('dcdcGetTimerVAux', c_uint, None),
+    ('dcdcGetTimerPwSwitch', c_uint, None),
+    ('dcdcGetTimerOffDelay', c_uint, None),
+    ('dcdcGetTimerHardOff', c_uint, None),
+    ('dcdcGetVersionMajor', c_ubyte, None),
+    ('dcdcGetVersionMinor', c_ubyte, None),
+
+    #Set commands
+    ('dcdcSetEnabledAuxVOut', None, [c_ubyte]),
+    ('dcdcSetEnabledPowerSwitch', None, [c_ubyte]),
+    ('dcdcSetEnabledOutput', None, [c_ubyte]),
+    ('dcdcIncDecVOutVolatile', None, [c_ubyte]),
+    ('dcdcSetVOutVolatile', None, [c_float]),
+    ('dcdcLoadFlashValues', None, None),
+    ('dcdcGetLoadState', c_ubyte, None),
+    ('dcdcGetMaxVariableCnt', c_uint, None),
+    ('dcdcGetVariableData', c_ubyte, [c_uint, c_char_p, c_char_p, c_char_p, c_char_p]),
+    ('dcdcSetVariableData', c_ubyte, [c_uint, c_char_p]),
+    ('dcdcSaveFlashValues', None, None),
+)
+
+#State getters and the key of the decoded state report they read from
+STATE_FUNCTIONS = (
+    ('dcdcGetTimeCfg', 'time_cfg'),
+    ('dcdcGetVoltageCfg', 'voltage_cfg'),
+    ('dcdcGetMode', 'mode'),
+    ('dcdcGetState', 'state'),
+    ('dcdcGetVin', 'vin'),
+    ('dcdcGetVIgn', 'vign'),
+    ('dcdcGetVOut', 'vout'),
+    ('dcdcGetEnabledPowerSwitch', 'enabled_power_switch'),
+    ('dcdcGetEnabledOutput', 'enabled_output'),
+    ('dcdcGetEnabledAuxVOut', 'enabled_aux_vout'),
+    ('dcdcGetFlagsStatus1', 'flags_status1'),
+    ('dcdcGetFlagsStatus2', 'flags_status2'),
+    ('dcdcGetFlagsVoltage', 'flags_voltage'),
+    ('dcdcGetFlagsTimer', 'flags_timer'),
+    ('dcdcGetFlashPointer', 'flash_pointer'),
+    ('dcdcGetTimerWait', 'timer_wait'),
+    ('dcdcGetTimerVout', 'timer_vout'),
+    ('dcdcGetTimerVAux', 'timer_vaux'),
+    ('dcdcGetTimerPwSwitch', 'timer_pw_switch'),
+    ('dcdcGetTimerOffDelay', 'timer_off_delay'),
+    ('dcdcGetTimerHardOff', 'timer_hard_off'),
+    ('dcdcGetVersionMajor', 'version_major'),
+    ('dcdcGetVersionMinor', 'version_minor'),
+)
+
+#State variables returned by read_state, in order (everything but the firmware version)
+SNAPSHOT_FUNCTIONS = tuple(
+    (name, key) for name, key in STATE_FUNCTIONS if not key.startswith('version')
+)
+
+_dll = None
+_dll_path = None
+#Bound DLL functions with their prototypes set, by name
+_dll_functions = None
+_dll_lock = threading.Lock()
+
+_libc = None
+##@endcond
+
+
+class UnsupportedOperation(NotImplementedError):
+    """The backend does not implement a DCDCUsbLib function (e.g. flash access over hidraw)."""
+
+
+def _unsupported(name):
+    def function(self, *args):
+        raise UnsupportedOperation("{} is not supported by {}".format(name, type(self).__name__))
+    function.__name__ = name
+    return function
+
+
+class DcDcBackend(object):
+    """Base class for DcDcConverter transports.
+
+        Subclasses implement the dcdcXXX functions they support; anything left out raises
+        UnsupportedOperation when called.
+    """
+
+    def refresh_count(self):
+        """Get the number of data refreshes completed since the device was opened.
+
+            @return Refresh count, or None if the backend cannot tell (the DLL refreshes internally)
+        """
+        return None
+
+    def wait_for_device(self, timeout):
+        """Wait for a device to be plugged in.
+
+            Backends with hotplug notifications return as soon as a device appears; the default
+            implementation just sleeps for the whole timeout.
+
+            @param timeout maximum time to wait (seconds)
+
+            @return True if a device appeared, False otherwise
+        """
+        sleep(timeout)
+        return False
+
+    def read_state(self):
+        """Read the connection state and every state variable in SNAPSHOT_FUNCTIONS order.
+
+            The default implementation calls each getter in turn; backends that receive the
+            whole state in one report override it to read everything in one go.
+
+            @return tuple (connected, state values...)
+        """
+        return (self.dcdcGetConnected(),) + tuple(getattr(self, name)() for name, key in SNAPSHOT_FUNCTIONS)
+
+for _name in FUNCTION_NAMES:
+    setattr(DcDcBackend, _name, _unsupported(_name))
+
+
+class DllBackend(DcDcBackend):
+    """Backend calling the Mini-Box DCDCUsbLib DLL through ctypes.
+
+        Only works on Windows with a 32-bit Python interpreter.
+    """
+
+    def __init__(self, path=None):
+        """Load DCDCUsbLib and bind its functions to the backend.
+
+            The DLL is loaded and its function prototypes are set up the first time a backend is
+            created in the process; further backends reuse the same bound functions.
+
+            @param path path to DCDCUsbLib.dll, defaults to the DLL folder next to this module
+
+            @exception OSError the DLL could not be loaded
+            @exception ValueError a DLL from another path is already loaded in this process
+        """
+        self.dll = _loadDll(path)
+        self.__dict__.update(_dll_functions)
+
+
+def _loadDll(path=None):
+    """Load DCDCUsbLib and set up its function prototypes, once per process.
+
+        @param path path to DCDCUsbLib.dll, defaults to the DLL folder next to this module
+
+        @return ctypes library handle
+
+        @exception ValueError a DLL from another path is already loaded
+    """
+    global _dll, _dll_path, _dll_functions
+
+    if path is None:
+        path = os.path.join(module_path, 'DLL', 'DCDCUsbLib.dll')
+    #Compared normalised, but loaded as given so bare DLL names still go through the library search
+    key = os.path.normcase(os.path.abspath(path))
+
+    with _dll_lock:
+        if _dll is not None and key != _dll_path:
+            raise ValueError("DCDCUsbLib is already loaded from {}".format(_dll_path))
+        if _dll is None:
+            try:
+                dll = cdll.LoadLibrary(path)
+                logger.info("DCDCUsbLib DLL loaded successfully")
+                logger.debug("Resource handle: {}".format(dll))
+            except OSError as err:
+                logger.error("DCDCUsbLib DLL could not be loaded")
+                raise err
+
+            functions = {}
+            for name, restype, argtypes in PROTOTYPES:
+                function = getattr(dll, name)
+                function.restype = restype
+                function.argtypes = argtypes
+                functions[name] = function
+            _dll_functions = functions
+            _dll_path = key
+            _dll = dll
+        return _dll
+
+
+class LibraryLayer(object):
+    """Base class for layers stacked between DcDcConverter and its backend.
+
+        A layer wraps the library object DcDcConverter calls (the backend, or the layer below)
+        in a proxy exposing the same dcdcXXX functions and read_state. Layers are stacked by
+        ascending order, the lowest order sitting closest to the backend.
+
+        @see DcDcConverter.AddLayer
+    """
+
+    ## Position in the stack, lowest closest to the backend
+    order = 0
+
+    def wrap(self, library):
+        """Wrap a library object.
+
+            @param library backend or proxy returned by the layer below
+
+            @return proxy exposing the same functions
+        """
+        return library
+
+    def close(self):
+        """Release what the layer holds (threads, files); called once it is removed from its converter."""
+        pass
+
+
+class LibraryProxy(object):
+    """Proxy forwarding every attribute it does not override to the wrapped library."""
+
+    def __init__(self, library):
+        self.library = library
+
+    def __getattr__(self, name):
+        return getattr(self.library, name)
+
+
+class ReportBackend(DcDcBackend):
+    """Base class for backends that decode every state variable from a single state report.
+
+        Subclasses store the latest decoded report in self._values (a dict keyed as in
+        STATE_FUNCTIONS) and every dcdcGetXXX state function becomes a dictionary lookup.
+        As with the DLL, the last values received are kept when the device goes away.
+    """
+
+    def __init__(self):
+        self._values = dict.fromkeys([key for name, key in STATE_FUNCTIONS], 0)
+        self._refresh_count = 0
+
+    def _report(self):
+        """Get the latest decoded state report.
+
+            @return dict of state values keyed as in STATE_FUNCTIONS
+        """
+        return self._values
+
+    def refresh_count(self):
+        """Get the number of state reports decoded since the device was opened.
+
+            @return Refresh count
+        """
+        return self._refresh_count
+
+    def read_state(self):
+        values = self._report()
+        return (self.dcdcGetConnected(),) + tuple([values[key] for key in _SNAPSHOT_KEYS])
+
+##@cond
+_SNAPSHOT_KEYS = tuple(key for name, key in SNAPSHOT_FUNCTIONS)
+##@endcond
+
+def _state_getter(name, key):
+    def function(self):
+        return self._report()[key]
+    function.__name__ = name
+    return function
+
+for _name, _key in STATE_FUNCTIONS:
+    setattr(ReportBackend, _name, _state_getter(_name, _key))
+
+
+##@cond
+#DCDC-USB HID protocol
+DCDC_VENDOR_ID = 0x04d8
+DCDC_PRODUCT_ID = 0xd003
+REPORT_SIZE = 24
+
+DCDCUSB_GET_ALL_VALUES = 0x81
+DCDCUSB_RECV_ALL_VALUES = 0x82
+DCDCUSB_CMD_OUT = 0xB1
+DCDCUSB_CMD_IN = 0xB2
+
+CMD_SET_AUX_WIN = 0x01
+CMD_SET_PW_SWITCH = 0x02
+CMD_SET_OUTPUT = 0x03
+CMD_WRITE_VOUT = 0x06
+CMD_INC_VOUT = 0x0C
+CMD_DEC_VOUT = 0x0D
+
+#Input voltage ADC scale factors (volts per count)
+VIN_SCALE = 0.1558
+VOUT_SCALE = 0.1170
+
+#Output voltage feedback network: digital potentiometer wiper and full-scale resistance, and divider
+CT_RW = 75.0
+CT_RP = 10000.0
+CT_R1 = 49900.0
+CT_R2 = 1500.0
+CT_V = 0.8
+
+#inotify constants from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+##@endcond
+
+
+def decodeStateReport(buf):
+    """Decode a DCDCUSB_RECV_ALL_VALUES input report.
+
+        @param buf report bytes, starting with the report command byte
+
+        @return dict of state values keyed as in STATE_FUNCTIONS
+    """
+    return {
+        'mode': buf[1] & 0x03,
+        'voltage_cfg': (buf[1] >> 2) & 0x07,
+        'time_cfg': (buf[1] >> 5) & 0x07,
+        'state': buf[2],
+        'vin': buf[3] * VIN_SCALE,
+        'vign': buf[4] * VIN_SCALE,
+        'vout': buf[5] * VOUT_SCALE,
+        'enabled_power_switch': (buf[6] >> 2) & 0x01,
+        'enabled_output': (buf[6] >> 3) & 0x01,
+        'enabled_aux_vout': (buf[6] >> 4) & 0x01,
+        'flags_status1': buf[6],
+        'flags_status2': buf[7],
+        'flags_voltage': buf[8],
+        'flags_timer': buf[9],
+        'flash_pointer': buf[10],
+        'timer_wait': (buf[11] << 8) | buf[12],
+        'timer_vout': (buf[13] << 8) | buf[14],
+        'timer_vaux': (buf[15] << 8) | buf[16],
+        'timer_pw_switch': (buf[17] << 8) | buf[18],
+        'timer_off_delay': (buf[19] << 8) | buf[20],
+        'timer_hard_off': (buf[21] << 8) | buf[22],
+        'version_major': (buf[23] >> 5) & 0x07,
+        'version_minor': buf[23] & 0x1F,
+    }
+
+def voutToStep(vout):
+    """Convert an output voltage to the regulator potentiometer step used by CMD_WRITE_VOUT.
+
+        @param vout voltage
+
+        @return potentiometer step (0-255)
+    """
+    if vout <= CT_V:
+        return 255
+    rpot = CT_R1 * CT_V / (vout - CT_V) - CT_R2
+    step = int(round((rpot - CT_RW) * 256 / CT_RP))
+    return min(max(step, 0), 255)
+
+def findHidDevices():
+    """List hidraw device nodes belonging to DCDC-USB converters, in enumeration order.
+
+        @return list of device paths, e.g. ['/dev/hidraw2']
+    """
+    hid_id = '0003:{:08X}:{:08X}'.format(DCDC_VENDOR_ID, DCDC_PRODUCT_ID)
+    devices = []
+    try:
+        nodes = sorted(os.listdir('/sys/class/hidraw'), key=lambda node: int(node[6:]))
+    except OSError:
+        return devices
+
+    for node in nodes:
+        try:
+            with open('/sys/class/hidraw/{}/device/uevent'.format(node)) as uevent:
+                if 'HID_ID=' + hid_id in uevent.read().upper():
+                    devices.append('/dev/' + node)
+        except OSError:
+            pass
+    return devices
+
+
+def waitForHidraw(timeout):
+    """Wait for a hidraw node to be created (or have its permissions changed) in /dev.
+
+        Uses inotify so the caller is woken up as soon as a device is plugged in. Falls back to
+        sleeping for the whole timeout if inotify is not available.
+
+        @param timeout maximum time to wait (seconds)
+
+        @return True if a hidraw node appeared, False on timeout
+    """
+    global _libc
+
+    fd = -1
+    try:
+        if _libc is None:
+            #ctypes.util imports subprocess and friends: only pay for it when inotify is used
+            from ctypes.util import find_library
+            _libc = CDLL(find_library('c') or 'libc.so.6', use_errno=True)
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd >= 0 and _libc.inotify_add_watch(fd, b'/dev', IN_CREATE | IN_ATTRIB) < 0:
+            os.close(fd)
+            fd = -1
+    except (OSError, AttributeError):
+        fd = -1
+
+    if fd < 0:
+        sleep(timeout)
+        return False
+
+    try:
+        deadline = monotonic() + timeout
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                return False
+            events = os.read(fd, 4096)
+            offset = 0
+            while offset + 16 <= len(events):
+                wd, mask, cookie, length = struct.unpack_from('iIII', events, offset)
+                name = events[offset + 16:offset + 16 + length]
+                if name.startswith(b'hidraw'):
+                    return True
+                offset += 16 + length
+    finally:
+        os.close(fd)
+
+
+class HidBackend(ReportBackend):
+    """Native backend speaking the DCDC-USB HID report protocol over Linux hidraw.
+
+        A background thread requests one DCDCUSB_RECV_ALL_VALUES report per refresh period and
+        every state getter is served from the decoded report, so a full read of the device
+        costs one USB transaction. Like the DLL, a device that is not present when opened is
+        picked up automatically once it is plugged in, until CloseDevice is called.
+
+        The flash variable functions are not available over this transport.
+    """
+
+    def __init__(self, readtimeout=0.5):
+        """Create an unopened backend.
+
+            @param readtimeout how long to wait for a report from the device (seconds)
+        """
+        ReportBackend.__init__(self)
+        self.readtimeout = readtimeout
+
+        self._fd = None
+        self._path = ''
+        self._devcount = 1
+        self._period = 1.0
+        self._io_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def wait_for_device(self, timeout):
+        if self._fd is not None:
+            return True
+        appeared = waitForHidraw(timeout)
+        if appeared and self._open():
+            self._refresh()
+        return appeared
+
+    def dcdcOpenDevice(self, timer):
+        return self.dcdcOpenDeviceByCnt(1, timer)
+
+    def dcdcOpenDeviceByCnt(self, devcount, timer):
+        self.dcdcCloseDevice()
+
+        self._devcount = devcount
+        self._period = timer / 1000.0
+        self._refresh_count = 0
+        self._stop.clear()
+
+        connected = self._open() and self._refresh()
+
+        self._thread = threading.Thread(target=self._run, name='DcDcHidRefresh', daemon=True)
+        self._thread.start()
+        return 1 if connected else 0
+
+    def dcdcGetDevicePath(self, path):
+        path.value = self._path.encode('UTF-8')
+
+    def dcdcCloseDevice(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._close()
+
+    def dcdcGetConnected(self):
+        return 1 if self._fd is not None and self._refresh_count > 0 else 0
+
+    def dcdcSetEnabledAuxVOut(self, on):
+        self._command(CMD_SET_AUX_WIN, 1 if on else 0)
+
+    def dcdcSetEnabledPowerSwitch(self, on):
+        self._command(CMD_SET_PW_SWITCH, 1 if on else 0)
+
+    def dcdcSetEnabledOutput(self, on):
+        self._command(CMD_SET_OUTPUT, 1 if on else 0)
+
+    def dcdcIncDecVOutVolatile(self, inc):
+        self._command(CMD_INC_VOUT if inc else CMD_DEC_VOUT, 0)
+
+    def dcdcSetVOutVolatile(self, vout):
+        self._command(CMD_WRITE_VOUT, voutToStep(vout))
+
+    def _run(self):
+        """Refresh thread: one state report per period, reopening the device if it goes away."""
+        while not self._stop.wait(self._period):
+            if self._fd is None and not self._open():
+                continue
+            self._refresh()
+
+    def _open(self):
+        if self._fd is not None:
+            return True
+
+        devices = findHidDevices()
+        if len(devices) < self._devcount:
+            return False
+
+        path = devices[self._devcount - 1]
+        try:
+            fd = os.open(path, os.O_RDWR)
+        except OSError as err:
+            logger.debug("Could not open {}: {}".format(path, err))
+            return False
+
+        with self._io_lock:
+            if self._fd is not None:
+                #Opened concurrently by the refresh thread
+                os.close(fd)
+                return True
+            self._fd = fd
+            self._path = path
+        logger.debug("Opened DCDC-USB at {}".format(path))
+        return True
+
+    def _close(self):
+        with self._io_lock:
+            if self._fd is not None:
+                try:
+                    os.close(self._fd)
+                except OSError:
+                    pass
+            self._fd = None
+
+    def _transfer(self, report, response):
+        """Write one output report and read input reports until the expected response arrives.
+
+            @param report output report bytes (without report id)
+            @param response expected response command byte
+
+            @return response report bytes, or None on failure
+        """
+        with self._io_lock:
+            if self._fd is None:
+                return None
+            try:
+                os.write(self._fd, b'\x00' + bytes(report).ljust(REPORT_SIZE, b'\x00'))
+                deadline = monotonic() + self.readtimeout
+                while True:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0 or not select.select([self._fd], [], [], remaining)[0]:
+                        logger.debug("Timed out waiting for report 0x{:02X}".format(response))
+                        return None
+                    buf = os.read(self._fd, 64)
+                    if len(buf) >= REPORT_SIZE and buf[0] == response:
+                        return buf
+            except OSError as err:
+                logger.debug("DCDC-USB transfer failed: {}".format(err))
+                try:
+                    os.close(self._fd)
+                except OSError:
+                    pass
+                self._fd = None
+                return None
+
+    def _refresh(self):
+        buf = self._transfer([DCDCUSB_GET_ALL_VALUES], DCDCUSB_RECV_ALL_VALUES)
+        if buf is None:
+            return False
+        self._values = decodeStateReport(buf)
+        self._refresh_count += 1
+        return True
+
+    def _command(self, command, value):
+        self._transfer([DCDCUSB_CMD_OUT, command, value], DCDCUSB_CMD_IN)
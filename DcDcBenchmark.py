@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcBenchmark
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Benchmarks of the DcDcConverter hot paths against a simulated DCDCUsbLib
+
+Runs anywhere (no DLL or hardware needed) against DcDcSimulator.SimulatedDll, which costs a
+configurable latency per library call, and prints the results as JSON:
+
+    python DcDcBenchmark.py --latency 0.0002 --output bench.json
+
+Compare the JSON of two runs to catch regressions before deploying.
+"""
+
+import sys
+import json
+import logging
+import platform
+import argparse
+
+from time import perf_counter, monotonic
+from ctypes import create_string_buffer
+from importlib import import_module
+
+if __package__:
+    from .DcDcConverter import DcDcConverter
+    from .DcDcSimulator import SimulatedBackend, SimulatedDll
+    from .DcDcSnapshot import SnapshotBuffer
+    from .DcDcSampler import DcDcSampler
+    from .DcDcVariables import VariableTable
+else:
+    from DcDcConverter import DcDcConverter
+    from DcDcSimulator import SimulatedBackend, SimulatedDll
+    from DcDcSnapshot import SnapshotBuffer
+    from DcDcSampler import DcDcSampler
+    from DcDcVariables import VariableTable
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Getters a monitoring loop calls for a full state sample
+STATE_GETTERS = (
+    'GetConnected', 'GetVin', 'GetVIgn', 'GetVOut', 'GetState', 'GetMode', 'GetTimeCfg', 'GetVoltageCfg',
+    'GetEnabledPowerSwitch', 'GetEnabledOutput', 'GetEnabledAuxVOut',
+    'GetFlagsStatus1', 'GetFlagsStatus2', 'GetFlagsVoltage', 'GetFlagsTimer', 'GetFlashPointer',
+    'GetTimerWait', 'GetTimerVout', 'GetTimerVAux', 'GetTimerPwSwitch', 'GetTimerOffDelay', 'GetTimerHardOff',
+)
+##@endcond
+
+
+def _timed(function, iterations):
+    """Run a function repeatedly.
+
+        @return dict with iterations, total time, seconds per call and calls per second
+                (None when the clock did not advance, which JSON cannot hold as infinity)
+    """
+    start = perf_counter()
+    for iteration in range(iterations):
+        function()
+    total = perf_counter() - start
+    return {
+        'iterations': iterations,
+        'total': total,
+        'per_call': total / iterations,
+        'per_second': iterations / total if total else None,
+    }
+
+
+def _summary(values):
+    values = sorted(values)
+    count = len(values)
+    if not count:
+        return {'count': 0}
+    mean = sum(values) / count
+    return {
+        'count': count,
+        'mean': mean,
+        'min': values[0],
+        'max': values[-1],
+        'p50': values[count // 2],
+        'p99': values[min(count - 1, int(count * 0.99))],
+        'stdev': (sum((value - mean) ** 2 for value in values) / count) ** 0.5,
+    }
+
+
+def _converter(latency, timer=1.0):
+    return DcDcConverter(1, timer, 1, backend=SimulatedDll(latency=latency))
+
+
+def benchCallOverhead(latency, iterations):
+    """Time per call of individual getters and GetVersion."""
+    converter = _converter(latency)
+    results = {}
+    for name in ('GetVin', 'GetState', 'GetFlagsStatus1', 'GetTimerHardOff', 'GetVersion'):
+        results[name] = _timed(getattr(converter, name), iterations)
+
+    converter.EnableReadCache()
+    results['GetVin (read cache)'] = _timed(converter.GetVin, iterations)
+    converter.CloseDevice()
+    return results
+
+
+def benchFullState(latency, iterations):
+    """Throughput of full state samples: one getter per variable against the snapshot APIs."""
+    results = {}
+
+    converter = _converter(latency)
+    getters = [getattr(converter, name) for name in STATE_GETTERS]
+    results['individual getters'] = _timed(lambda: [getter() for getter in getters], iterations)
+    results['GetSnapshot (DLL)'] = _timed(converter.GetSnapshot, iterations)
+    converter.CloseDevice()
+
+    converter = DcDcConverter(1, 1.0, 1, backend=SimulatedBackend())
+    results['GetSnapshot (report backend)'] = _timed(converter.GetSnapshot, iterations)
+    buffer = SnapshotBuffer(1)
+    results['GetSnapshotInto (report backend)'] = _timed(lambda: converter.GetSnapshotInto(buffer), iterations)
+    converter.CloseDevice()
+    return results
+
+
+def benchFlashTable(latency, iterations):
+    """Time to enumerate every flash variable."""
+    converter = _converter(latency)
+    converter.LoadFlashValues(wait=True, timeout=10)
+
+    def enumerate_raw():
+        for cnt in range(converter.GetMaxVariableCnt()):
+            name = create_string_buffer(256)
+            value = create_string_buffer(256)
+            unit = create_string_buffer(256)
+            comment = create_string_buffer(1024)
+            converter.GetVariableData(cnt, name, value, unit, comment)
+            (name.value.decode(), value.value.decode(), unit.value.decode(), comment.value.decode())
+
+    results = {
+        'variables': converter.GetMaxVariableCnt(),
+        'GetVariableData loop': _timed(enumerate_raw, iterations),
+        'VariableTable load': _timed(lambda: VariableTable(converter), iterations),
+        'GetVariableTable cached lookup': _timed(lambda: converter.GetVariableTable()['VOut'], iterations),
+    }
+    converter.CloseDevice()
+    return results
+
+
+def benchConnect(latency, iterations):
+    """Time from construction until the converter is ready."""
+    times = []
+    for iteration in range(iterations):
+        start = perf_counter()
+        converter = _converter(latency)
+        times.append(perf_counter() - start)
+        converter.CloseDevice()
+    return _summary(times)
+
+
+def benchSamplingJitter(latency, samples, timer):
+    """Deviation of the sampler's sample times from the refresh period."""
+    converter = _converter(latency, timer)
+    sampler = DcDcSampler(converter, samples)
+    deadline = monotonic() + samples * timer * 2 + 1
+    with sampler:
+        while sampler.count < samples and monotonic() < deadline:
+            sampler.wait(sampler.count, timer * 2)
+    converter.CloseDevice()
+
+    timestamps = list(sampler.column('timestamp'))
+    intervals = [later - earlier for earlier, later in zip(timestamps, timestamps[1:])]
+    result = _summary([abs(interval - timer) for interval in intervals])
+    result['period'] = timer
+    return result
+
+
+def benchAnalytics(rows, iterations):
+    """Samples per second of the DcDcAnalytics functions over synthetic telemetry."""
+    try:
+        analytics = import_module(('.' if __package__ else '') + 'DcDcAnalytics', __package__ or None)
+    except ImportError:
+        return {'skipped': 'NumPy is not installed'}
+    numpy = analytics.numpy
+
+    #One sample per 10 ms, ignition cycling every minute and a sag below the brownout threshold every 30 seconds
+    timestamps = numpy.arange(rows) * 0.01
+    vign = numpy.where((timestamps % 60) < 45, 12.5, 0.5)
+    vin = 12.0 + 0.3 * numpy.sin(timestamps) - 2.0 * ((timestamps % 30) < 0.2)
+    states = (timestamps // 7).astype(numpy.int64) % 16
+    records = {'timestamp': timestamps, 'vin': vin, 'vout': vin, 'vign': vign, 'state': states, 'mode': states % 4}
+
+    chunk = max(1, rows // 8)
+
+    def summarise():
+        summary = analytics.TelemetrySummary()
+        for start in range(0, rows, chunk):
+            summary.update(dict((field, column[start:start + chunk]) for field, column in records.items()))
+
+    results = {
+        'rows': rows,
+        'downsample': _timed(lambda: analytics.downsample(timestamps, vin, 60.0), iterations),
+        'brownouts': _timed(lambda: analytics.brownouts(timestamps, vin), iterations),
+        'ignitionCycles': _timed(lambda: analytics.ignitionCycles(timestamps, vign), iterations),
+        'stateDurations': _timed(lambda: analytics.stateDurations(timestamps, states), iterations),
+        'TelemetrySummary (8 chunks)': _timed(summarise, iterations),
+    }
+    for result in results.values():
+        if isinstance(result, dict):
+            per_second = result['per_second']
+            result['samples_per_second'] = None if per_second is None else rows * per_second
+    return results
+
+
+def runBenchmarks(latency=0.0, iterations=1000, samples=50, timer=0.02, rows=1000000):
+    """Run every benchmark.
+
+        @param latency simulated time per library call (seconds)
+        @param iterations iterations of each timed loop
+        @param samples number of samples for the jitter benchmark
+        @param timer refresh period for the jitter benchmark (seconds)
+        @param rows number of synthetic samples for the analytics benchmark
+
+        @return dict of results, suitable for json.dump
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'latency': latency,
+        'results': {
+            'call_overhead': benchCallOverhead(latency, iterations),
+            'full_state': benchFullState(latency, max(1, iterations // 10)),
+            'flash_table': benchFlashTable(latency, max(1, iterations // 10)),
+            'connect': benchConnect(latency, 10),
+            'sampling_jitter': benchSamplingJitter(latency, samples, timer),
+            'analytics': benchAnalytics(rows, max(1, iterations // 100)),
+        },
+    }
+
+
+##@cond
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark DcDcConverter against a simulated DCDCUsbLib")
+    parser.add_argument('--latency', type=float, default=0.0, help="simulated latency per library call (seconds)")
+    parser.add_argument('--iterations', type=int, default=1000, help="iterations of each timed loop")
+    parser.add_argument('--samples', type=int, default=50, help="samples for the jitter benchmark")
+    parser.add_argument('--timer', type=float, default=0.02, help="refresh period for the jitter benchmark (seconds)")
+    parser.add_argument('--rows', type=int, default=1000000, help="synthetic samples for the analytics benchmark")
+    parser.add_argument('--output', help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    results = runBenchmarks(args.latency, args.iterations, args.samples, args.timer, args.rows)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+##@endcond
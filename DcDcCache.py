@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcCache
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Read cache keyed on the API refresh epoch, with request coalescing
+"""
+
+import logging
+import threading
+
+if __package__:
+    from .DcDcBackends import LibraryLayer, LibraryProxy, STATE_FUNCTIONS
+else:
+    from DcDcBackends import LibraryLayer, LibraryProxy, STATE_FUNCTIONS
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Functions whose result only changes when the API refreshes its data
+CACHED_FUNCTIONS = tuple(name for name, key in STATE_FUNCTIONS) + ('read_state',)
+
+#Cached functions made stale by each command
+INVALIDATES = {
+    'dcdcSetEnabledAuxVOut': ('dcdcGetEnabledAuxVOut', 'dcdcGetFlagsStatus1', 'read_state'),
+    'dcdcSetEnabledPowerSwitch': ('dcdcGetEnabledPowerSwitch', 'dcdcGetFlagsStatus1', 'read_state'),
+    'dcdcSetEnabledOutput': ('dcdcGetEnabledOutput', 'dcdcGetFlagsStatus1', 'read_state'),
+    'dcdcIncDecVOutVolatile': ('dcdcGetVOut', 'read_state'),
+    'dcdcSetVOutVolatile': ('dcdcGetVOut', 'read_state'),
+    'dcdcOpenDevice': CACHED_FUNCTIONS,
+    'dcdcOpenDeviceByCnt': CACHED_FUNCTIONS,
+    'dcdcCloseDevice': CACHED_FUNCTIONS,
+}
+##@endcond
+
+
+class _Entry(object):
+    """Result of one cached call, shared by every reader of the same epoch."""
+    __slots__ = ('epoch', 'value', 'error', 'ready')
+
+    def __init__(self, epoch):
+        self.epoch = epoch
+        self.value = None
+        self.error = None
+        self.ready = threading.Event()
+
+    def result(self):
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ReadCache(LibraryLayer):
+    """Cache state getters for the rest of the API refresh period they were read in.
+
+        The API only refreshes its data once per timer period, so a getter called twice in the
+        same refresh epoch returns the same value; with the cache the second call does not reach
+        the backend. Threads asking for the same value while it is being fetched wait for that
+        fetch instead of issuing their own. Set commands drop the cached values they affect.
+
+        @see DcDcConverter.EnableReadCache
+    """
+
+    order = 40
+
+    def __init__(self, converter):
+        """Create the cache.
+
+            @param converter DcDcConverter whose refresh epoch keys the cache
+        """
+        self.converter = converter
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def wrap(self, library):
+        proxy = LibraryProxy(library)
+        for name in CACHED_FUNCTIONS:
+            setattr(proxy, name, self._cached(name, getattr(library, name)))
+        for name, stale in INVALIDATES.items():
+            setattr(proxy, name, self._invalidating(name, getattr(library, name), stale))
+        return proxy
+
+    def invalidate(self, names=CACHED_FUNCTIONS):
+        """Drop cached values.
+
+            @param names functions whose cached values to drop, defaults to all
+        """
+        with self._lock:
+            for name in names:
+                self.entries.pop(name, None)
+
+    def _cached(self, name, function):
+        entries = self.entries
+        epochs = self.converter.GetRefreshEpoch
+
+        def call(*args):
+            epoch = epochs()
+            entry = entries.get(name)
+            if entry is not None and entry.epoch == epoch:
+                self.hits += 1
+                return entry.result()
+
+            with self._lock:
+                entry = entries.get(name)
+                owner = entry is None or entry.epoch != epoch
+                if owner:
+                    entry = _Entry(epoch)
+                    entries[name] = entry
+
+            if not owner:
+                self.hits += 1
+                return entry.result()
+
+            self.misses += 1
+            try:
+                entry.value = function(*args)
+            except Exception as err:
+                entry.error = err
+                with self._lock:
+                    if entries.get(name) is entry:
+                        del entries[name]
+            finally:
+                entry.ready.set()
+            return entry.result()
+
+        call.__name__ = name
+        return call
+
+    def _invalidating(self, name, function, stale):
+        def call(*args):
+            try:
+                return function(*args)
+            finally:
+                self.invalidate(stale)
+
+        call.__name__ = name
+        return call
@@ -8,11 +8,20 @@
 @brief Module to communicate with DC-DC converters from Mini-Box.com
 """
 
-import os
 import logging
+import threading
 
-from time import sleep, monotonic
+from time import sleep, monotonic, time
 from ctypes import *
+from importlib import import_module
+from concurrent.futures import Future
+
+if __package__:
+    from .DcDcBackends import DllBackend
+    from .DcDcSnapshot import DcDcSnapshot, SNAPSHOT_WIDTH
+else:
+    from DcDcBackends import DllBackend
+    from DcDcSnapshot import DcDcSnapshot, SNAPSHOT_WIDTH
 
 ##@cond
 logger = logging.getLogger(__name__)
@@ -22,177 +31,306 @@ logger.debug("DcDcConverter module imported")
 if __name__ == '__main__':
     logging.basicConfig(format='%(levelname)s\t-\t %(name)s\t- %(message)s', level=logging.NOTSET)
 
-try:
-    module_path = os.path.dirname(__file__)
-    DCDCUsbLib = cdll.LoadLibrary(module_path + '\\DLL\\DCDCUsbLib.dll')
-    logger.info("DCDCUsbLib DLL loaded successfully")
-    logger.debug("Resource handle: {}".format(DCDCUsbLib))
-except OSError as err:
-    logger.error("DCDCUsbLib DLL could not be loaded")
-    logger.error("Could not import DcDcConverter module")
-    raise err
+#Bounds of the backoff between connection and flash load state checks (seconds)
+POLL_BACKOFF_MIN = 0.01
+POLL_BACKOFF_MAX = 0.5
+
+#Default for the flash write budget arguments: DcDcFlash.DEFAULT_WRITE_BUDGET
+_DEFAULT_BUDGET = object()
+
+#Volatile setters in the order RestoreVolatileSettings re-applies them (voltage before enabling)
+VOLATILE_SETTERS = (
+    'SetVOutVolatile', 'IncDecVOutVolatile', 'SetEnabledOutput', 'SetEnabledAuxVOut', 'SetEnabledPowerSwitch',
+)
+
+#Largest difference from the recorded VOut still considered the same voltage (V), under half a potentiometer step
+VOUT_RESTORE_TOLERANCE = 0.05
 ##@endcond
 
+def _sibling(name):
+    #Feature modules are imported on first use, so importing this module stays cheap
+    return import_module(('.' if __package__ else '') + name, __package__ or None)
+
+
 class DcDcConverter(object):
     
-    def __init__(self, devcount, timer, connectiontimeout):
+    def __init__(self, devcount, timer, connectiontimeout, backend=None, connect=True):
         """Initialisation function for the class each time it is called.
         
             @param devcount  number of device to be opened
             @param timer period (seconds) for API data refresh rate
             @param connectiontimeout how long to keep trying to connect if connection fails first time (seconds)
+            @param backend transport to talk to the device through (see DcDcBackends), defaults to the DCDCUsbLib DLL
+            @param connect connect before returning; pass False and call Connect() to connect in the background
+            
+            @exception ConnectionError no converter was found within connectiontimeout
             
+            @see Connect
             @see OpenDevice
             @see OpenDeviceByCnt
         
         """
         
         ##@cond 
-        self.DCDCUsbLib = DCDCUsbLib
+        if backend is None:
+            backend = DllBackend()
         
-        self._setResTypes(self.DCDCUsbLib)
-        self._setArgsTypes(self.DCDCUsbLib)
+        self.backend = backend
+        self.DCDCUsbLib = backend
+        self._layers = []
            
         self.devcount = devcount
         self.timer = timer * 1000
         self.connectiontimeout = connectiontimeout
         
-        connection_status = self.OpenDeviceByCnt(self.devcount, self.timer)
+        self.refresh_origin = None
+        self.flash_generation = 0
+        self._variable_table = None
+        self._events = None
+        self.volatile_settings = {}
+        self._vout_baseline = None
+        self._connecting = None
+        self._connect_lock = threading.Lock()
+        
+        if connect:
+            self.Connect().result()
+        ##@endcond
+        
+    def Connect(self):
+        """Connect to the converter in the background.
         
-        if connection_status == 1:
-            pass
-        elif connection_status == 0 :
-            logger.info("No DC-DC converter found, trying again for {} seconds".format(connectiontimeout))
-            timeout = monotonic() + connectiontimeout
+            If the device is not there yet, waits up to connectiontimeout seconds for it, with
+            exponential backoff between checks or woken by hotplug notifications where the backend
+            supports them. Once connected, the future resolves as soon as the first API data
+            refresh has happened (at most one timer period later).
             
-            while monotonic() < timeout:
-                connection_status = self.GetConnected()
-                if connection_status == 1:
-                    break
-                else:
-                    pass
-                
+            From asyncio, await the result with asyncio.wrap_future(converter.Connect()).
+            
+            @return concurrent.futures.Future resolving to this converter, or raising ConnectionError
+                    if no converter was found
+        """
+        with self._connect_lock:
+            if self._connecting is None or self._connecting.done():
+                self._connecting = Future()
+                self._connecting.set_running_or_notify_cancel()
+                threading.Thread(target=self._connect, args=(self._connecting,), name='DcDcConnect', daemon=True).start()
+            return self._connecting
+    
+    def _connect(self, future):
+        """Connection thread for Connect()."""
         try:
-            if connection_status == 1:
-                logger.info("Connected to DC-DC converter with devcount: {}".format(devcount))
+            connection_status = self.OpenDeviceByCnt(self.devcount, self.timer)
+            
+            if connection_status == 0:
+                logger.info("No DC-DC converter found, trying again for {} seconds".format(self.connectiontimeout))
+                timeout = monotonic() + self.connectiontimeout
+                delay = POLL_BACKOFF_MIN
                 
-                dev_path = create_string_buffer(b'\00', size=1024)
-                self.GetDevicePath(dev_path)
-                logger.debug("Device path: {}".format(dev_path.value.decode('UTF-8')))
-
-                sleep(timer)     #Wait for first API refresh otherwise get/set commands might fail
+                while connection_status == 0 and monotonic() < timeout:
+                    self.backend.wait_for_device(min(delay, max(0, timeout - monotonic())))
+                    connection_status = self.GetConnected()
+                    delay = min(delay * 2, POLL_BACKOFF_MAX)
+            
+            if connection_status != 1:
+                logger.error("No DC-DC converter found; closing device")
+                self.DCDCUsbLib.dcdcCloseDevice()
+                raise ConnectionError("No DC-DC converter found with devcount: {}".format(self.devcount))
+            
+            self.refresh_origin = monotonic()
+            logger.info("Connected to DC-DC converter with devcount: {}".format(self.devcount))
+            
+            dev_path = create_string_buffer(b'\00', size=1024)
+            self.GetDevicePath(dev_path)
+            logger.debug("Device path: {}".format(dev_path.value.decode('UTF-8')))
+            
+            self._waitFirstRefresh()
+        except BaseException as err:
+            future.set_exception(err)
+        else:
+            future.set_result(self)
+    
+    def Reconnect(self):
+        """Close the device and connect to it again in the background.
+        
+            Layers, subscriptions and recorded volatile settings are kept; call
+            RestoreVolatileSettings once connected to re-apply the settings.
+            
+            @see Connect
+            @see DcDcWatchdog.DcDcWatchdog
+            
+            @return concurrent.futures.Future resolving to this converter, or raising ConnectionError
+        """
+        self.DCDCUsbLib.dcdcCloseDevice()
+        return self.Connect()
+    
+    def RestoreVolatileSettings(self, names=VOLATILE_SETTERS):
+        """Re-apply the volatile settings made since construction, e.g. after the device reset.
+        
+            The last value passed to each volatile setter is recorded in volatile_settings;
+            IncDecVOutVolatile steps are recorded as the net number of steps since the last
+            SetVOutVolatile. The steps are relative, so they are only replayed on top of a
+            restored SetVOutVolatile or once VOut reads back at the value it had before the
+            first step, i.e. the device really did reset: replaying them over a VOut that kept
+            its setting would move it further on every reconnect.
+            
+            @param names setters to re-apply, from VOLATILE_SETTERS
+        """
+        settings = dict(self.volatile_settings)
+        for name in VOLATILE_SETTERS:
+            if name not in names or name not in settings:
+                continue
+            if name == 'IncDecVOutVolatile':
+                steps = settings[name]
+                if 'SetVOutVolatile' not in names or 'SetVOutVolatile' not in settings:
+                    vout = self.DCDCUsbLib.dcdcGetVOut()
+                    if abs(vout - self._vout_baseline) > VOUT_RESTORE_TOLERANCE:
+                        logger.debug("VOut at {} V instead of {} V, not replaying {} steps".format(vout, self._vout_baseline, steps))
+                        continue
+                for step in range(abs(steps)):
+                    self.DCDCUsbLib.dcdcIncDecVOutVolatile(1 if steps > 0 else 0)
             else:
-                raise Exception
-        except Exception as err:
-            logger.error("No DC-DC converter found; closing device")
-            self.CloseDevice()  
-            raise err
-        ##@endcond
+                getattr(self.DCDCUsbLib, 'dcdc' + name)(settings[name])
+            logger.debug("Restored {}: {}".format(name, settings[name]))
+    
+    def _waitFirstRefresh(self):
+        """Wait for the first API refresh, otherwise get/set commands might fail.
+        
+            Backends that count their refreshes say when it has happened; with the DLL the data
+            is known to be there once the firmware version reads back. Gives up after one timer
+            period, which is when the first refresh is due anyway.
+        """
+        deadline = self.refresh_origin + self.timer / 1000
+        delay = POLL_BACKOFF_MIN
+        
+        while monotonic() < deadline:
+            count = self.backend.refresh_count()
+            if count is not None:
+                if count > 0:
+                    return
+            elif self.DCDCUsbLib.dcdcGetVersionMajor() or self.DCDCUsbLib.dcdcGetVersionMinor():
+                return
+            sleep(min(delay, max(0, deadline - monotonic())))
+            delay = min(delay * 2, POLL_BACKOFF_MAX)
+        
+    def AddLayer(self, layer):
+        """Stack a layer between this converter and its backend.
+        
+            Layers wrap the library functions the getters and setters call; they are stacked
+            by their order attribute whatever order they are added in.
+            
+            @see DcDcBackends.LibraryLayer
+            
+            @param layer LibraryLayer to add
+            
+            @return the layer
+        """
+        self._layers.append(layer)
+        self._stackLayers()
+        return layer
+    
+    def RemoveLayer(self, layer):
+        """Remove a layer added with AddLayer and close it.
         
+            @param layer LibraryLayer to remove
+        """
+        self._layers.remove(layer)
+        self._stackLayers()
+        layer.close()
+    
+    def _stackLayers(self):
+        library = self.backend
+        for layer in sorted(self._layers, key=lambda layer: layer.order):
+            library = layer.wrap(library)
+        self.DCDCUsbLib = library
+    
+    def EnableReadCache(self):
+        """Cache getter results for the rest of the API refresh period they were read in.
         
-    def _setResTypes(self, dcdc_object):
-        """Set the return types for the dcdc converter object.
-        
-        This is necessary to avoid passing incorrect data types to the DCDCUsbLib functions, and
-        saves having to cast arguments when functions are called.
-        
-        @param dcdc_object object of type DCDCUsbLib
-        """
-        #Device initialisation commands
-        dcdc_object.dcdcOpenDevice.restype = c_ubyte
-        dcdc_object.dcdcOpenDeviceByCnt.restype = c_ubyte
-        dcdc_object.dcdcGetDevicePath.restype = None
-        dcdc_object.dcdcCloseDevice.restype = None
-        
-        #Get commands
-        dcdc_object.dcdcGetConnected.restype = c_ubyte
-        dcdc_object.dcdcGetTimeCfg.restype = c_ubyte
-        dcdc_object.dcdcGetVoltageCfg.restype = c_ubyte
-        dcdc_object.dcdcGetMode.restype = c_ubyte
-        dcdc_object.dcdcGetState.restype = c_ubyte
-        dcdc_object.dcdcGetVin.restype = c_float
-        dcdc_object.dcdcGetVIgn.restype = c_float
-        dcdc_object.dcdcGetVOut.restype = c_float
-        dcdc_object.dcdcGetEnabledPowerSwitch.restype = c_ubyte
-        dcdc_object.dcdcGetEnabledOutput.restype = c_ubyte
-        dcdc_object.dcdcGetEnabledAuxVOut.restype = c_ubyte
-        dcdc_object.dcdcGetFlagsStatus1.restype = c_ubyte
-        dcdc_object.dcdcGetFlagsStatus2.restype = c_ubyte
-        dcdc_object.dcdcGetFlagsVoltage.restype = c_ubyte
-        dcdc_object.dcdcGetFlagsTimer.restype = c_ubyte
-        dcdc_object.dcdcGetFlashPointer.restype = c_ubyte
-        dcdc_object.dcdcGetTimerWait.restype = c_uint
-        dcdc_object.dcdcGetTimerVout.restype = c_uint
-        dcdc_object.dcdcGetTimerVAux.restype = c_uint
-        dcdc_object.dcdcGetTimerPwSwitch.restype = c_uint
-        dcdc_object.dcdcGetTimerOffDelay.restype = c_uint
-        dcdc_object.dcdcGetTimerHardOff.restype = c_uint
-        dcdc_object.dcdcGetVersionMajor.restype = c_ubyte
-        dcdc_object.dcdcGetVersionMinor.restype = c_ubyte
-        
-        #Set commands
-        dcdc_object.dcdcSetEnabledAuxVOut.restype = None
-        dcdc_object.dcdcSetEnabledPowerSwitch.restype = None
-        dcdc_object.dcdcSetEnabledOutput.restype = None
-        dcdc_object.dcdcIncDecVOutVolatile.restype = None
-        dcdc_object.dcdcSetVOutVolatile.restype = None
-        dcdc_object.dcdcLoadFlashValues.restype = None
-        dcdc_object.dcdcGetLoadState.restype = c_ubyte
-        dcdc_object.dcdcGetMaxVariableCnt.restype = c_uint
-        dcdc_object.dcdcGetVariableData.restype = c_ubyte
-        dcdc_object.dcdcSetVariableData.restype = c_ubyte
-        dcdc_object.dcdcSaveFlashValues.restype = None
-        
-    def _setArgsTypes(self, dcdc_object):
-        """Set the argument types for the dcdc converter object.
-        
-        @param dcdc_object object of type DCDCUsbLib
-        """        
-        #Device initialisation commands
-        dcdc_object.dcdcOpenDevice.argtypes = [c_uint]
-        dcdc_object.dcdcOpenDeviceByCnt.argtypes = [c_uint, c_uint]
-        dcdc_object.dcdcGetDevicePath.argtypes = [c_char_p]
-        dcdc_object.dcdcCloseDevice.argtypes = None
-        
-        #Get commands
-        dcdc_object.dcdcGetConnected.argtypes = None
-        dcdc_object.dcdcGetTimeCfg.argtypes = None
-        dcdc_object.dcdcGetVoltageCfg.argtypes = None
-        dcdc_object.dcdcGetMode.argtypes = None
-        dcdc_object.dcdcGetState.argtypes = None
-        dcdc_object.dcdcGetVin.argtypes = None
-        dcdc_object.dcdcGetVIgn.argtypes = None
-        dcdc_object.dcdcGetVOut.argtypes = None
-        dcdc_object.dcdcGetEnabledPowerSwitch.argtypes = None
-        dcdc_object.dcdcGetEnabledOutput.argtypes = None
-        dcdc_object.dcdcGetEnabledAuxVOut.argtypes = None
-        dcdc_object.dcdcGetFlagsStatus1.argtypes = None
-        dcdc_object.dcdcGetFlagsStatus2.argtypes = None
-        dcdc_object.dcdcGetFlagsVoltage.argtypes = None
-        dcdc_object.dcdcGetFlagsTimer.argtypes = None
-        dcdc_object.dcdcGetFlashPointer.argtypes = None
-        dcdc_object.dcdcGetTimerWait.argtypes = None
-        dcdc_object.dcdcGetTimerVout.argtypes = None
-        dcdc_object.dcdcGetTimerVAux.argtypes = None
-        dcdc_object.dcdcGetTimerPwSwitch.argtypes = None
-        dcdc_object.dcdcGetTimerOffDelay.argtypes = None
-        dcdc_object.dcdcGetTimerHardOff.argtypes = None
-        dcdc_object.dcdcGetVersionMajor.argtypes = None
-        dcdc_object.dcdcGetVersionMinor.argtypes = None
-        
-        #Set commands
-        dcdc_object.dcdcSetEnabledAuxVOut.argtypes = [c_ubyte]
-        dcdc_object.dcdcSetEnabledPowerSwitch.argtypes = [c_ubyte]
-        dcdc_object.dcdcSetEnabledOutput.argtypes = [c_ubyte]
-        dcdc_object.dcdcIncDecVOutVolatile.argtypes = [c_ubyte]
-        dcdc_object.dcdcSetVOutVolatile.argtypes = [c_float]
-        dcdc_object.dcdcLoadFlashValues.argtypes = None
-        dcdc_object.dcdcGetLoadState.argtypes = None
-        dcdc_object.dcdcGetMaxVariableCnt.argtypes = None
-        dcdc_object.dcdcGetVariableData.argtypes = [c_uint, c_char_p, c_char_p, c_char_p, c_char_p]
-        dcdc_object.dcdcSetVariableData.argtypes = [c_uint, c_char_p]
-        dcdc_object.dcdcSaveFlashValues.argtypes = None
-         
+            Repeated reads of the same value within one refresh, from any number of threads,
+            then cost one call to the backend. Set commands drop the values they affect.
+            Remove the cache with RemoveLayer.
+            
+            @see DcDcCache.ReadCache
+            
+            @return DcDcCache.ReadCache layer
+        """
+        return self.AddLayer(_sibling('DcDcCache').ReadCache(self))
+    
+    def EnableCommandActor(self):
+        """Serialise every library call on one dedicated thread, with priorities.
+        
+            Makes the converter safe to share between threads. Control commands (SetEnabledOutput,
+            SetEnabledPowerSwitch, SetVOutVolatile...) run ahead of queued reads. Use the returned
+            actor's submit() to get a future for a call, e.g.
+            
+                actor.submit(converter.SetEnabledOutput, 0).result(timeout=0.5)
+            
+            @see DcDcActor.CommandActor
+            
+            @return DcDcActor.CommandActor layer
+        """
+        return self.AddLayer(_sibling('DcDcActor').CommandActor())
+    
+    def EnableInstrumentation(self):
+        """Record call counts, errors and latency histograms of every library function.
+        
+            The instrumentation sits directly on the backend, so latencies are those of the DLL
+            (or HID transport) itself. Read them with stats() on the returned layer; remove it with
+            RemoveLayer to get back to zero overhead.
+            
+            @see DcDcInstrumentation.Instrumentation
+            
+            @return DcDcInstrumentation.Instrumentation layer
+        """
+        return self.AddLayer(_sibling('DcDcInstrumentation').Instrumentation())
+    
+    def EnableTrace(self, path):
+        """Record every library call reaching the backend into a binary trace file.
+        
+            Replay the trace with DcDcTrace.ReplayBackend. Stop recording with RemoveLayer, which
+            also closes the trace file.
+            
+            @see DcDcTrace.TraceRecorder
+            
+            @param path trace file (overwritten)
+            
+            @return DcDcTrace.TraceRecorder layer
+        """
+        return self.AddLayer(_sibling('DcDcTrace').TraceRecorder(path))
+    
+    def Subscribe(self, field, callback, above=None, below=None, hysteresis=0.0, edge=None, loop=None):
+        """Call a function when a state variable crosses a level or changes.
+        
+            Subscriptions are evaluated once per API refresh by a single DcDcEvents.EventEngine,
+            started (with its own sampler) on the first call. Examples:
+            
+                converter.Subscribe('vin', on_sag, below=11.0, hysteresis=0.5)
+                converter.Subscribe('enabled_output', on_off, edge='falling')
+                converter.Subscribe('flags_status1.output', on_change, edge='change', loop=asyncio.get_running_loop())
+            
+            @see DcDcEvents.EventEngine.subscribe
+            
+            @param field snapshot field or decoded flag ('flags_status1.output')
+            @param callback callable(DcDcEvents.DcDcEvent)
+            @param above threshold for a rising level trigger
+            @param below threshold for a falling level trigger
+            @param hysteresis re-arm distance for level triggers
+            @param edge 'rising', 'falling' or 'change'
+            @param loop asyncio event loop to run the callback on
+            
+            @return DcDcEvents.Subscription
+        """
+        if self._events is None:
+            self._events = _sibling('DcDcEvents').EventEngine(self)
+        return self._events.subscribe(field, callback, above, below, hysteresis, edge, loop)
+    
+    def Unsubscribe(self, subscription):
+        """Remove a subscription made with Subscribe.
+        
+            @param subscription DcDcEvents.Subscription
+        """
+        subscription.cancel()
+    
     def OpenDevice(self, timer):
         """Opens first DCDCUsb found on USB
             
@@ -242,8 +380,17 @@ class DcDcConverter(object):
                 
     def CloseDevice(self):
         """Close the opened DCDCUsb device
+        
+            Every layer added with AddLayer is removed and closed as well.
         """
-        self.DCDCUsbLib.dcdcCloseDevice()    
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+        self.DCDCUsbLib.dcdcCloseDevice()
+        layers, self._layers = self._layers, []
+        self._stackLayers()
+        for layer in layers:
+            layer.close()
       
     def GetConnected(self):
         """Get connection state of the DCDCUsb
@@ -422,12 +569,78 @@ class DcDcConverter(object):
         fw_ver_minor = self.GetVersionMinor()
         return str(fw_ver_major) + '.' + str(fw_ver_minor)
     
+    def GetRefreshEpoch(self):
+        """Get the number of the API data refresh currently being served.
+        
+            Backends that know when they refresh the data report their own count, otherwise it
+            is estimated from the timer period and the time the device was connected.
+            
+            @return Refresh epoch (increments once per timer period)
+        """
+        count = self.backend.refresh_count()
+        if count is None:
+            if self.refresh_origin is None:
+                return 0
+            count = int((monotonic() - self.refresh_origin) * 1000 / self.timer)
+        return count
+    
+    def GetSnapshot(self):
+        """Get every state variable in one go.
+        
+            The values are read in a single pass over the backend (a single HID report for the
+            native and simulated backends) instead of one call per getter.
+            
+            @see DcDcSnapshot
+            
+            @return DcDcSnapshot record
+        """
+        return DcDcSnapshot._make((time(),) + self.DCDCUsbLib.read_state())
+    
+    def GetSnapshotInto(self, buffer, row=0):
+        """Get every state variable and write it into a preallocated buffer.
+        
+            @param buffer SnapshotBuffer, or any writable sequence of floats holding rows of SNAPSHOT_WIDTH values
+            @param row row of the buffer to write to
+            
+            @see GetSnapshot
+        """
+        data = getattr(buffer, 'data', buffer)
+        base = row * SNAPSHOT_WIDTH
+        
+        data[base] = time()
+        for index, value in enumerate(self.DCDCUsbLib.read_state(), base + 1):
+            data[index] = value
+    
+    def GetSnapshotBatch(self, buffer, start=0, count=None, interval=None):
+        """Fill consecutive rows of a preallocated buffer with snapshots.
+        
+            @param buffer SnapshotBuffer to fill
+            @param start first row to write
+            @param count number of snapshots to take, defaults to the rest of the buffer
+            @param interval time between snapshots (seconds), defaults to the API refresh period
+            
+            @see GetSnapshotInto
+        """
+        if count is None:
+            count = len(buffer) - start
+        if interval is None:
+            interval = self.timer / 1000
+        
+        deadline = monotonic()
+        for row in range(start, start + count):
+            self.GetSnapshotInto(buffer, row)
+            deadline += interval
+            delay = deadline - monotonic()
+            if delay > 0 and row < start + count - 1:
+                sleep(delay)
+    
     def SetEnabledAuxVOut(self, on):
         """Set Auxiliary Output Enable
         
             @param on on/off
         """
         self.DCDCUsbLib.dcdcSetEnabledAuxVOut(on)
+        self.volatile_settings['SetEnabledAuxVOut'] = on
     
     def SetEnabledPowerSwitch(self, on):
         """Set Power Switch Enable
@@ -435,6 +648,7 @@ class DcDcConverter(object):
             @param on on/off
         """
         self.DCDCUsbLib.dcdcSetEnabledPowerSwitch(on)
+        self.volatile_settings['SetEnabledPowerSwitch'] = on
         
     def SetEnabledOutput(self, on):
         """Set Output Enable
@@ -442,6 +656,7 @@ class DcDcConverter(object):
             @param on on/off
         """
         self.DCDCUsbLib.dcdcSetEnabledOutput(on)
+        self.volatile_settings['SetEnabledOutput'] = on
         
     def IncDecVOutVolatile(self, inc):
         """Increase or decrease VOut
@@ -451,7 +666,10 @@ class DcDcConverter(object):
             
             @param inc inc/dec
         """
+        if 'IncDecVOutVolatile' not in self.volatile_settings:
+            self._vout_baseline = self.DCDCUsbLib.dcdcGetVOut()
         self.DCDCUsbLib.dcdcIncDecVOutVolatile(inc)
+        self.volatile_settings['IncDecVOutVolatile'] = self.volatile_settings.get('IncDecVOutVolatile', 0) + (1 if inc else -1)
         
     def SetVOutVolatile(self, vout):
         """Set VOut
@@ -462,16 +680,37 @@ class DcDcConverter(object):
             @param vout voltage
         """
         self.DCDCUsbLib.dcdcSetVOutVolatile(vout)
+        self.volatile_settings['SetVOutVolatile'] = vout
+        self.volatile_settings.pop('IncDecVOutVolatile', None)
         
-    def LoadFlashValues(self):
+    def LoadFlashValues(self, wait=False, timeout=None):
         """Start loading flash values.
         
             Load state is indicated by GetLoadState function.
             
+            Loading discards the cached variable table.
+            
             @see GetLoadState
+            @see GetVariableTable
+            
+            @param wait if True, return only once loading has completed (GetLoadState reached 100)
+            @param timeout maximum time to wait (seconds), None to wait forever
+            
+            @exception TimeoutError loading did not complete within timeout
         """
+        self.flash_generation += 1
+        self._variable_table = None
         self.DCDCUsbLib.dcdcLoadFlashValues()
         
+        if wait:
+            deadline = None if timeout is None else monotonic() + timeout
+            delay = POLL_BACKOFF_MIN
+            while self.GetLoadState() < 100:
+                if deadline is not None and monotonic() >= deadline:
+                    raise TimeoutError("Loading flash values did not complete in {} seconds".format(timeout))
+                sleep(delay)
+                delay = min(delay * 2, POLL_BACKOFF_MAX)
+        
     def GetLoadState(self):
         """Get loading state of flash variables. 
         
@@ -509,6 +748,29 @@ class DcDcConverter(object):
         """
         return self.DCDCUsbLib.dcdcGetVariableData(cnt, name, value, unit, comment)
     
+    def GetVariableTable(self):
+        """Get every flash variable, indexed by id and by short name.
+        
+            All variables are read in one pass the first time this is called after
+            LoadFlashValues; later calls return the cached table, so reading configuration values
+            costs dictionary lookups only.
+            
+            Values are only valid after a first succesfull LoadFlashValues (100%). A table read
+            while loading is still in progress is returned but not cached.
+            
+            @see DcDcVariables.VariableTable
+            @see LoadFlashValues
+            
+            @return VariableTable
+        """
+        table = self._variable_table
+        if table is None or table.generation != self.flash_generation:
+            loaded = self.GetLoadState() >= 100
+            table = _sibling('DcDcVariables').VariableTable(self)
+            if loaded:
+                self._variable_table = table
+        return table
+    
     def SetVariableData(self, cnt, value):
         """Set one data value in PC copy of DCDCUsb Variables.
         
@@ -530,7 +792,10 @@ class DcDcConverter(object):
             
             @todo need to test function to see what value is returned upon success/failure
         """
-        return self.DCDCUsbLib.dcdcSetVariableData(cnt, value)
+        result = self.DCDCUsbLib.dcdcSetVariableData(cnt, value)
+        if self._variable_table is not None:
+            self._variable_table.update(cnt, value.decode('UTF-8') if isinstance(value, bytes) else value)
+        return result
     
     def SaveFlashValues(self):
         """Save the full flash to DCDCUsb.
@@ -540,8 +805,50 @@ class DcDcConverter(object):
             functionality which writes the flash many times.
 
             This function should be called only after first succesfull dcdcLoadFlashValues otherwise nothing will be saved.        
+            
+            @see FlashTransaction
         """
         self.DCDCUsbLib.dcdcSaveFlashValues()
+    
+    def FlashTransaction(self, counter=None, budget=_DEFAULT_BUDGET):
+        """Stage flash variable edits and save the flash at most once.
+        
+            Usage:
+            
+                with converter.FlashTransaction() as flash:
+                    flash.set('VOut', 12.5)
+            
+            SaveFlashValues is only called if a staged value differs from the loaded one, and
+            every save is counted against the device's write budget.
+            
+            @see DcDcFlash.FlashTransaction
+            
+            @param counter DcDcFlash.FlashWearCounter recording saves, defaults to the per-user counter file
+            @param budget maximum number of saves allowed per device, None for no limit, defaults to DcDcFlash.DEFAULT_WRITE_BUDGET
+            
+            @return DcDcFlash.FlashTransaction
+        """
+        flash = _sibling('DcDcFlash')
+        if budget is _DEFAULT_BUDGET:
+            budget = flash.DEFAULT_WRITE_BUDGET
+        return flash.FlashTransaction(self, counter, budget)
+
+    def ApplyProfile(self, profile, counter=None, budget=_DEFAULT_BUDGET):
+        """Apply a configuration profile in one flash transaction.
+        
+            Only the values that differ are written, and the flash is saved at most once.
+            
+            @see DcDcProfiles.applyProfile
+            
+            @param profile DcDcProfiles.CompiledProfile, or a DcDcProfiles.Profile to compile against this device
+            @param counter DcDcFlash.FlashWearCounter recording saves, defaults to the per-user counter file
+            @param budget maximum number of saves allowed per device, None for no limit, defaults to DcDcFlash.DEFAULT_WRITE_BUDGET
+            
+            @return dict of variable id to (old text, new text) for the values written
+        """
+        if budget is _DEFAULT_BUDGET:
+            budget = _sibling('DcDcFlash').DEFAULT_WRITE_BUDGET
+        return _sibling('DcDcProfiles').applyProfile(self, profile, counter, budget)
 
 
 ##@cond
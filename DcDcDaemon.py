@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcDaemon
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Share one converter between processes through a Unix domain socket
+
+DCDCUsbLib binds the opened device to one process. The daemon owns the DcDcConverter, samples
+it once per refresh and serves the cached snapshot and method calls to any number of local
+clients:
+
+    python DcDcDaemon.py --devcount 1 --timer 1 --socket /run/minibox_dcdc.sock
+
+    client = DcDcClient('/run/minibox_dcdc.sock')
+    client.snapshot().vin
+    client.SetEnabledOutput(0)
+
+Protocol: every message is a 5-byte header (op or status byte, payload length as uint32,
+little endian) followed by the payload.
+    - OP_SNAPSHOT, no payload: reply is the sample count (uint64) and the latest snapshot
+      (SNAPSHOT_WIDTH doubles).
+    - OP_WAIT, count (uint64) and timeout (double): same reply, sent once a sample newer than
+      count exists (or at the timeout).
+    - OP_CALL, method name (uint8 length + UTF-8) and encoded arguments: reply is the encoded
+      return value.
+Values are encoded as a type byte followed by the value: 'n' None, 'i' int64, 'd' double,
+'s' UTF-8 string (uint16 length). Failed requests reply STATUS_ERROR with the message.
+"""
+
+import os
+import sys
+import errno
+import stat
+import socket
+import struct
+import logging
+import argparse
+import threading
+import socketserver
+
+if __package__:
+    from .DcDcConverter import DcDcConverter
+    from .DcDcSampler import DcDcSampler
+    from .DcDcActor import CommandActor
+    from .DcDcSnapshot import DcDcSnapshot, SNAPSHOT_WIDTH
+else:
+    from DcDcConverter import DcDcConverter
+    from DcDcSampler import DcDcSampler
+    from DcDcActor import CommandActor
+    from DcDcSnapshot import DcDcSnapshot, SNAPSHOT_WIDTH
+
+##@cond
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = '/tmp/minibox_dcdc.sock'
+
+HEADER = struct.Struct('<BI')
+SAMPLE = struct.Struct('<Q{}d'.format(SNAPSHOT_WIDTH))
+WAIT = struct.Struct('<Qd')
+
+OP_SNAPSHOT = 1
+OP_WAIT = 2
+OP_CALL = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+#Methods clients may call: scalar arguments and results only, connection management stays with the daemon
+CALLABLE_METHODS = frozenset((
+    'GetConnected', 'GetTimeCfg', 'GetVoltageCfg', 'GetMode', 'GetState', 'GetVin', 'GetVIgn', 'GetVOut',
+    'GetEnabledPowerSwitch', 'GetEnabledOutput', 'GetEnabledAuxVOut', 'GetFlagsStatus1', 'GetFlagsStatus2',
+    'GetFlagsVoltage', 'GetFlagsTimer', 'GetFlashPointer', 'GetTimerWait', 'GetTimerVout', 'GetTimerVAux',
+    'GetTimerPwSwitch', 'GetTimerOffDelay', 'GetTimerHardOff', 'GetVersionMajor', 'GetVersionMinor',
+    'GetVersion', 'GetRefreshEpoch', 'GetLoadState', 'GetMaxVariableCnt',
+    'SetEnabledAuxVOut', 'SetEnabledPowerSwitch', 'SetEnabledOutput', 'IncDecVOutVolatile', 'SetVOutVolatile',
+    'LoadFlashValues', 'SetVariableData', 'SaveFlashValues',
+))
+
+#String arguments the DLL takes as bytes, by method: argument positions
+BYTES_ARGUMENTS = {'SetVariableData': (1,)}
+##@endcond
+
+
+class DaemonError(Exception):
+    """A request failed in the daemon."""
+
+
+def _encode(values):
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append(b'n')
+        elif isinstance(value, int):
+            parts.append(b'i' + struct.pack('<q', value))
+        elif isinstance(value, float):
+            parts.append(b'd' + struct.pack('<d', value))
+        elif isinstance(value, str):
+            text = value.encode('UTF-8')
+            parts.append(b's' + struct.pack('<H', len(text)) + text)
+        else:
+            raise TypeError("Cannot send a {} over the daemon protocol".format(type(value).__name__))
+    return b''.join(parts)
+
+def _decode(data):
+    values = []
+    offset = 0
+    while offset < len(data):
+        kind = data[offset:offset + 1]
+        offset += 1
+        if kind == b'n':
+            values.append(None)
+        elif kind == b'i':
+            values.append(struct.unpack_from('<q', data, offset)[0])
+            offset += 8
+        elif kind == b'd':
+            values.append(struct.unpack_from('<d', data, offset)[0])
+            offset += 8
+        elif kind == b's':
+            length, = struct.unpack_from('<H', data, offset)
+            values.append(bytes(data[offset + 2:offset + 2 + length]).decode('UTF-8'))
+            offset += 2 + length
+        else:
+            raise ValueError("Unknown value type {!r}".format(kind))
+    return values
+
+def _recvExact(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Connection closed")
+        received += count
+    return buffer
+
+def _send(sock, code, payload=b''):
+    sock.sendall(HEADER.pack(code, len(payload)) + payload)
+
+def _receive(sock):
+    code, length = HEADER.unpack(_recvExact(sock, HEADER.size))
+    return code, _recvExact(sock, length) if length else b''
+
+
+class _Handler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        daemon = self.server.daemon
+        sock = self.request
+        while True:
+            try:
+                op, payload = _receive(sock)
+            except ConnectionError:
+                return
+            try:
+                _send(sock, STATUS_OK, daemon.handle(op, payload))
+            except Exception as err:
+                _send(sock, STATUS_ERROR, str(err).encode('UTF-8'))
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DcDcDaemon(object):
+    """Serve one converter's snapshots and methods over a Unix domain socket.
+
+        The daemon samples the converter once per refresh with a DcDcSampler, so snapshot
+        requests are answered from memory without touching the device. Calls go through the
+        converter's command actor, which serialises them with the sampler's reads and runs
+        control commands first.
+    """
+
+    def __init__(self, converter, path=DEFAULT_SOCKET_PATH, mode=0o660):
+        """Start sampling and serving.
+
+            @param converter connected DcDcConverter
+            @param path socket path; a stale socket left at this path is replaced
+            @param mode permissions of the socket file
+
+            @exception OSError (EADDRINUSE) another daemon is serving on path
+        """
+        self.converter = converter
+        self.path = path
+
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            #Only replace a socket nobody is listening on any more
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise OSError(errno.EADDRINUSE, "Another DcDcDaemon is serving on {}".format(path))
+            finally:
+                probe.close()
+
+        #Only an actor the daemon added itself is removed again by close()
+        self._actor = None
+        if not any(isinstance(layer, CommandActor) for layer in converter._layers):
+            self._actor = converter.EnableCommandActor()
+        #Two rows: a reply reads the previous row while the sampler writes the next one
+        self.sampler = DcDcSampler(converter, 2)
+        self._data = memoryview(self.sampler.buffer.data)
+        self.sampler.sample()
+        self.sampler.start()
+
+        #Permissions are set before listening, so nobody can connect while the socket has the default ones
+        self._server = _Server(path, _Handler, bind_and_activate=False)
+        self._server.daemon = self
+        try:
+            self._server.server_bind()
+            os.chmod(path, mode)
+            self._server.server_activate()
+        except BaseException:
+            self._server.server_close()
+            self.sampler.stop()
+            if self._actor is not None:
+                converter.RemoveLayer(self._actor)
+            raise
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name='DcDcDaemon', daemon=True)
+        self._thread.start()
+        logger.info("Serving device {} on {}".format(converter.devcount, path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def handle(self, op, payload):
+        """Answer one request.
+
+            @param op OP_SNAPSHOT, OP_WAIT or OP_CALL
+            @param payload request payload
+
+            @return reply payload
+        """
+        if op == OP_SNAPSHOT:
+            return self._sample()
+        if op == OP_WAIT:
+            count, timeout = WAIT.unpack(payload)
+            self.sampler.wait(count, timeout if timeout >= 0 else None)
+            return self._sample()
+        if op == OP_CALL:
+            length = payload[0]
+            method = bytes(payload[1:1 + length]).decode('UTF-8')
+            if method not in CALLABLE_METHODS:
+                raise DaemonError("{} cannot be called through the daemon".format(method))
+            args = _decode(payload[1 + length:])
+            for index in BYTES_ARGUMENTS.get(method, ()):
+                if index < len(args) and isinstance(args[index], str):
+                    args[index] = args[index].encode('UTF-8')
+            return _encode((getattr(self.converter, method)(*args),))
+        raise DaemonError("Unknown request {}".format(op))
+
+    def _sample(self):
+        #Count and row of the latest sample; retried if the sampler moved on to overwrite the row
+        sampler = self.sampler
+        while True:
+            count = sampler.count
+            start = (count - 1) % sampler.capacity * SNAPSHOT_WIDTH
+            row = self._data[start:start + SNAPSHOT_WIDTH].tobytes()
+            if sampler.count == count:
+                return struct.pack('<Q', count) + row
+
+    def serve_forever(self):
+        """Block until the daemon is closed (or interrupted)."""
+        self._thread.join()
+
+    def close(self):
+        """Stop serving, stop sampling and remove the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        self.sampler.stop()
+        if self._actor is not None and self._actor in self.converter._layers:
+            self.converter.RemoveLayer(self._actor)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class DcDcClient(object):
+    """Thin client of a DcDcDaemon.
+
+        The DcDcConverter methods in CALLABLE_METHODS can be called on the client, e.g.
+        client.GetVin(); arguments and results are limited to None, int, float and str. snapshot() returns the
+        daemon's cached snapshot and is the cheap way to read state.
+
+        A client can be shared between threads; requests are serialised.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET_PATH, timeout=None):
+        """Connect to a daemon.
+
+            @param path socket path of the daemon
+            @param timeout socket timeout (seconds)
+        """
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        if name not in CALLABLE_METHODS:
+            raise AttributeError(name)
+        return lambda *args: self.call(name, *args)
+
+    def _request(self, op, payload=b''):
+        with self._lock:
+            _send(self._sock, op, payload)
+            status, reply = _receive(self._sock)
+        if status != STATUS_OK:
+            raise DaemonError(bytes(reply).decode('UTF-8'))
+        return reply
+
+    def _snapshot(self, reply):
+        values = SAMPLE.unpack(reply)
+        self.count = values[0]
+        return DcDcSnapshot._make(values[1:])
+
+    def snapshot(self):
+        """Get the daemon's latest snapshot (no device access).
+
+            @return DcDcSnapshot
+        """
+        return self._snapshot(self._request(OP_SNAPSHOT))
+
+    def wait(self, timeout=None):
+        """Wait for a snapshot newer than the last one this client received.
+
+            @param timeout maximum time to wait (seconds)
+
+            @return DcDcSnapshot (the latest one if the timeout expired)
+        """
+        return self._snapshot(self._request(OP_WAIT, WAIT.pack(self.count, -1.0 if timeout is None else timeout)))
+
+    def call(self, method, *args):
+        """Call a DcDcConverter method in the daemon.
+
+            @param method method name, e.g. 'SetEnabledOutput'
+            @param args arguments (None, int, float or str)
+
+            @return the method's result
+        """
+        name = method.encode('UTF-8')
+        return _decode(self._request(OP_CALL, bytes((len(name),)) + name + _encode(args)))[0]
+
+    def close(self):
+        """Disconnect from the daemon."""
+        self._sock.close()
+
+
+##@cond
+if __name__ == '__main__':
+    logging.basicConfig(format='%(levelname)s\t-\t %(name)s\t- %(message)s', level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Share a DC-DC converter with local processes over a Unix domain socket")
+    parser.add_argument('--devcount', type=int, default=1, help="number of the device to open")
+    parser.add_argument('--timer', type=float, default=1.0, help="API refresh period (seconds)")
+    parser.add_argument('--timeout', type=float, default=5.0, help="how long to keep trying to connect (seconds)")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help="socket path")
+    args = parser.parse_args()
+
+    try:
+        Converter = DcDcConverter(args.devcount, args.timer, args.timeout)
+    except Exception as err:
+        logger.info("Program terminated")
+        raise err
+
+    daemon = DcDcDaemon(Converter, args.socket)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        Converter.CloseDevice()
+
+    logger.info("Program terminated")
+    sys.exit()
+##@endcond
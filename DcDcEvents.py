@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcEvents
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Level, hysteresis and edge subscriptions on state variables, evaluated once per refresh
+
+One engine evaluates every subscription against each new snapshot from a DcDcSampler. Level
+subscriptions on a variable are kept sorted by threshold: a refresh only looks at the thresholds
+between the previous and the new value (found by binary search), and a variable that did not
+change costs nothing. The work per refresh therefore depends on the number of subscriptions that
+actually trigger, not on the number registered.
+"""
+
+import logging
+import threading
+
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+if __package__:
+    from .DcDcSampler import DcDcSampler
+    from .DcDcSnapshot import SNAPSHOT_FIELDS
+    from .DcDcFlags import decoder
+else:
+    from DcDcSampler import DcDcSampler
+    from DcDcSnapshot import SNAPSHOT_FIELDS
+    from DcDcFlags import decoder
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Edge kinds
+EDGE_RISING = 'rising'
+EDGE_FALLING = 'falling'
+EDGE_CHANGE = 'change'
+##@endcond
+
+
+class DcDcEvent(namedtuple('DcDcEvent', ('subscription', 'field', 'value', 'previous', 'snapshot'))):
+    """A triggered subscription.
+
+        previous is the value at the previous refresh (None when a level subscription triggers
+        on its first evaluation).
+    """
+
+    __slots__ = ()
+
+
+class Subscription(object):
+    """A registered trigger; returned by EventEngine.subscribe."""
+
+    def __init__(self, engine, field, callback, above, below, hysteresis, edge, loop):
+        self.engine = engine
+        self.field = field
+        self.callback = callback
+        self.above = above
+        self.below = below
+        self.hysteresis = hysteresis
+        self.edge = edge
+        self.loop = loop
+        #Level subscriptions trigger when armed and the level is reached, then wait to re-arm
+        self.armed = True
+
+    def cancel(self):
+        """Stop the subscription."""
+        self.engine.unsubscribe(self)
+
+    def _level(self, value):
+        #Whether the level condition holds at value
+        if self.above is not None:
+            return value > self.above
+        return value < self.below
+
+    def _dispatch(self, event):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.callback, event)
+            return
+        try:
+            self.callback(event)
+        except Exception as err:
+            logger.error("Event callback for {} failed: {}".format(self.field, err))
+
+
+class _Thresholds(object):
+    """Subscriptions sorted by one threshold value."""
+
+    def __init__(self):
+        self.keys = []
+        self.subscriptions = []
+
+    def add(self, key, subscription):
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.subscriptions.insert(index, subscription)
+
+    def remove(self, key, subscription):
+        index = bisect_left(self.keys, key)
+        while self.subscriptions[index] is not subscription:
+            index += 1
+        del self.keys[index]
+        del self.subscriptions[index]
+
+    def between(self, lower, upper, inclusive_upper):
+        """Subscriptions with lower < key <= upper (inclusive_upper) or lower <= key < upper."""
+        if inclusive_upper:
+            return self.subscriptions[bisect_right(self.keys, lower):bisect_right(self.keys, upper)]
+        return self.subscriptions[bisect_left(self.keys, lower):bisect_left(self.keys, upper)]
+
+
+class _Field(object):
+    """Every subscription on one variable."""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = None
+        self.count = 0
+
+        #Decoded flags are written 'flags_status1.output'
+        field, _, flag = name.partition('.')
+        self.source = field
+        self.bit = decoder.flag_names[field].index(flag) if flag else None
+
+        #below: trigger when the value falls under the threshold, re-arm at threshold + hysteresis
+        self.below = _Thresholds()
+        self.below_rearm = _Thresholds()
+        #above: trigger when the value rises over the threshold, re-arm at threshold - hysteresis
+        self.above = _Thresholds()
+        self.above_rearm = _Thresholds()
+        self.edges = {EDGE_RISING: [], EDGE_FALLING: [], EDGE_CHANGE: []}
+
+    def read(self, snapshot):
+        value = getattr(snapshot, self.source)
+        if self.bit is not None:
+            return (int(value) >> self.bit) & 1
+        return value
+
+    def add(self, subscription):
+        self.count += 1
+        if subscription.edge is not None:
+            self.edges[subscription.edge].append(subscription)
+        elif subscription.above is not None:
+            self.above.add(subscription.above, subscription)
+            self.above_rearm.add(subscription.above - subscription.hysteresis, subscription)
+        else:
+            self.below.add(subscription.below, subscription)
+            self.below_rearm.add(subscription.below + subscription.hysteresis, subscription)
+
+    def remove(self, subscription):
+        self.count -= 1
+        if subscription.edge is not None:
+            self.edges[subscription.edge].remove(subscription)
+        elif subscription.above is not None:
+            self.above.remove(subscription.above, subscription)
+            self.above_rearm.remove(subscription.above - subscription.hysteresis, subscription)
+        else:
+            self.below.remove(subscription.below, subscription)
+            self.below_rearm.remove(subscription.below + subscription.hysteresis, subscription)
+
+    def evaluate(self, value, triggered):
+        previous = self.value
+        self.value = value
+        if previous is None or value == previous:
+            return
+
+        if value > previous:
+            for subscription in self.below_rearm.between(previous, value, True):
+                subscription.armed = True
+            for subscription in self.above.between(previous, value, False):
+                if subscription.armed:
+                    subscription.armed = False
+                    triggered.append((subscription, value, previous))
+        else:
+            for subscription in self.above_rearm.between(value, previous, False):
+                subscription.armed = True
+            for subscription in self.below.between(value, previous, True):
+                if subscription.armed:
+                    subscription.armed = False
+                    triggered.append((subscription, value, previous))
+
+        edges = self.edges[EDGE_RISING if value > previous else EDGE_FALLING] + self.edges[EDGE_CHANGE]
+        for subscription in edges:
+            triggered.append((subscription, value, previous))
+
+
+class EventEngine(object):
+    """Evaluate subscriptions once per API refresh.
+
+        Usually created through DcDcConverter.Subscribe, which starts an engine with its own
+        sampler the first time it is called. Pass a running DcDcSampler to share one instead.
+
+        Callbacks run on the sampling thread unless the subscription was given an asyncio loop,
+        in which case they are scheduled on that loop; either way they should return quickly.
+    """
+
+    def __init__(self, converter, sampler=None):
+        """Create the engine and start evaluating.
+
+            @param converter DcDcConverter to watch
+            @param sampler DcDcSampler to take snapshots from, defaults to a new one owned by the engine
+        """
+        self.converter = converter
+        self._owns_sampler = sampler is None
+        self.sampler = DcDcSampler(converter, 2) if sampler is None else sampler
+
+        self._fields = {}
+        self._pending = []
+        self._lock = threading.Lock()
+
+        self.sampler.addListener(self.evaluate)
+        if self._owns_sampler:
+            self.sampler.start()
+
+    def subscribe(self, field, callback, above=None, below=None, hysteresis=0.0, edge=None, loop=None):
+        """Register a trigger on a state variable or decoded flag.
+
+            Exactly one of above, below or edge must be given:
+                - above/below: level trigger, fires when the value rises over / falls under the
+                  threshold (also on the first evaluation if it already is). With hysteresis, it
+                  fires again only after the value has come back by more than hysteresis.
+                - edge: 'rising', 'falling' or 'change', fires when the value changes that way.
+
+            @param field snapshot field ('vin', 'enabled_output'...) or decoded flag ('flags_status1.output')
+            @param callback callable(DcDcEvent)
+            @param above threshold for a rising level trigger
+            @param below threshold for a falling level trigger
+            @param hysteresis re-arm distance for level triggers
+            @param edge EDGE_RISING, EDGE_FALLING or EDGE_CHANGE
+            @param loop asyncio event loop to run the callback on (with call_soon_threadsafe)
+
+            @return Subscription
+
+            @exception ValueError unknown field or flag, or invalid trigger options
+        """
+        source, _, flag = field.partition('.')
+        if source not in SNAPSHOT_FIELDS:
+            raise ValueError("Unknown field {}".format(field))
+        if flag and flag not in decoder.flag_names.get(source, ()):
+            raise ValueError("Unknown flag {}".format(field))
+        if sum(option is not None for option in (above, below, edge)) != 1:
+            raise ValueError("Give exactly one of above, below or edge")
+        if edge not in (None, EDGE_RISING, EDGE_FALLING, EDGE_CHANGE):
+            raise ValueError("Unknown edge {}".format(edge))
+        if hysteresis < 0:
+            raise ValueError("Hysteresis must not be negative")
+
+        subscription = Subscription(self, field, callback, above, below, hysteresis, edge, loop)
+        with self._lock:
+            if field not in self._fields:
+                self._fields[field] = _Field(field)
+            if edge is None:
+                #Checked against the current level on the next evaluation, then by crossings
+                self._pending.append(subscription)
+            else:
+                self._fields[field].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription.
+
+            @param subscription Subscription returned by subscribe
+        """
+        with self._lock:
+            field = self._fields[subscription.field]
+            if subscription in self._pending:
+                self._pending.remove(subscription)
+            else:
+                field.remove(subscription)
+            if not field.count and not any(pending.field == field.name for pending in self._pending):
+                del self._fields[field.name]
+
+    def evaluate(self, snapshot):
+        """Evaluate every subscription against a new snapshot (called by the sampler).
+
+            @param snapshot DcDcSnapshot
+        """
+        triggered = []
+        with self._lock:
+            for field in self._fields.values():
+                field.evaluate(field.read(snapshot), triggered)
+
+            for subscription in self._pending:
+                field = self._fields[subscription.field]
+                if subscription._level(field.value):
+                    subscription.armed = False
+                    triggered.append((subscription, field.value, None))
+                field.add(subscription)
+            del self._pending[:]
+
+        for subscription, value, previous in triggered:
+            subscription._dispatch(DcDcEvent(subscription, subscription.field, value, previous, snapshot))
+
+    def close(self):
+        """Stop evaluating (and stop the sampler if the engine created it)."""
+        self.sampler.removeListener(self.evaluate)
+        if self._owns_sampler:
+            self.sampler.stop()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcFlags
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Table-driven decoding of the flag bytes and enumerated state variables
+
+Every flag byte and enumerated value is decoded through a 256-entry lookup table built once,
+so decoding a byte is a single index. The same tables decode whole arrays of recorded bytes at
+once with NumPy (e.g. a DcDcSampler column or a TelemetryLog field).
+
+Bits without a documented meaning are named bit0 to bit7; pass your own names to FlagDecoder
+when you know them.
+"""
+
+import logging
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Flag bytes and the name of each bit, least significant first
+FLAG_NAMES = {
+    'flags_status1': ('bit0', 'bit1', 'power_switch', 'output', 'aux_vout', 'bit5', 'bit6', 'bit7'),
+    'flags_status2': ('bit0', 'bit1', 'bit2', 'bit3', 'bit4', 'bit5', 'bit6', 'bit7'),
+    'flags_voltage': ('bit0', 'bit1', 'bit2', 'bit3', 'bit4', 'bit5', 'bit6', 'bit7'),
+    'flags_timer': ('bit0', 'bit1', 'bit2', 'bit3', 'bit4', 'bit5', 'bit6', 'bit7'),
+}
+
+#Enumerated state variables and the name of each known value
+ENUM_NAMES = {
+    'mode': {0: 'Dumb', 1: 'Automotive', 2: 'Script', 3: 'UPS'},
+    'state': {},
+}
+
+#Name of enumerated values missing from ENUM_NAMES
+UNKNOWN_ENUM = {
+    'mode': 'ERROR',
+}
+##@endcond
+
+
+def _numpy():
+    #NumPy is only imported by the array functions, so importing DcDcConverter stays cheap
+    import numpy
+    return numpy
+
+
+class FlagDecoder(object):
+    """Decode flag bytes and enumerated values through precomputed lookup tables.
+
+            decoder = FlagDecoder()
+            decoder.flags('flags_status1', converter.GetFlagsStatus1())  #('output',)
+            decoder.name('mode', converter.GetMode())                    #'Automotive'
+            decoder.flagArrays('flags_status1', sampler.column('flags_status1'))['output']
+    """
+
+    def __init__(self, flag_names=None, enum_names=None):
+        """Build the lookup tables.
+
+            @param flag_names dict of flag byte to 8 bit names, least significant first, overriding FLAG_NAMES
+            @param enum_names dict of enumerated variable to {value: name}, overriding ENUM_NAMES
+        """
+        self.flag_names = dict(FLAG_NAMES)
+        self.flag_names.update(flag_names or {})
+        self.enum_names = dict(ENUM_NAMES)
+        self.enum_names.update(enum_names or {})
+
+        for field, names in self.flag_names.items():
+            if len(names) != 8:
+                raise ValueError("{} needs 8 bit names, got {}".format(field, len(names)))
+
+        #Per field, for every byte value: tuple of the names of the bits set
+        self.flag_tables = dict(
+            (field, tuple(
+                tuple(name for bit, name in enumerate(names) if value & (1 << bit))
+                for value in range(256)
+            ))
+            for field, names in self.flag_names.items()
+        )
+        #Per field, for every byte value: the value's name
+        self.enum_tables = dict(
+            (field, tuple(
+                names.get(value, UNKNOWN_ENUM.get(field, str(value))) for value in range(256)
+            ))
+            for field, names in self.enum_names.items()
+        )
+
+        self._bit_table = None
+
+    def flags(self, field, value):
+        """Get the flags set in a flag byte.
+
+            @param field flag byte, e.g. 'flags_status1'
+            @param value byte value
+
+            @return tuple of flag names, least significant bit first
+        """
+        return self.flag_tables[field][int(value) & 0xFF]
+
+    def name(self, field, value):
+        """Get the name of an enumerated value.
+
+            @param field enumerated variable, 'mode' or 'state'
+            @param value value
+
+            @return name
+        """
+        return self.enum_tables[field][int(value) & 0xFF]
+
+    def decode(self, snapshot):
+        """Decode every flag byte and enumerated value of a snapshot.
+
+            @param snapshot DcDcSnapshot (or dict with the same keys)
+
+            @return dict of field to tuple of flag names (flag bytes) or name (enumerated values)
+        """
+        get = snapshot.get if isinstance(snapshot, dict) else lambda field: getattr(snapshot, field)
+        decoded = {}
+        for field, table in self.flag_tables.items():
+            decoded[field] = table[int(get(field)) & 0xFF]
+        for field, table in self.enum_tables.items():
+            decoded[field] = table[int(get(field)) & 0xFF]
+        return decoded
+
+    def flagArrays(self, field, values):
+        """Decode an array of flag bytes at once.
+
+            @param field flag byte, e.g. 'flags_status1'
+            @param values array-like of byte values (any numeric dtype, e.g. a sampler column)
+
+            @return dict of flag name to NumPy bool array
+
+            @exception ImportError NumPy is not installed
+        """
+        bits = self._bitTable()[self._bytes(values)]
+        return dict((name, bits[:, bit]) for bit, name in enumerate(self.flag_names[field]))
+
+    def nameArray(self, field, values):
+        """Decode an array of enumerated values at once.
+
+            @param field enumerated variable, 'mode' or 'state'
+            @param values array-like of values
+
+            @return NumPy array of names
+
+            @exception ImportError NumPy is not installed
+        """
+        return _numpy().asarray(self.enum_tables[field])[self._bytes(values)]
+
+    def _bytes(self, values):
+        numpy = _numpy()
+        values = numpy.asarray(values)
+        if values.dtype != numpy.uint8:
+            values = values.astype(numpy.int64) & 0xFF
+        return values
+
+    def _bitTable(self):
+        #(256, 8) bool table of the bits of every byte value, built on first vectorized use
+        if self._bit_table is None:
+            numpy = _numpy()
+            values = numpy.arange(256, dtype=numpy.uint8)[:, None]
+            self._bit_table = numpy.unpackbits(values, axis=1, bitorder='little').astype(bool)
+        return self._bit_table
+
+
+##@cond
+#Decoder with the default names
+decoder = FlagDecoder()
+##@endcond
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcFlash
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Transactional flash writes with wear accounting
+
+The DCDCUsb flash is rated for about 10k writes and SaveFlashValues always rewrites all of it.
+A FlashTransaction stages variable edits, compares them with the loaded values and saves the
+flash once at the end, and only if something actually changed. Every save is counted per device
+in a small persistent file so a budget of writes can be enforced.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+
+from ctypes import create_string_buffer
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+if __package__:
+    from .DcDcBackends import UnsupportedOperation
+    from .DcDcVariables import parseValue
+else:
+    from DcDcBackends import UnsupportedOperation
+    from DcDcVariables import parseValue
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Default location of the persistent flash write counters
+DEFAULT_COUNTER_PATH = os.path.join(os.path.expanduser('~'), '.minibox_dcdc', 'flash_writes.json')
+
+#Writes allowed per device by default, leaving a margin below the 10k rated writes
+DEFAULT_WRITE_BUDGET = 9000
+##@endcond
+
+
+class FlashWearError(Exception):
+    """Saving the flash would exceed the device's write budget."""
+
+
+class FlashWriteError(Exception):
+    """The device rejected a flash variable edit."""
+
+
+def formatValue(value, current):
+    """Format a value the way the DLL formats the variable it replaces.
+
+        Floats get the same number of decimals as the current value text.
+
+        @param value new value (str, int, float or bool)
+        @param current current value text
+
+        @return value text
+    """
+    if isinstance(value, bytes):
+        return value.decode('UTF-8')
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        decimals = len(current.split('.', 1)[1]) if '.' in current else 2
+        return '{:.{}f}'.format(value, decimals)
+    return str(value)
+
+
+class FlashWearCounter(object):
+    """Persistent count of flash saves per device, stored as JSON.
+
+        Only saves made through this module are counted, so the count is a lower bound of the
+        real number of writes. Any number of counters, in any number of processes, can share
+        one file: increments hold an exclusive lock on a lockfile next to it (where fcntl is
+        available) and replace the file atomically.
+    """
+
+    def __init__(self, path=DEFAULT_COUNTER_PATH):
+        """Open the counter file (created on the first write).
+
+            @param path JSON file holding the counters
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        #Picklable for DcDcFleet workers: the file lock is what keeps processes consistent
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def _read(self):
+        try:
+            with open(self.path) as counters:
+                return json.load(counters)
+        except (OSError, ValueError):
+            return {}
+
+    def _acquire(self):
+        """Take the lock shared with every other counter on the same file.
+
+            @return open lockfile to pass to _release, None without fcntl
+        """
+        self._lock.acquire()
+        if fcntl is None:
+            return None
+        try:
+            lockfile = open(self.path + '.lock', 'a')
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+        except BaseException:
+            self._lock.release()
+            raise
+        return lockfile
+
+    def _release(self, lockfile):
+        if lockfile is not None:
+            fcntl.flock(lockfile, fcntl.LOCK_UN)
+            lockfile.close()
+        self._lock.release()
+
+    def count(self, device):
+        """Get the number of flash saves recorded for a device.
+
+            @param device device key (device path)
+
+            @return number of saves
+        """
+        with self._lock:
+            return self._read().get(device, 0)
+
+    def increment(self, device):
+        """Record one flash save for a device.
+
+            @param device device key (device path)
+
+            @return number of saves including this one
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        lockfile = self._acquire()
+        try:
+            counters = self._read()
+            counters[device] = counters.get(device, 0) + 1
+
+            handle, temporary = tempfile.mkstemp(dir=directory or '.', suffix='.tmp')
+            try:
+                with os.fdopen(handle, 'w') as output:
+                    json.dump(counters, output, indent=1, sort_keys=True)
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+            return counters[device]
+        finally:
+            self._release(lockfile)
+
+
+class FlashTransaction(object):
+    """Staged flash variable edits, saved with at most one SaveFlashValues.
+
+            with converter.FlashTransaction() as flash:
+                flash.set('VOut', 12.5)
+                flash.set('TimerOffDelay', 60)
+
+        On entry the flash values are loaded if they are not already. On a clean exit, staged
+        values that differ from the loaded ones are written with SetVariableData and the flash
+        is saved once; if nothing differs nothing is written at all. Leaving the block with an
+        exception discards the staged edits.
+    """
+
+    def __init__(self, converter, counter=None, budget=DEFAULT_WRITE_BUDGET, timeout=10):
+        """Create a transaction.
+
+            @param converter DcDcConverter to configure
+            @param counter FlashWearCounter to record saves in, defaults to the per-user counter file
+            @param budget maximum number of saves allowed per device, None for no limit
+            @param timeout maximum time to wait for flash values to load (seconds)
+        """
+        self.converter = converter
+        self.counter = counter if counter is not None else FlashWearCounter()
+        self.budget = budget
+        self.timeout = timeout
+
+        self.staged = {}
+        self.saved = False
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def begin(self):
+        """Make sure the flash values are loaded and discard any staged edits.
+
+            @exception DcDcBackends.UnsupportedOperation the backend has no flash access (e.g. hidraw)
+        """
+        converter = self.converter
+        try:
+            if converter.flash_generation == 0 or converter.GetLoadState() < 100:
+                converter.LoadFlashValues(wait=True, timeout=self.timeout)
+        except UnsupportedOperation as err:
+            raise UnsupportedOperation("Flash transactions are not supported by this backend: {}".format(err))
+        self.staged = {}
+        self.saved = False
+
+    def set(self, key, value):
+        """Stage a new value for a variable.
+
+            @param key variable id or short name
+            @param value new value (str, int, float or bool)
+
+            @exception KeyError no such variable
+        """
+        variable = self.converter.GetVariableTable()[key]
+        self.staged[variable.id] = formatValue(value, variable.text)
+
+    def SetVariableData(self, cnt, value):
+        """Stage a new value, with the same arguments as DcDcConverter.SetVariableData.
+
+            @param cnt variable id
+            @param value variable value
+        """
+        self.set(cnt, value)
+
+    def diff(self):
+        """Get the staged values that differ from the loaded ones.
+
+            @return dict of variable id to (current text, new text)
+        """
+        table = self.converter.GetVariableTable()
+        changes = {}
+        for cnt, text in self.staged.items():
+            variable = table[cnt]
+            if parseValue(text) != variable.value:
+                changes[cnt] = (variable.text, text)
+        return changes
+
+    def discard(self):
+        """Drop the staged edits."""
+        self.staged = {}
+
+    def commit(self):
+        """Write the changed values and save the flash once if anything changed.
+
+            @return dict of variable id to (old text, new text) for the values written
+
+            @exception FlashWearError the device has used up its write budget
+            @exception FlashWriteError the device rejected an edit; the flash is not saved
+        """
+        changes = self.diff()
+        self.staged = {}
+        if not changes:
+            logger.debug("Flash values unchanged; not saving")
+            return changes
+
+        device = self._device()
+        if self.budget is not None:
+            writes = self.counter.count(device)
+            if writes >= self.budget:
+                raise FlashWearError("Flash write budget of {} used up for {}".format(self.budget, device))
+
+        for cnt, (old, new) in sorted(changes.items()):
+            if not self.converter.SetVariableData(cnt, new.encode('UTF-8')):
+                raise FlashWriteError("{} rejected {!r} for variable {}; flash not saved".format(device, new, cnt))
+        self.converter.SaveFlashValues()
+        self.saved = True
+
+        writes = self.counter.increment(device)
+        logger.info("Saved {} flash value(s) to {} (write {})".format(len(changes), device, writes))
+        return changes
+
+    def _device(self):
+        path = create_string_buffer(b'\00', size=1024)
+        self.converter.GetDevicePath(path)
+        return path.value.decode('UTF-8')
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcFleet
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Drive several DC-DC converters at once, one worker process per device
+
+DCDCUsbLib keeps the opened device in global state, so one process can only talk to one
+converter. DcDcFleet starts one worker process per devcount, sends commands to it over a pipe
+and has every worker publish its latest snapshot into one shared memory block, which the
+supervisor reads without any IPC round trip.
+"""
+
+import logging
+import threading
+import multiprocessing
+
+from time import monotonic
+from array import array
+from itertools import count
+from multiprocessing import shared_memory
+
+if __package__:
+    from .DcDcConverter import DcDcConverter
+    from .DcDcSnapshot import DcDcSnapshot, SNAPSHOT_WIDTH
+else:
+    from DcDcConverter import DcDcConverter
+    from DcDcSnapshot import DcDcSnapshot, SNAPSHOT_WIDTH
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Size of one published snapshot in the shared memory block (bytes)
+ROW_SIZE = 8 * SNAPSHOT_WIDTH
+
+#Torn snapshot reads between checks that the worker is still alive
+SNAPSHOT_RETRIES = 1000
+##@endcond
+
+
+class DcDcFleet(object):
+    """Supervisor for a fleet of converters, each driven by its own worker process.
+
+        Shared memory layout: one 64-bit sequence counter per device, followed by one snapshot
+        row (SNAPSHOT_WIDTH doubles) per device. A worker makes the counter odd while it writes
+        its row and even again afterwards, so snapshot() can tell torn reads apart.
+
+        Commands and results passed to call() and broadcast() must be picklable. Every command
+        carries a request id echoed in its reply, so a reply arriving after its call timed out is
+        dropped instead of being taken for the answer to the next call.
+    """
+
+    def __init__(self, devcounts, timer, connectiontimeout, backend_factory=None, context=None):
+        """Start one worker per device and wait for them to connect.
+
+            @param devcounts number of devices (opens devcounts 1..n) or a list of devcounts
+            @param timer period (seconds) for API data refresh rate; workers publish one snapshot per period
+            @param connectiontimeout how long each worker keeps trying to connect (seconds)
+            @param backend_factory picklable callable returning the backend for a worker, defaults to the DLL
+            @param context multiprocessing context to start the workers with
+
+            @exception ConnectionError a worker could not connect to its device
+        """
+        if isinstance(devcounts, int):
+            devcounts = range(1, devcounts + 1)
+        self.devcounts = list(devcounts)
+        self.timer = timer
+
+        size = len(self.devcounts)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * size + ROW_SIZE * size))
+        self._sequences = self._shm.buf[:8 * size].cast('Q')
+        self._rows = self._shm.buf[8 * size:8 * size + ROW_SIZE * size].cast('d')
+
+        if context is None:
+            context = multiprocessing.get_context()
+
+        self._requests = count(1)
+        self._pipes = []
+        self._locks = []
+        self._processes = []
+        for index, devcount in enumerate(self.devcounts):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                args=(child, self._shm.name, size, index, devcount, timer, connectiontimeout, backend_factory),
+                name='DcDcWorker-{}'.format(devcount),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._pipes.append(parent)
+            self._locks.append(threading.Lock())
+            self._processes.append(process)
+
+        errors = []
+        for index, pipe in enumerate(self._pipes):
+            ok, result = pipe.recv()
+            if not ok:
+                errors.append(result)
+        if errors:
+            self.close()
+            raise errors[0]
+
+    def __len__(self):
+        return len(self.devcounts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def call(self, index, method, *args, timeout=None):
+        """Call a DcDcConverter method in one worker.
+
+            @param index position of the device in devcounts
+            @param method DcDcConverter method name, e.g. 'SetEnabledOutput'
+            @param args method arguments
+            @param timeout maximum time to wait for the result (seconds)
+
+            @return method result
+
+            @exception TimeoutError no reply in time
+        """
+        with self._locks[index]:
+            pipe = self._pipes[index]
+            request = next(self._requests)
+            pipe.send((request, method, args))
+            return self._reply(pipe, request, timeout)
+
+    def broadcast(self, method, *args, timeout=None):
+        """Call a DcDcConverter method in every worker in parallel.
+
+            @param method DcDcConverter method name
+            @param args method arguments
+            @param timeout maximum time to wait for all results (seconds)
+
+            @return list of results (or exceptions raised by the method), in devcounts order
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            requests = []
+            for pipe in self._pipes:
+                request = next(self._requests)
+                pipe.send((request, method, args))
+                requests.append(request)
+
+            deadline = None if timeout is None else monotonic() + timeout
+            results = []
+            for pipe, request in zip(self._pipes, requests):
+                remaining = None if deadline is None else max(0, deadline - monotonic())
+                try:
+                    results.append(self._reply(pipe, request, remaining))
+                except Exception as err:
+                    results.append(err)
+            return results
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def snapshot(self, index):
+        """Read the latest snapshot published by one worker.
+
+            @param index position of the device in devcounts
+
+            @return DcDcSnapshot, or None if nothing has been published yet
+
+            @exception ConnectionError the worker stopped in the middle of publishing a snapshot
+        """
+        base = index * SNAPSHOT_WIDTH
+        retries = 0
+        while True:
+            sequence = self._sequences[index]
+            if sequence == 0:
+                return None
+            if not sequence & 1:
+                values = self._rows[base:base + SNAPSHOT_WIDTH].tolist()
+                if self._sequences[index] == sequence:
+                    return DcDcSnapshot._make(values)
+
+            retries += 1
+            if retries % SNAPSHOT_RETRIES == 0 and not self._processes[index].is_alive():
+                raise ConnectionError("DC-DC converter worker for devcount {} has stopped".format(self.devcounts[index]))
+
+    def snapshots(self):
+        """Read the latest snapshot of every device.
+
+            @return list of DcDcSnapshot (None where nothing has been published yet)
+        """
+        return [self.snapshot(index) for index in range(len(self.devcounts))]
+
+    def view(self):
+        """Get a zero-copy view of every published snapshot (devices x SNAPSHOT_WIDTH).
+
+            The view reads shared memory directly; a row being rewritten by its worker can be
+            seen half updated. Use snapshot() for a consistent record.
+
+            @return memoryview of doubles
+        """
+        return self._rows.cast('B').cast('d', [len(self.devcounts), SNAPSHOT_WIDTH])
+
+    def close(self):
+        """Close every device, stop the workers and release the shared memory."""
+        for pipe, process in zip(self._pipes, self._processes):
+            try:
+                if process.is_alive():
+                    pipe.send(None)
+            except (OSError, EOFError):
+                pass
+        for pipe, process in zip(self._pipes, self._processes):
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+            pipe.close()
+        self._pipes = []
+        self._processes = []
+
+        if self._shm is not None:
+            self._sequences.release()
+            self._rows.release()
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _reply(self, pipe, request, timeout):
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, deadline - monotonic())
+            if not pipe.poll(remaining):
+                raise TimeoutError("DC-DC converter worker did not reply in time")
+            reply, ok, result = pipe.recv()
+            if reply == request:
+                break
+            logger.debug("Dropping late reply to request {}".format(reply))
+        if not ok:
+            raise result
+        return result
+
+
+def _worker(pipe, shm_name, size, index, devcount, timer, connectiontimeout, backend_factory):
+    """Worker process: owns one converter, publishes snapshots and runs commands from the pipe."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    sequences = shm.buf[:8 * size].cast('Q')
+    rows = shm.buf[8 * size:8 * size + ROW_SIZE * size].cast('d')
+
+    try:
+        backend = backend_factory() if backend_factory is not None else None
+        converter = DcDcConverter(devcount, timer, connectiontimeout, backend)
+    except Exception as err:
+        pipe.send((False, err))
+        sequences.release()
+        rows.release()
+        shm.close()
+        return
+    pipe.send((True, None))
+
+    #Read into a local row first: a failed read leaves the last published snapshot in place
+    row = array('d', bytes(ROW_SIZE))
+    base = index * SNAPSHOT_WIDTH
+    period = timer
+    deadline = monotonic()
+    while True:
+        if monotonic() >= deadline:
+            try:
+                converter.GetSnapshotInto(row)
+            except Exception as err:
+                logger.error("Sampling devcount {} failed: {}".format(devcount, err))
+            else:
+                sequences[index] += 1
+                rows[base:base + SNAPSHOT_WIDTH] = row
+                sequences[index] += 1
+            elapsed = monotonic() - converter.refresh_origin
+            deadline = converter.refresh_origin + (int(elapsed / period) + 1.5) * period
+
+        if not pipe.poll(max(0, deadline - monotonic())):
+            continue
+
+        try:
+            command = pipe.recv()
+        except EOFError:
+            break
+        if command is None:
+            break
+
+        request, method, args = command
+        try:
+            pipe.send((request, True, getattr(converter, method)(*args)))
+        except Exception as err:
+            pipe.send((request, False, err))
+
+    converter.CloseDevice()
+    sequences.release()
+    rows.release()
+    shm.close()
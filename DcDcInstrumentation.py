@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcInstrumentation
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Per-call counters, errors and latency histograms for every DCDCUsbLib function
+
+The instrumentation is a library layer sitting directly on the backend, so it measures the
+time spent in the DLL (or HID transport) itself. When it is not installed the getters call the
+backend directly and there is no overhead at all.
+"""
+
+import logging
+import threading
+
+from time import perf_counter
+from bisect import bisect_left
+
+if __package__:
+    from .DcDcBackends import LibraryLayer, LibraryProxy, FUNCTION_NAMES
+else:
+    from DcDcBackends import LibraryLayer, LibraryProxy, FUNCTION_NAMES
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Upper bounds of the latency histogram buckets (seconds), roughly 3 per decade from 10 us to 10 s
+BUCKET_BOUNDS = (
+    10e-6, 20e-6, 50e-6, 100e-6, 200e-6, 500e-6,
+    1e-3, 2e-3, 5e-3, 10e-3, 20e-3, 50e-3, 100e-3, 200e-3, 500e-3,
+    1.0, 2.0, 5.0, 10.0,
+)
+##@endcond
+
+
+class CallStats(object):
+    """Statistics of one library function."""
+
+    __slots__ = ('name', 'calls', 'errors', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = 0.0
+        #One count per BUCKET_BOUNDS entry plus one for anything slower
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def record(self, elapsed, failed):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.total += elapsed
+        if self.minimum is None or elapsed < self.minimum:
+            self.minimum = elapsed
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+        self.buckets[bisect_left(BUCKET_BOUNDS, elapsed)] += 1
+
+    def mean(self):
+        """@return mean latency (seconds)"""
+        return self.total / self.calls if self.calls else 0.0
+
+    def percentile(self, fraction):
+        """Estimate a latency percentile from the histogram.
+
+            @param fraction percentile as a fraction, e.g. 0.99
+
+            @return upper bound of the bucket holding the percentile (seconds)
+        """
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.maximum
+        return self.maximum
+
+    def as_dict(self):
+        """@return statistics as a JSON-friendly dict"""
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total': self.total,
+            'mean': self.mean(),
+            'min': self.minimum or 0.0,
+            'max': self.maximum,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'histogram': dict(zip([str(bound) for bound in BUCKET_BOUNDS] + ['inf'], self.buckets)),
+        }
+
+
+class Instrumentation(LibraryLayer):
+    """Record call counts, errors and latency of every library function.
+
+        Hooks are called after every call as hook(name, args, result, error, elapsed), where
+        error is the exception raised (or None); use them for tracing. A hook raising an
+        exception is logged and otherwise ignored.
+
+        @see DcDcConverter.EnableInstrumentation
+    """
+
+    order = 10
+
+    def __init__(self):
+        self.functions = dict((name, CallStats(name)) for name in FUNCTION_NAMES + ('read_state',))
+        self.hooks = []
+        self._lock = threading.Lock()
+
+    def wrap(self, library):
+        proxy = LibraryProxy(library)
+        for name in self.functions:
+            setattr(proxy, name, self._instrumented(name, getattr(library, name)))
+        return proxy
+
+    def addHook(self, hook):
+        """Call a function after every library call.
+
+            @param hook callable(name, args, result, error, elapsed)
+        """
+        self.hooks.append(hook)
+
+    def removeHook(self, hook):
+        """Stop calling a hook added with addHook.
+
+            @param hook callable to remove
+        """
+        self.hooks.remove(hook)
+
+    def stats(self, name=None):
+        """Get the statistics as JSON-friendly dicts.
+
+            @param name library function name, e.g. 'dcdcGetVin'; defaults to every function called so far
+
+            @return dict of statistics, or dict of function name to statistics
+        """
+        with self._lock:
+            if name is not None:
+                return self.functions[name].as_dict()
+            return dict(
+                (function, stats.as_dict()) for function, stats in self.functions.items() if stats.calls
+            )
+
+    def reset(self):
+        """Clear every statistic."""
+        with self._lock:
+            for name in self.functions:
+                self.functions[name] = CallStats(name)
+
+    def _instrumented(self, name, function):
+        lock = self._lock
+        functions = self.functions
+
+        def call(*args):
+            error = None
+            result = None
+            start = perf_counter()
+            try:
+                result = function(*args)
+                return result
+            except Exception as err:
+                error = err
+                raise
+            finally:
+                elapsed = perf_counter() - start
+                with lock:
+                    functions[name].record(elapsed, error is not None)
+                for hook in self.hooks:
+                    try:
+                        hook(name, args, result, error, elapsed)
+                    except Exception as err:
+                        logger.error("Instrumentation hook failed: {}".format(err))
+
+        call.__name__ = name
+        return call
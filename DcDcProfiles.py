@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcProfiles
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Named configuration profiles, compiled once and applied to any number of converters
+
+A profile maps flash variable names to values, e.g. {'Mode': 3, 'TimerOffDelay': 120}.
+compileProfile validates it against a device's variable table (names, units and value types)
+and encodes every value into the exact text the DLL expects, keyed by variable id. Applying the
+compiled profile is then a single FlashTransaction: only the values that differ are written and
+the flash is saved at most once. Converters with the same firmware share one compiled profile.
+
+    profiles = loadProfiles('profiles.json')
+    ups = compileProfile(profiles['ups'], converter.GetVariableTable())
+    rollout([converter_a, converter_b], ups)
+"""
+
+import json
+import logging
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+if __package__:
+    from .DcDcVariables import parseValue
+    from .DcDcFlash import formatValue, FlashWearCounter, DEFAULT_WRITE_BUDGET
+else:
+    from DcDcVariables import parseValue
+    from DcDcFlash import formatValue, FlashWearCounter, DEFAULT_WRITE_BUDGET
+
+##@cond
+logger = logging.getLogger(__name__)
+##@endcond
+
+
+class ProfileError(ValueError):
+    """A profile does not fit the device's flash variables."""
+
+
+class Profile(namedtuple('Profile', 'name values')):
+    """A named set of flash variable values, keyed by variable short name."""
+    __slots__ = ()
+
+
+class CompiledProfile(namedtuple('CompiledProfile', 'name entries schema')):
+    """A profile encoded for one variable schema: entries are (variable id, value text) pairs and
+        schema the (id, name, unit) of every variable of the table it was compiled against."""
+    __slots__ = ()
+
+
+def schemaOf(table):
+    """Get the schema of a variable table, to check compiled profiles against.
+
+        @param table DcDcVariables.VariableTable
+
+        @return tuple of (id, name, unit)
+    """
+    return tuple((variable.id, variable.name, variable.unit) for variable in table)
+
+def loadProfiles(path):
+    """Load profiles from a JSON file of {profile name: {variable name: value}}.
+
+        @param path JSON file
+
+        @return dict of profile name to Profile
+    """
+    with open(path) as profiles:
+        return dict((name, Profile(name, values)) for name, values in json.load(profiles).items())
+
+def compileProfile(profile, table):
+    """Validate a profile against a variable table and encode its values.
+
+        Values may be given as numbers, booleans or strings; strings may end with the
+        variable's unit ('12.5 V'). Numeric variables only accept numbers (integers for
+        integer variables), and floats are written with the same number of decimals as the
+        device uses.
+
+        @param profile Profile (or dict of variable name to value)
+        @param table DcDcVariables.VariableTable of a device, e.g. converter.GetVariableTable()
+
+        @return CompiledProfile
+
+        @exception ProfileError listing every variable that does not fit
+    """
+    if not isinstance(profile, Profile):
+        profile = Profile(None, profile)
+
+    errors = []
+    entries = []
+    for name, value in sorted(profile.values.items()):
+        if name not in table:
+            errors.append("{}: no such variable".format(name))
+            continue
+        variable = table[name]
+
+        if isinstance(value, str) and variable.unit and value.strip().endswith(variable.unit):
+            value = value.strip()[:-len(variable.unit)]
+        if isinstance(value, str) and not isinstance(variable.value, str):
+            value = parseValue(value.strip())
+        if isinstance(variable.value, float) and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+
+        text = formatValue(value, variable.text).strip()
+        parsed = parseValue(text)
+        if isinstance(variable.value, int) and not isinstance(parsed, int):
+            errors.append("{}: expected an integer, got {!r}".format(name, value))
+        elif isinstance(variable.value, float) and not isinstance(parsed, (int, float)):
+            errors.append("{}: expected a number{}, got {!r}".format(
+                name, " in {}".format(variable.unit) if variable.unit else '', value))
+        else:
+            entries.append((variable.id, text))
+
+    if errors:
+        raise ProfileError("Profile {} does not fit the device: {}".format(profile.name, '; '.join(errors)))
+    return CompiledProfile(profile.name, tuple(sorted(entries)), schemaOf(table))
+
+def applyProfile(converter, profile, counter=None, budget=DEFAULT_WRITE_BUDGET):
+    """Apply a profile to one converter in a single flash transaction.
+
+        @param converter DcDcConverter
+        @param profile CompiledProfile, or a Profile to compile against the converter's table
+        @param counter DcDcFlash.FlashWearCounter recording saves, defaults to the per-user counter file
+        @param budget maximum number of saves allowed per device, None for no limit
+
+        @return dict of variable id to (old text, new text) for the values written
+
+        @exception ProfileError the profile was compiled for a different variable schema
+        @exception DcDcFlash.FlashWearError the device has used up its write budget
+    """
+    flash = converter.FlashTransaction(counter, budget)
+    flash.begin()
+    table = converter.GetVariableTable()
+    if not isinstance(profile, CompiledProfile):
+        profile = compileProfile(profile, table)
+    elif profile.schema != schemaOf(table):
+        raise ProfileError("Profile {} was compiled for different flash variables".format(profile.name))
+
+    #Values are already in the device's text format: stage them as they are
+    flash.staged.update(profile.entries)
+    changes = flash.commit()
+    logger.info("Applied profile {} ({} value(s) changed)".format(profile.name, len(changes)))
+    return changes
+
+def rollout(targets, profile, counter=None, budget=DEFAULT_WRITE_BUDGET, timeout=None):
+    """Apply a profile to many converters in parallel.
+
+        @param targets list of DcDcConverter (applied from one thread each), or a DcDcFleet
+               (applied in every worker process at once)
+        @param profile CompiledProfile (or Profile)
+        @param counter DcDcFlash.FlashWearCounter shared by every target, defaults to the per-user counter file
+        @param budget maximum number of saves allowed per device, None for no limit
+        @param timeout maximum time to wait for a fleet (seconds)
+
+        @return list of applyProfile results, or the exception raised, in targets order
+    """
+    if counter is None:
+        counter = FlashWearCounter()
+
+    if hasattr(targets, 'broadcast'):
+        return targets.broadcast('ApplyProfile', profile, counter, budget, timeout=timeout)
+
+    def apply(converter):
+        try:
+            return applyProfile(converter, profile, counter, budget)
+        except Exception as err:
+            return err
+
+    with ThreadPoolExecutor(max_workers=max(1, len(targets)), thread_name_prefix='DcDcRollout') as executor:
+        return list(executor.map(apply, targets))
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcSampler
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Background telemetry sampler keeping the last N snapshots in a ring buffer
+"""
+
+import logging
+import threading
+
+from time import monotonic
+
+if __package__:
+    from .DcDcSnapshot import DcDcSnapshot, SnapshotBuffer, SNAPSHOT_WIDTH, SNAPSHOT_COLUMNS
+else:
+    from DcDcSnapshot import DcDcSnapshot, SnapshotBuffer, SNAPSHOT_WIDTH, SNAPSHOT_COLUMNS
+
+##@cond
+logger = logging.getLogger(__name__)
+##@endcond
+
+
+class DcDcSampler(object):
+    """Sample a DcDcConverter once per API refresh into a fixed-size ring buffer.
+
+        The sampler wakes up once per timer period, offset by a phase into the refresh period
+        so that it never races the refresh itself, and takes one snapshot only when the refresh
+        epoch has moved on. Any number of consumers can then read history from the buffer
+        without issuing USB traffic of their own.
+
+        Every row is written twice, at slot and slot + capacity, so the last n rows are always
+        contiguous in memory and window() can return them as a single zero-copy view.
+
+        @see DcDcConverter.GetRefreshEpoch
+    """
+
+    def __init__(self, converter, capacity, phase=0.5):
+        """Create the sampler (it is not started).
+
+            @param converter DcDcConverter to sample
+            @param capacity number of snapshots kept
+            @param phase fraction of the refresh period to wait after a refresh before sampling
+        """
+        self.converter = converter
+        self.capacity = capacity
+        self.phase = phase
+
+        self.buffer = SnapshotBuffer(2 * capacity)
+        self.count = 0
+        self.epoch = None
+
+        self._view = memoryview(self.buffer.data)
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """Start the sampling thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='DcDcSampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampling thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def sample(self):
+        """Take one snapshot into the ring buffer now.
+
+            Called by the sampling thread; can also be called directly when the thread is not
+            running.
+        """
+        slot = self.count % self.capacity
+        self.converter.GetSnapshotInto(self.buffer, slot)
+
+        base = slot * SNAPSHOT_WIDTH
+        mirror = base + self.capacity * SNAPSHOT_WIDTH
+        self._view[mirror:mirror + SNAPSHOT_WIDTH] = self._view[base:base + SNAPSHOT_WIDTH]
+
+        with self._condition:
+            self.count += 1
+            self._condition.notify_all()
+
+        if self._listeners:
+            snapshot = self.buffer[slot]
+            for listener in list(self._listeners):
+                try:
+                    listener(snapshot)
+                except Exception as err:
+                    logger.error("Sampler listener failed: {}".format(err))
+
+    def addListener(self, listener):
+        """Call a function with every new snapshot, on the sampling thread.
+
+            @param listener callable(DcDcSnapshot)
+        """
+        self._listeners.append(listener)
+
+    def removeListener(self, listener):
+        """Stop calling a listener added with addListener.
+
+            @param listener callable to remove
+        """
+        self._listeners.remove(listener)
+
+    def wait(self, count, timeout=None):
+        """Wait until more than count samples have been taken.
+
+            @param count sample count already seen by the caller
+            @param timeout maximum time to wait (seconds)
+
+            @return current sample count
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.count > count, timeout)
+            return self.count
+
+    def latest(self):
+        """Get the most recent snapshot.
+
+            @return DcDcSnapshot, or None if nothing has been sampled yet
+        """
+        count = self.count
+        if count == 0:
+            return None
+        return self.buffer[(count - 1) % self.capacity]
+
+    def window(self, rows=None):
+        """Get a zero-copy view of the most recent rows, oldest first.
+
+            The view is live: rows older than capacity - rows samples may be overwritten while
+            it is held. Pass it to numpy.asarray for a NumPy view without copying.
+
+            @param rows number of rows, defaults to every row sampled so far (up to capacity)
+
+            @return memoryview of doubles shaped (rows, SNAPSHOT_WIDTH), empty before the first sample
+        """
+        start, end = self._span(rows)
+        if start == end:
+            #memoryview cannot take a shape with a zero dimension
+            return self._view[0:0]
+        return self._view[start * SNAPSHOT_WIDTH:end * SNAPSHOT_WIDTH].cast('B').cast('d', [end - start, SNAPSHOT_WIDTH])
+
+    def column(self, field, rows=None):
+        """Get a zero-copy view of one field over the most recent rows, oldest first.
+
+            @param field field name from DcDcSnapshot.SNAPSHOT_FIELDS
+            @param rows number of rows, defaults to every row sampled so far (up to capacity)
+
+            @return strided memoryview of doubles
+        """
+        start, end = self._span(rows)
+        column = SNAPSHOT_COLUMNS[field]
+        return self._view[start * SNAPSHOT_WIDTH + column:end * SNAPSHOT_WIDTH:SNAPSHOT_WIDTH]
+
+    def history(self, rows=None):
+        """Get the most recent rows as DcDcSnapshot records, oldest first (copies).
+
+            @param rows number of rows, defaults to every row sampled so far (up to capacity)
+
+            @return list of DcDcSnapshot
+        """
+        start, end = self._span(rows)
+        data = self.buffer.data
+        return [
+            DcDcSnapshot._make(data[row * SNAPSHOT_WIDTH:(row + 1) * SNAPSHOT_WIDTH])
+            for row in range(start, end)
+        ]
+
+    def _span(self, rows):
+        """Get the buffer rows [start, end) holding the most recent rows samples."""
+        count = self.count
+        available = min(count, self.capacity)
+        if rows is None or rows > available:
+            rows = available
+        end = (count - 1) % self.capacity + self.capacity + 1 if count else self.capacity
+        return end - rows, end
+
+    def _run(self):
+        converter = self.converter
+        period = converter.timer / 1000
+
+        deadline = monotonic()
+        while not self._stop.wait(max(0, deadline - monotonic())):
+            origin = converter.refresh_origin
+            if origin is None:
+                #Connect() has not opened the device yet: look again next period
+                deadline = monotonic() + period
+                continue
+            if deadline < origin + self.phase * period:
+                #First sample after connecting, at the sampling phase of the first refresh
+                deadline = origin + self.phase * period
+                continue
+
+            epoch = converter.GetRefreshEpoch()
+            if epoch == self.epoch:
+                #Refresh is late (backends reporting their own refresh count): look again shortly
+                deadline = monotonic() + period / 20
+                continue
+
+            try:
+                self.sample()
+                self.epoch = epoch
+            except Exception as err:
+                logger.error("Sampling failed: {}".format(err))
+
+            elapsed = monotonic() - converter.refresh_origin
+            deadline = converter.refresh_origin + (int(elapsed / period) + 1 + self.phase) * period
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcSimulator
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Deterministic in-process DCDC-USB simulator for running DcDcConverter without hardware
+"""
+
+import logging
+
+from time import sleep, monotonic, perf_counter
+
+if __package__:
+    from .DcDcBackends import DcDcBackend, ReportBackend, FUNCTION_NAMES
+else:
+    from DcDcBackends import DcDcBackend, ReportBackend, FUNCTION_NAMES
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#State of a freshly powered DCDC-USB-200 in automotive mode
+DEFAULT_STATE = {
+    'time_cfg': 0,
+    'voltage_cfg': 0,
+    'mode': 1,
+    'state': 7,
+    'vin': 12.0,
+    'vign': 12.0,
+    'vout': 12.0,
+    'enabled_power_switch': 0,
+    'enabled_output': 1,
+    'enabled_aux_vout': 0,
+    'flags_status1': 0x08,
+    'flags_status2': 0,
+    'flags_voltage': 0,
+    'flags_timer': 0,
+    'flash_pointer': 0,
+    'timer_wait': 0,
+    'timer_vout': 0,
+    'timer_vaux': 0,
+    'timer_pw_switch': 0,
+    'timer_off_delay': 0,
+    'timer_hard_off': 0,
+    'version_major': 1,
+    'version_minor': 3,
+}
+
+#Flash variables as (name, value, unit, comment)
+DEFAULT_VARIABLES = (
+    ('Mode', '1', '', 'Operating mode: 0=Dumb, 1=Automotive, 2=Script, 3=UPS'),
+    ('VOut', '12.00', 'V', 'Output voltage'),
+    ('VInLow', '10.50', 'V', 'Input voltage below which the converter shuts down'),
+    ('VIgnHigh', '11.00', 'V', 'Ignition voltage considered ON'),
+    ('VIgnLow', '10.50', 'V', 'Ignition voltage considered OFF'),
+    ('TimerWait', '5', 's', 'Delay after ignition ON before starting the output'),
+    ('TimerVout', '5', 's', 'Delay before enabling the output'),
+    ('TimerVAux', '0', 's', 'Delay before enabling the auxiliary output'),
+    ('TimerPwSwitch', '1', 's', 'Power switch pulse length'),
+    ('TimerOffDelay', '60', 's', 'Delay after ignition OFF before the soft off'),
+    ('TimerHardOff', '3600', 's', 'Delay after soft off before cutting the output'),
+    ('DeepDischarge', '1', '', 'Deep discharge protection enabled (0/1)'),
+)
+##@endcond
+
+
+class SimulatedBackend(ReportBackend):
+    """Simulated DCDC-USB converter implementing every DCDCUsbLib function in Python.
+
+        The simulation is deterministic: nothing happens in the background. The device state
+        set with SetDeviceState (or by set commands) becomes visible to the getters at the next
+        refresh boundary, which is computed from the clock exactly like the DLL refreshes every
+        timer milliseconds. Passing a manual clock makes the refresh timing fully reproducible.
+
+        Flash loading advances by loadstep percent per GetLoadState call.
+    """
+
+    def __init__(self, devices=1, state=None, variables=DEFAULT_VARIABLES, clock=monotonic, loadstep=50):
+        """Create a simulated device.
+
+            @param devices number of simulated converters on the bus
+            @param state dict of state values overriding DEFAULT_STATE
+            @param variables flash variables as (name, value, unit, comment) tuples
+            @param clock function returning the current time in seconds
+            @param loadstep GetLoadState progress per call (percent)
+        """
+        ReportBackend.__init__(self)
+
+        self.devices = devices
+        self.clock = clock
+        self.loadstep = loadstep
+
+        self.device_state = dict(DEFAULT_STATE)
+        if state is not None:
+            self.device_state.update(state)
+
+        #Flash contents on the device and the PC copy the API works on
+        self.flash = [list(variable) for variable in variables]
+        self.flash_copy = None
+        self.flash_writes = 0
+        self.load_state = 0
+
+        self.devcount = 0
+        self.opened_at = None
+        self.period = 1.0
+
+    def SetDeviceState(self, **values):
+        """Change the simulated device state; getters see it after the next refresh.
+
+            @param values state values keyed as in DcDcBackends.STATE_FUNCTIONS
+        """
+        self.device_state.update(values)
+
+    def Plug(self, devices=1):
+        """Simulate converters being plugged in.
+
+            @param devices number of converters present afterwards
+        """
+        self.devices = devices
+
+    def Unplug(self):
+        """Simulate every converter being unplugged."""
+        self.devices = 0
+
+    def _present(self):
+        return self.opened_at is not None and self.devcount <= self.devices
+
+    def _update(self):
+        """Latch the device state if a refresh boundary has passed since the last one."""
+        if not self._present():
+            return
+        count = int((self.clock() - self.opened_at) / self.period) + 1
+        if count != self._refresh_count:
+            self._refresh_count = count
+            self._values = dict(self.device_state)
+
+    def _report(self):
+        self._update()
+        return self._values
+
+    def refresh_count(self):
+        self._update()
+        return self._refresh_count
+
+    def dcdcOpenDevice(self, timer):
+        return self.dcdcOpenDeviceByCnt(1, timer)
+
+    def dcdcOpenDeviceByCnt(self, devcount, timer):
+        self.devcount = devcount
+        self.period = timer / 1000.0
+        self.opened_at = self.clock()
+        self._refresh_count = 0
+        self._update()
+        return 1 if self._present() else 0
+
+    def dcdcGetDevicePath(self, path):
+        path.value = 'sim://dcdc/{}'.format(self.devcount).encode('UTF-8')
+
+    def dcdcCloseDevice(self):
+        self.opened_at = None
+
+    def dcdcGetConnected(self):
+        self._update()
+        return 1 if self._present() else 0
+
+    def dcdcSetEnabledAuxVOut(self, on):
+        self.device_state['enabled_aux_vout'] = 1 if on else 0
+        self._setStatusBit(0x10, on)
+
+    def dcdcSetEnabledPowerSwitch(self, on):
+        self.device_state['enabled_power_switch'] = 1 if on else 0
+        self._setStatusBit(0x04, on)
+
+    def dcdcSetEnabledOutput(self, on):
+        self.device_state['enabled_output'] = 1 if on else 0
+        self._setStatusBit(0x08, on)
+
+    def dcdcIncDecVOutVolatile(self, inc):
+        self.device_state['vout'] = round(self.device_state['vout'] + (0.1 if inc else -0.1), 4)
+
+    def dcdcSetVOutVolatile(self, vout):
+        self.device_state['vout'] = float(vout)
+
+    def dcdcLoadFlashValues(self):
+        self.load_state = 0
+        self.flash_copy = None
+
+    def dcdcGetLoadState(self):
+        if self.load_state < 100 and self._present():
+            self.load_state = min(100, self.load_state + self.loadstep)
+            if self.load_state == 100:
+                self.flash_copy = [list(variable) for variable in self.flash]
+        return self.load_state
+
+    def dcdcGetMaxVariableCnt(self):
+        return len(self.flash)
+
+    def dcdcGetVariableData(self, cnt, name, value, unit, comment):
+        if cnt >= len(self.flash):
+            return 0
+        variable = self.flash_copy[cnt] if self.flash_copy is not None else self.flash[cnt]
+        name.value = variable[0].encode('UTF-8')
+        value.value = variable[1].encode('UTF-8') if self.flash_copy is not None else b''
+        unit.value = variable[2].encode('UTF-8')
+        comment.value = variable[3].encode('UTF-8')
+        return 1
+
+    def dcdcSetVariableData(self, cnt, value):
+        if self.flash_copy is None or cnt >= len(self.flash_copy):
+            return 0
+        if isinstance(value, bytes):
+            value = value.decode('UTF-8')
+        self.flash_copy[cnt][1] = value
+        return 1
+
+    def dcdcSaveFlashValues(self):
+        if self.flash_copy is None:
+            return
+        self.flash = [list(variable) for variable in self.flash_copy]
+        self.flash_writes += 1
+
+    def _setStatusBit(self, mask, on):
+        if on:
+            self.device_state['flags_status1'] |= mask
+        else:
+            self.device_state['flags_status1'] &= ~mask & 0xFF
+
+
+def _delayed(function, latency):
+    def call(*args):
+        if latency >= 0.001:
+            sleep(latency)
+        else:
+            #sleep() is too coarse for sub-millisecond latencies
+            end = perf_counter() + latency
+            while perf_counter() < end:
+                pass
+        return function(*args)
+    call.__name__ = function.__name__
+    return call
+
+
+class SimulatedDll(SimulatedBackend):
+    """Stand-in for DCDCUsbLib: a simulated device costing a fixed latency per function call.
+
+        Unlike SimulatedBackend, read_state goes through every getter in turn like it does with
+        the real DLL, so each snapshot costs one foreign call (and one latency) per state variable.
+        Useful for benchmarking the wrapper on machines without the DLL.
+    """
+
+    def __init__(self, latency=0.0, **kwargs):
+        """Create the stand-in.
+
+            @param latency time spent in every dcdcXXX call (seconds)
+            @param kwargs passed to SimulatedBackend
+        """
+        SimulatedBackend.__init__(self, **kwargs)
+        self.latency = latency
+        if latency > 0:
+            for name in FUNCTION_NAMES:
+                setattr(self, name, _delayed(getattr(self, name), latency))
+
+    def refresh_count(self):
+        #The DLL does not say when it refreshes
+        return None
+
+    read_state = DcDcBackend.read_state
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcSnapshot
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Immutable snapshot records of the DC-DC converter state and preallocated snapshot buffers
+"""
+
+from array import array
+from collections import namedtuple
+
+if __package__:
+    from .DcDcBackends import SNAPSHOT_FUNCTIONS
+else:
+    from DcDcBackends import SNAPSHOT_FUNCTIONS
+
+##@cond
+#Snapshot field names: wall clock timestamp, connection state, then the state variables
+SNAPSHOT_FIELDS = ('timestamp', 'connected') + tuple(key for name, key in SNAPSHOT_FUNCTIONS)
+
+#Number of values in one snapshot
+SNAPSHOT_WIDTH = len(SNAPSHOT_FIELDS)
+
+#Column of each field in a snapshot buffer row
+SNAPSHOT_COLUMNS = dict((field, column) for column, field in enumerate(SNAPSHOT_FIELDS))
+##@endcond
+
+
+class DcDcSnapshot(namedtuple('DcDcSnapshot', SNAPSHOT_FIELDS)):
+    """Every state variable of the converter from one consistent refresh.
+
+        Fields are named after the getters: vin, vign, vout, state, mode, flags_status1,
+        timer_hard_off, etc. (see SNAPSHOT_FIELDS). The record is an immutable tuple with no
+        per-instance dictionary.
+    """
+    __slots__ = ()
+
+
+class SnapshotBuffer(object):
+    """Preallocated buffer of snapshot rows for allocation-free sampling.
+
+        Rows are stored back to back in a flat array of doubles, SNAPSHOT_WIDTH values per row,
+        in SNAPSHOT_FIELDS order.
+
+        @see DcDcConverter.GetSnapshotInto
+        @see DcDcConverter.GetSnapshotBatch
+    """
+
+    def __init__(self, rows):
+        """Allocate the buffer.
+
+            @param rows number of snapshot rows
+        """
+        self.rows = rows
+        self.data = array('d', bytes(8 * rows * SNAPSHOT_WIDTH))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        """Get one row as a DcDcSnapshot (allocates the record).
+
+            @param row row index
+
+            @return DcDcSnapshot
+        """
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError("snapshot row out of range")
+        base = row * SNAPSHOT_WIDTH
+        return DcDcSnapshot._make(self.data[base:base + SNAPSHOT_WIDTH])
+
+    def column(self, field):
+        """Get a zero-copy strided view of one field over all rows.
+
+            @param field field name from SNAPSHOT_FIELDS
+
+            @return memoryview of doubles
+        """
+        return memoryview(self.data)[SNAPSHOT_COLUMNS[field]::SNAPSHOT_WIDTH]
+
+    def view(self):
+        """Get a zero-copy two-dimensional view of the buffer (rows x SNAPSHOT_WIDTH).
+
+            The view can be passed straight to numpy.asarray.
+
+            @return memoryview of doubles
+        """
+        return memoryview(self.data).cast('B').cast('d', [self.rows, SNAPSHOT_WIDTH])
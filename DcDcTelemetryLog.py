@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcTelemetryLog
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Append-only memory-mapped binary telemetry log
+
+Telemetry is stored as fixed-width binary records in preallocated, memory-mapped segment files.
+A segment holds a fixed number of records; when it is full the recorder starts a new one. Each
+segment file is named after the timestamp of its first record, which indexes the log by time:
+a reader only maps the segments overlapping the requested range and finds the exact records by
+binary search on the timestamp column.
+
+Reading needs NumPy: records come back as structured arrays viewing the mapped files directly,
+without any parsing or copying.
+"""
+
+import os
+import mmap
+import struct
+import logging
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Segment header: magic, format version, record size, capacity (records), record count
+HEADER = struct.Struct('<8sIIQQ')
+HEADER_SIZE = 64
+MAGIC = b'DCDCTLM1'
+VERSION = 1
+COUNT_OFFSET = 24
+
+#Record: timestamp, vin, vign, vout, state, mode, status 1, status 2, voltage and timer flags,
+#2 bytes padding, wait, vout, vaux, power switch, off delay and hard off timers
+RECORD = struct.Struct('<dfffBBBBBBxxIIIIII')
+RECORD_FIELDS = (
+    'timestamp', 'vin', 'vign', 'vout', 'state', 'mode',
+    'flags_status1', 'flags_status2', 'flags_voltage', 'flags_timer',
+    'timer_wait', 'timer_vout', 'timer_vaux', 'timer_pw_switch', 'timer_off_delay', 'timer_hard_off',
+)
+
+#NumPy layout of one record, matching RECORD
+RECORD_DTYPE = None if numpy is None else numpy.dtype({
+    'names': list(RECORD_FIELDS),
+    'formats': ['<f8', '<f4', '<f4', '<f4', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1',
+                '<u4', '<u4', '<u4', '<u4', '<u4', '<u4'],
+    'offsets': [0, 8, 12, 16, 20, 21, 22, 23, 24, 25, 28, 32, 36, 40, 44, 48],
+    'itemsize': RECORD.size,
+})
+
+#Default number of records per segment (about 1 day at 10 Hz, 45 MB)
+DEFAULT_SEGMENT_RECORDS = 864000
+
+SEGMENT_PREFIX = 'dcdc-'
+SEGMENT_SUFFIX = '.tlm'
+##@endcond
+
+
+def _segmentName(timestamp, duplicate=0):
+    name = '{}{:020d}'.format(SEGMENT_PREFIX, int(timestamp * 1e6))
+    if duplicate:
+        #Later segments started in the same microsecond: '_' sorts after the first one's SEGMENT_SUFFIX
+        name += '_{:03d}'.format(duplicate)
+    return name + SEGMENT_SUFFIX
+
+def _segmentFiles(directory):
+    """List the segment files of a log, oldest first."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in names
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+class TelemetryRecorder(object):
+    """Append snapshots to a telemetry log.
+
+        Records are written straight into the mapped segment; the record count in the segment
+        header is only updated after the record, so a crash never leaves a half-written record
+        visible to readers. Appending to an existing log continues its last segment.
+
+        Timestamps are expected to be non-decreasing.
+
+            recorder = TelemetryRecorder('/var/log/dcdc')
+            sampler.addListener(recorder.append)
+    """
+
+    def __init__(self, directory, segment_records=DEFAULT_SEGMENT_RECORDS):
+        """Open a log for appending, creating the directory if needed.
+
+            @param directory directory holding the segment files
+            @param segment_records number of records per segment
+        """
+        self.directory = directory
+        self.segment_records = segment_records
+
+        self._file = None
+        self._map = None
+        self._count = 0
+        self._capacity = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+        segments = _segmentFiles(directory)
+        if segments:
+            self._open(segments[-1])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, snapshot):
+        """Append one record.
+
+            @param snapshot DcDcSnapshot (or any object with the RECORD_FIELDS attributes)
+        """
+        self.appendValues(
+            snapshot.timestamp, snapshot.vin, snapshot.vign, snapshot.vout,
+            int(snapshot.state), int(snapshot.mode),
+            int(snapshot.flags_status1), int(snapshot.flags_status2),
+            int(snapshot.flags_voltage), int(snapshot.flags_timer),
+            int(snapshot.timer_wait), int(snapshot.timer_vout), int(snapshot.timer_vaux),
+            int(snapshot.timer_pw_switch), int(snapshot.timer_off_delay), int(snapshot.timer_hard_off),
+        )
+
+    def appendValues(self, *values):
+        """Append one record from its values in RECORD_FIELDS order."""
+        with self._lock:
+            if self._map is None or self._count >= self._capacity:
+                self._rotate(values[0])
+            RECORD.pack_into(self._map, HEADER_SIZE + self._count * RECORD.size, *values)
+            self._count += 1
+            struct.pack_into('<Q', self._map, COUNT_OFFSET, self._count)
+
+    def flush(self):
+        """Flush the mapped segment to disk."""
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+
+    def close(self):
+        """Flush and close the current segment."""
+        with self._lock:
+            self._close()
+
+    def _open(self, path):
+        handle = open(path, 'r+b')
+        segment = mmap.mmap(handle.fileno(), 0)
+        magic, version, record_size, capacity, count = HEADER.unpack_from(segment, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            segment.close()
+            handle.close()
+            raise ValueError("{} is not a telemetry segment".format(path))
+        self._file = handle
+        self._map = segment
+        self._capacity = capacity
+        self._count = count
+
+    def _rotate(self, timestamp):
+        self._close()
+        #Never truncate an existing segment, e.g. one started in the same microsecond
+        duplicate = 0
+        while True:
+            path = os.path.join(self.directory, _segmentName(timestamp, duplicate))
+            try:
+                handle = open(path, 'xb')
+            except FileExistsError:
+                duplicate += 1
+            else:
+                break
+        with handle:
+            handle.truncate(HEADER_SIZE + self.segment_records * RECORD.size)
+            handle.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.segment_records, 0))
+        self._open(path)
+        logger.debug("Started telemetry segment {}".format(path))
+
+    def _close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+        self._map = None
+        self._file = None
+
+
+class TelemetryLog(object):
+    """Read a telemetry log written by TelemetryRecorder.
+
+            log = TelemetryLog('/var/log/dcdc')
+            for records in log.read(start, end):
+                records['vin'].mean()
+    """
+
+    def __init__(self, directory):
+        """Open a log for reading.
+
+            @param directory directory holding the segment files
+
+            @exception ImportError NumPy is not installed
+        """
+        if numpy is None:
+            raise ImportError("Reading telemetry logs requires NumPy")
+        self.directory = directory
+        self._segments = {}
+        self.refresh()
+
+    def refresh(self):
+        """Pick up records and segments written since the log was opened or last refreshed."""
+        paths = _segmentFiles(self.directory)
+        segments = {}
+        for path in paths:
+            segment = self._segments.get(path)
+            if segment is None:
+                with open(path, 'rb') as handle:
+                    segment = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            segments[path] = segment
+        self._segments = segments
+
+        self.index = []
+        for path in paths:
+            records = self._records(self._segments[path])
+            if len(records):
+                self.index.append((float(records['timestamp'][0]), float(records['timestamp'][-1]), path))
+
+    def __len__(self):
+        return sum(len(self._records(segment)) for segment in self._segments.values())
+
+    def _records(self, segment):
+        magic, version, record_size, capacity, count = HEADER.unpack_from(segment, 0)
+        return numpy.frombuffer(segment, dtype=RECORD_DTYPE, count=count, offset=HEADER_SIZE)
+
+    def read(self, start=None, end=None):
+        """Get the records in a time range, as zero-copy views of the mapped segments.
+
+            @param start first timestamp to include (seconds since the epoch), None for the beginning
+            @param end timestamp to stop before, None for the end
+
+            @return list of NumPy structured arrays (one per segment, oldest first) with RECORD_FIELDS fields
+        """
+        views = []
+        for first, last, path in self.index:
+            if (start is not None and last < start) or (end is not None and first >= end):
+                continue
+            records = self._records(self._segments[path])
+            timestamps = records['timestamp']
+            lower = 0 if start is None else int(numpy.searchsorted(timestamps, start, 'left'))
+            upper = len(records) if end is None else int(numpy.searchsorted(timestamps, end, 'left'))
+            if upper > lower:
+                views.append(records[lower:upper])
+        return views
+
+    def readArray(self, start=None, end=None):
+        """Get the records in a time range as one array (copies when the range spans segments).
+
+            @param start first timestamp to include, None for the beginning
+            @param end timestamp to stop before, None for the end
+
+            @return NumPy structured array
+        """
+        views = self.read(start, end)
+        if len(views) == 1:
+            return views[0]
+        if not views:
+            return numpy.zeros(0, dtype=RECORD_DTYPE)
+        return numpy.concatenate(views)
+
+    def close(self):
+        """Unmap every segment (views returned by read() keep their segment mapped)."""
+        self._segments = {}
+        self.index = []
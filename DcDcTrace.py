@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcTrace
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Record every library call to a compact binary trace and replay it as a backend
+
+Recording:
+
+    recorder = converter.EnableTrace('session.trace')
+    ...
+    converter.RemoveLayer(recorder)
+
+Replaying, at 100 times real speed (remember to divide the converter timer by the same factor),
+or as fast as possible with speed=None:
+
+    converter = DcDcConverter(1, 0.01, 5, backend=ReplayBackend('session.trace', speed=100))
+
+Trace format: the magic, then the traced function names (uint16 count, each uint8 length +
+ASCII) defining the function ids, then one record per call: call time since the start of the
+trace (double), duration (float), function id (uint8), status (uint8, 0 returned, 1 raised),
+payload length (uint16), payload. The payload holds three encoded values: the arguments, the
+return value (or the exception's class name and message) and the contents of the out-buffers
+after the call. Values are a type byte followed by the value: 'n' None, 'i' int64, 'd' double,
+'b'/'s' bytes/UTF-8 string (uint16 length), 't' tuple (uint8 count, items), 'o' out-buffer
+(uint32 size).
+"""
+
+import struct
+import logging
+import builtins
+import threading
+
+from time import monotonic, perf_counter
+from bisect import bisect_right
+from collections import namedtuple
+from ctypes import Array, _SimpleCData
+
+if __package__:
+    from .DcDcBackends import DcDcBackend, LibraryLayer, LibraryProxy, FUNCTION_NAMES
+else:
+    from DcDcBackends import DcDcBackend, LibraryLayer, LibraryProxy, FUNCTION_NAMES
+
+##@cond
+logger = logging.getLogger(__name__)
+
+MAGIC = b'DCDCTRC1'
+RECORD = struct.Struct('<dfBBH')
+
+#Functions recorded, in function id order
+TRACE_FUNCTIONS = FUNCTION_NAMES + ('read_state',)
+
+STATUS_RETURNED = 0
+STATUS_RAISED = 1
+
+#Results of connection functions missing from a trace (recording usually starts once connected)
+CONNECTION_DEFAULTS = {
+    'dcdcOpenDevice': 1,
+    'dcdcOpenDeviceByCnt': 1,
+    'dcdcGetConnected': 1,
+}
+##@endcond
+
+
+class TraceRecord(namedtuple('TraceRecord', ('time', 'elapsed', 'name', 'args', 'result', 'outs', 'error'))):
+    """One recorded call.
+
+        args has None in place of out-buffers, whose contents after the call are in outs. error is
+        (exception class name, message) if the call raised, otherwise None.
+    """
+
+    __slots__ = ()
+
+
+class _OutBuffer(object):
+    """Placeholder for an out-buffer argument in a decoded trace."""
+
+    __slots__ = ('size',)
+
+    def __init__(self, size):
+        self.size = size
+
+
+def _pack(value, parts):
+    if value is None:
+        parts.append(b'n')
+    elif isinstance(value, int):
+        parts.append(b'i' + struct.pack('<q', value))
+    elif isinstance(value, float):
+        parts.append(b'd' + struct.pack('<d', value))
+    elif isinstance(value, bytes):
+        parts.append(b'b' + struct.pack('<H', len(value)) + value)
+    elif isinstance(value, str):
+        text = value.encode('UTF-8')
+        parts.append(b's' + struct.pack('<H', len(text)) + text)
+    elif isinstance(value, (tuple, list)):
+        parts.append(b't' + struct.pack('<B', len(value)))
+        for item in value:
+            _pack(item, parts)
+    elif isinstance(value, Array):
+        parts.append(b'o' + struct.pack('<I', len(value)))
+    elif isinstance(value, _SimpleCData):
+        _pack(value.value, parts)
+    else:
+        raise TypeError("Cannot trace a {}".format(type(value).__name__))
+
+def _unpack(data, offset):
+    kind = data[offset:offset + 1]
+    offset += 1
+    if kind == b'n':
+        return None, offset
+    if kind == b'i':
+        return struct.unpack_from('<q', data, offset)[0], offset + 8
+    if kind == b'd':
+        return struct.unpack_from('<d', data, offset)[0], offset + 8
+    if kind in (b'b', b's'):
+        length, = struct.unpack_from('<H', data, offset)
+        value = bytes(data[offset + 2:offset + 2 + length])
+        return (value.decode('UTF-8') if kind == b's' else value), offset + 2 + length
+    if kind == b't':
+        count = data[offset]
+        offset += 1
+        items = []
+        for item in range(count):
+            value, offset = _unpack(data, offset)
+            items.append(value)
+        return tuple(items), offset
+    if kind == b'o':
+        return _OutBuffer(struct.unpack_from('<I', data, offset)[0]), offset + 4
+    raise ValueError("Unknown value type {!r} in trace".format(kind))
+
+
+def readTrace(path):
+    """Read a trace file.
+
+        @param path trace file
+
+        @return generator of TraceRecord, in call order
+    """
+    with open(path, 'rb') as trace:
+        data = trace.read()
+    if not data.startswith(MAGIC):
+        raise ValueError("{} is not a DCDC trace".format(path))
+
+    offset = len(MAGIC)
+    count, = struct.unpack_from('<H', data, offset)
+    offset += 2
+    names = []
+    for index in range(count):
+        length = data[offset]
+        names.append(data[offset + 1:offset + 1 + length].decode('ascii'))
+        offset += 1 + length
+
+    while offset + RECORD.size <= len(data):
+        time, elapsed, function, status, length = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        (args, result, outs), end = _unpack(data, offset)
+        offset += length
+        args = tuple(None if isinstance(arg, _OutBuffer) else arg for arg in args)
+        if status == STATUS_RAISED:
+            yield TraceRecord(time, elapsed, names[function], args, None, outs, result)
+        else:
+            yield TraceRecord(time, elapsed, names[function], args, result, outs, None)
+
+
+class TraceRecorder(LibraryLayer):
+    """Record every library call reaching the backend into a trace file.
+
+        The recorder sits just above the instrumentation layer, below the command actor and the
+        read cache, so it sees exactly the calls the backend serves: cache hits are not
+        recorded, and calls are recorded in the order the actor ran them.
+
+        @see DcDcConverter.EnableTrace
+    """
+
+    order = 20
+
+    def __init__(self, path):
+        """Create the trace file.
+
+            @param path trace file (overwritten)
+        """
+        self.path = path
+        self.records = 0
+        self._ids = dict((name, index) for index, name in enumerate(TRACE_FUNCTIONS))
+        self._lock = threading.Lock()
+        self._start = monotonic()
+
+        self._file = open(path, 'wb')
+        header = [MAGIC, struct.pack('<H', len(TRACE_FUNCTIONS))]
+        for name in TRACE_FUNCTIONS:
+            header.append(struct.pack('<B', len(name)) + name.encode('ascii'))
+        self._file.write(b''.join(header))
+
+    def wrap(self, library):
+        proxy = LibraryProxy(library)
+        for name in TRACE_FUNCTIONS:
+            setattr(proxy, name, self._recorded(name, getattr(library, name)))
+        return proxy
+
+    def flush(self):
+        """Flush the trace file."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """Close the trace file."""
+        with self._lock:
+            self._file.close()
+
+    def _recorded(self, name, function):
+        function_id = self._ids[name]
+
+        def call(*args):
+            status = STATUS_RETURNED
+            result = None
+            time = monotonic() - self._start
+            start = perf_counter()
+            try:
+                result = function(*args)
+                return result
+            except Exception as err:
+                status = STATUS_RAISED
+                result = (type(err).__name__, str(err))
+                raise
+            finally:
+                elapsed = perf_counter() - start
+                self._write(time, elapsed, function_id, status, args, result)
+
+        call.__name__ = name
+        return call
+
+    def _write(self, time, elapsed, function_id, status, args, result):
+        outs = tuple(arg.value for arg in args if isinstance(arg, Array))
+        parts = []
+        try:
+            _pack((args, result, outs), parts)
+        except TypeError as err:
+            logger.error("Call not traced: {}".format(err))
+            return
+        payload = b''.join(parts)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(RECORD.pack(time, elapsed, function_id, status, len(payload)) + payload)
+            self.records += 1
+
+
+class ReplayBackend(DcDcBackend):
+    """Backend serving the calls recorded in a trace.
+
+        Calls are matched on the function and its (non out-buffer) arguments, so e.g. each
+        GetVariableData(cnt) replays what was read for that cnt; calls with arguments never
+        recorded (e.g. OpenDeviceByCnt with a scaled timer) fall back to any recorded call of the
+        same function, and a trace recorded after connecting replays as an already connected device.
+        Out-buffers are filled with the
+        recorded contents and recorded exceptions are raised again.
+
+        With a speed, every call returns what the recorded device returned at the same point in
+        (scaled) time since the backend was created. With speed=None, replay is as fast as
+        possible and deterministic: each call returns the next recorded result for its function
+        and arguments, and the last one once they are used up.
+    """
+
+    def __init__(self, path, speed=1.0, strict=False):
+        """Load a trace.
+
+            @param path trace file
+            @param speed replay speed relative to the recording (1.0 real time), None for as fast as possible
+            @param strict raise LookupError for calls that are not in the trace, instead of returning None
+        """
+        self.speed = speed
+        self.strict = strict
+        self.records = 0
+        self.duration = 0.0
+
+        #(name, args) and name -> (call times, records)
+        self._calls = {}
+        self._functions = {}
+        for record in readTrace(path):
+            for calls, key in ((self._calls, (record.name, record.args)), (self._functions, record.name)):
+                times, records = calls.setdefault(key, ([], []))
+                times.append(record.time)
+                records.append(record)
+            self.records += 1
+            self.duration = max(self.duration, record.time)
+
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self._start = monotonic()
+
+        for name in FUNCTION_NAMES:
+            setattr(self, name, self._replayed(name))
+
+    def elapsed(self):
+        """@return trace time being replayed (seconds since the start of the recording)"""
+        if self.speed is None:
+            return None
+        return (monotonic() - self._start) * self.speed
+
+    def finished(self):
+        """@return True once the whole trace has been replayed"""
+        if self.speed is not None:
+            return self.elapsed() >= self.duration
+        with self._lock:
+            return all(
+                self._cursors.get(key, 0) >= len(records)
+                for key, (times, records) in self._calls.items()
+            )
+
+    def read_state(self):
+        if ('read_state', ()) in self._calls:
+            return self._replay('read_state', ())
+        return DcDcBackend.read_state(self)
+
+    def _replayed(self, name):
+        def call(*args):
+            return self._replay(name, args)
+        call.__name__ = name
+        return call
+
+    def _replay(self, name, args):
+        key = (name, tuple(None if isinstance(arg, Array) else _plain(arg) for arg in args))
+        calls = self._calls.get(key)
+        if calls is None:
+            key = name
+            calls = self._functions.get(name)
+        if calls is None:
+            if name in CONNECTION_DEFAULTS:
+                return CONNECTION_DEFAULTS[name]
+            if self.strict:
+                raise LookupError("{} is not in the trace".format(name))
+            return None
+
+        times, records = calls
+        if self.speed is None:
+            with self._lock:
+                index = self._cursors.get(key, 0)
+                self._cursors[key] = index + 1
+            index = min(index, len(records) - 1)
+        else:
+            index = max(bisect_right(times, self.elapsed()) - 1, 0)
+        record = records[index]
+
+        buffers = [arg for arg in args if isinstance(arg, Array)]
+        for buffer, value in zip(buffers, record.outs):
+            buffer.value = value
+
+        if record.error is not None:
+            error, message = record.error
+            exception = getattr(builtins, error, None)
+            if not (isinstance(exception, type) and issubclass(exception, Exception)):
+                exception = RuntimeError
+            raise exception(message)
+        return record.result
+
+
+def _plain(value):
+    #Arguments as they were recorded (ctypes values by their Python value)
+    if isinstance(value, _SimpleCData):
+        return value.value
+    if isinstance(value, list):
+        return tuple(value)
+    return value
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcVariables
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Cached table of the DCDCUsb flash variables, indexed by id and by name
+"""
+
+import re
+import logging
+import threading
+
+from ctypes import create_string_buffer
+from collections import namedtuple
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Buffer sizes recommended by DcDcConverter.GetVariableData
+NAME_SIZE = 256
+VALUE_SIZE = 256
+UNIT_SIZE = 256
+COMMENT_SIZE = 1024
+
+_INT_PATTERN = re.compile(r'^[+-]?\d+$')
+_FLOAT_PATTERN = re.compile(r'^[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?$')
+
+_buffer_pool = []
+_buffer_pool_lock = threading.Lock()
+##@endcond
+
+
+class FlashVariable(namedtuple('FlashVariable', 'id name value unit comment text')):
+    """One flash variable: id, short name, typed value, unit, long comment and the value text as returned by the DLL."""
+    __slots__ = ()
+
+
+def parseValue(text):
+    """Convert a variable value string into a typed Python value.
+
+        @param text value as returned by GetVariableData
+
+        @return int, float or (if neither) the stripped string
+    """
+    text = text.strip()
+    if _INT_PATTERN.match(text):
+        return int(text)
+    if _FLOAT_PATTERN.match(text):
+        return float(text)
+    return text
+
+
+def _acquireBuffers():
+    with _buffer_pool_lock:
+        if _buffer_pool:
+            return _buffer_pool.pop()
+    return (
+        create_string_buffer(NAME_SIZE),
+        create_string_buffer(VALUE_SIZE),
+        create_string_buffer(UNIT_SIZE),
+        create_string_buffer(COMMENT_SIZE),
+    )
+
+def _releaseBuffers(buffers):
+    with _buffer_pool_lock:
+        _buffer_pool.append(buffers)
+
+
+class VariableTable(object):
+    """Every flash variable of a converter, read in one pass and indexed by id and by name.
+
+        The table reflects the flash values loaded by the last LoadFlashValues call. Lookups are
+        plain dictionary accesses; DcDcConverter.GetVariableTable hands out the cached table until
+        the next LoadFlashValues.
+
+            table = converter.GetVariableTable()
+            table['VOut'].value     #12.0
+            table[3].unit           #'V'
+    """
+
+    def __init__(self, converter):
+        """Read every variable from the converter.
+
+            @param converter DcDcConverter to read from
+        """
+        self.generation = converter.flash_generation
+        self.variables = []
+        self.ids = {}
+        self.names = {}
+
+        buffers = _acquireBuffers()
+        name, value, unit, comment = buffers
+        try:
+            for cnt in range(converter.GetMaxVariableCnt()):
+                if converter.GetVariableData(cnt, name, value, unit, comment) != 1:
+                    continue
+                text = value.value.decode('UTF-8', 'replace')
+                self._add(FlashVariable(
+                    cnt,
+                    name.value.decode('UTF-8', 'replace'),
+                    parseValue(text),
+                    unit.value.decode('UTF-8', 'replace'),
+                    comment.value.decode('UTF-8', 'replace'),
+                    text,
+                ))
+        finally:
+            _releaseBuffers(buffers)
+
+        logger.debug("Read {} flash variables".format(len(self.variables)))
+
+    def _add(self, variable):
+        self.variables.append(variable)
+        self.ids[variable.id] = variable
+        self.names[variable.name] = variable
+
+    def __len__(self):
+        return len(self.variables)
+
+    def __iter__(self):
+        return iter(self.variables)
+
+    def __contains__(self, key):
+        return key in (self.names if isinstance(key, str) else self.ids)
+
+    def __getitem__(self, key):
+        """Look a variable up by id or by short name.
+
+            @param key variable id (int) or short name (str)
+
+            @return FlashVariable
+
+            @exception KeyError no such variable
+        """
+        if isinstance(key, str):
+            return self.names[key]
+        return self.ids[key]
+
+    def get(self, key, default=None):
+        """Get the typed value of a variable.
+
+            @param key variable id or short name
+            @param default returned if there is no such variable
+
+            @return typed value
+        """
+        try:
+            return self[key].value
+        except KeyError:
+            return default
+
+    def values(self):
+        """Get every typed value keyed by short name.
+
+            @return dict
+        """
+        return dict((variable.name, variable.value) for variable in self.variables)
+
+    def update(self, cnt, text):
+        """Record a value written with SetVariableData.
+
+            @param cnt variable id
+            @param text value string as written
+        """
+        variable = self.ids.get(cnt)
+        if variable is None:
+            return
+        updated = variable._replace(value=parseValue(text), text=text)
+        self.variables[self.variables.index(variable)] = updated
+        self.ids[cnt] = updated
+        self.names[updated.name] = updated
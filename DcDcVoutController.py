@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcVoutController
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Output voltage ramps at a set slew rate, verified against GetVOut, and band regulation
+"""
+
+import logging
+import threading
+
+from time import sleep, monotonic
+from collections import namedtuple
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Output voltage change of one IncDecVOutVolatile step (V)
+DEFAULT_STEP = 0.1
+
+#Time between refresh checks while waiting for the next API refresh (seconds)
+REFRESH_POLL = 0.005
+
+#Slack on the half-step stop condition, so float rounding cannot make a ramp bounce around its target (V)
+VOUT_EPSILON = 1e-6
+##@endcond
+
+
+class RampResult(namedtuple('RampResult', ('target', 'vout', 'settled', 'settle_time', 'commands', 'set_commands', 'incdec_commands'))):
+    """Outcome of VoutController.ramp.
+
+        vout is the last measured output voltage and settle_time the time from the start of the
+        ramp until it was within tolerance of target (None if it never was). commands counts
+        every command sent, split into set_commands (SetVOutVolatile) and incdec_commands
+        (IncDecVOutVolatile).
+    """
+
+    __slots__ = ()
+
+
+class VoutController(object):
+    """Drive the output voltage to a target at a limited slew rate, and optionally hold it there.
+
+        A ramp moves the setpoint once per tick (the API refresh period, or longer when the
+        slew rate is slower than one step per period). Each move is sent with whichever command
+        needs the least traffic: one IncDecVOutVolatile for a single step, one SetVOutVolatile
+        for anything larger. At the end the controller waits for GetVOut to come within
+        tolerance, nudging the output towards the target if it settles outside.
+
+            controller = VoutController(converter, slew_rate=0.5)
+            result = controller.ramp(13.2)
+            controller.startHold(13.2, band=0.2)
+    """
+
+    def __init__(self, converter, slew_rate=1.0, step=DEFAULT_STEP, tolerance=0.15, settle_periods=5):
+        """Create a controller.
+
+            @param converter connected DcDcConverter
+            @param slew_rate maximum rate of change of VOut (V/s), None for no limit
+            @param step output voltage change of one IncDecVOutVolatile step (V)
+            @param tolerance maximum difference between GetVOut and the target for the output to count as settled (V)
+            @param settle_periods refresh periods to wait for the output to settle after the last command
+        """
+        self.converter = converter
+        self.slew_rate = slew_rate
+        self.step = step
+        self.tolerance = tolerance
+        self.settle_periods = settle_periods
+
+        self.commands = 0
+        self.set_commands = 0
+        self.incdec_commands = 0
+        self.corrections = 0
+
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def ramp(self, target):
+        """Ramp VOut to a target and wait for it to settle.
+
+            @param target output voltage (V)
+
+            @return RampResult
+        """
+        with self._lock:
+            start = monotonic()
+            commands = self.commands, self.set_commands, self.incdec_commands
+            period = self.converter.timer / 1000
+
+            setpoint = self.converter.GetVOut()
+            tick = period
+            if self.slew_rate:
+                tick = max(period, self.step / self.slew_rate)
+            max_move = self.slew_rate * tick if self.slew_rate else None
+
+            #Every move covers at least one step, so a ramp never needs more ticks than this
+            ticks = int(abs(target - setpoint) / self.step) + 2
+            next_tick = monotonic()
+            while abs(target - setpoint) > self.step / 2 + VOUT_EPSILON:
+                ticks -= 1
+                if ticks < 0:
+                    logger.warning("VOut ramp to {} V stopped at a setpoint of {} V".format(target, setpoint))
+                    break
+                delay = next_tick - monotonic()
+                if delay > 0:
+                    sleep(delay)
+                next_tick += tick
+
+                move = target - setpoint
+                if max_move is not None and abs(move) > max_move:
+                    move = max_move if move > 0 else -max_move
+                setpoint = self._move(setpoint, setpoint + move)
+
+            vout, settled_at = self._settle(target, start)
+            result = RampResult(
+                target, vout, settled_at is not None,
+                None if settled_at is None else settled_at - start,
+                self.commands - commands[0], self.set_commands - commands[1], self.incdec_commands - commands[2],
+            )
+            logger.debug("VOut ramp to {} V: {}".format(target, result))
+            return result
+
+    def startHold(self, target, band):
+        """Keep VOut inside target +/- band in a background thread, checking once per refresh.
+
+            @param target output voltage (V)
+            @param band allowed deviation before correcting (V)
+        """
+        self.stopHold()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._hold, args=(target, band), name='DcDcVoutHold', daemon=True)
+        self._thread.start()
+
+    def stopHold(self):
+        """Stop holding VOut."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """Get the command counters.
+
+            @return dict with commands, set_commands, incdec_commands and corrections (hold loop)
+        """
+        return {
+            'commands': self.commands,
+            'set_commands': self.set_commands,
+            'incdec_commands': self.incdec_commands,
+            'corrections': self.corrections,
+        }
+
+    def _move(self, setpoint, new):
+        """Send the cheapest command moving the output from setpoint to new.
+
+            @return setpoint after the command
+        """
+        steps = int(round((new - setpoint) / self.step))
+        if steps == 0:
+            return setpoint
+        self.commands += 1
+        if abs(steps) == 1:
+            self.incdec_commands += 1
+            self.converter.IncDecVOutVolatile(1 if steps > 0 else 0)
+            return setpoint + steps * self.step
+        self.set_commands += 1
+        self.converter.SetVOutVolatile(new)
+        return new
+
+    def _settle(self, target, start):
+        """Wait for GetVOut to reach the target, correcting once per refresh if it settles outside.
+
+            @return (last measured VOut, time it came within tolerance or None)
+        """
+        vout = None
+        for period in range(self.settle_periods):
+            self._waitRefresh()
+            vout = self.converter.GetVOut()
+            if abs(vout - target) <= self.tolerance:
+                return vout, monotonic()
+            #Past the first refresh the output has had time to follow the last command: correct it
+            if period > 0:
+                self._move(vout, target)
+        return vout, None
+
+    def _waitRefresh(self):
+        """Wait until the API data has been refreshed since the call."""
+        converter = self.converter
+        epoch = converter.GetRefreshEpoch()
+        deadline = monotonic() + 2 * converter.timer / 1000
+        while converter.GetRefreshEpoch() == epoch and monotonic() < deadline:
+            sleep(REFRESH_POLL)
+
+    def _hold(self, target, band):
+        period = self.converter.timer / 1000
+        while not self._stop.wait(period):
+            try:
+                with self._lock:
+                    vout = self.converter.GetVOut()
+                    if abs(vout - target) > band:
+                        #Less than half a step off (band below step / 2) sends nothing: not a correction
+                        commands = self.commands
+                        self._move(vout, target)
+                        if self.commands != commands:
+                            self.corrections += 1
+                            logger.debug("VOut {} V outside {} +/- {} V; corrected".format(vout, target, band))
+            except Exception as err:
+                logger.error("VOut hold failed: {}".format(err))
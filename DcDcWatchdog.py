@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+@package DcDcWatchdog
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Reconnect watchdog restoring volatile settings after the converter comes back
+"""
+
+import logging
+import threading
+
+from time import monotonic, time
+from collections import namedtuple
+from concurrent.futures import wait
+
+##@cond
+logger = logging.getLogger(__name__)
+
+#Settings re-applied by default; the power switch is left out as re-applying it pulses the PC's power button
+RESTORED_SETTERS = ('SetVOutVolatile', 'IncDecVOutVolatile', 'SetEnabledOutput', 'SetEnabledAuxVOut')
+
+#Bounds of the backoff between reconnection attempts (seconds)
+RECONNECT_BACKOFF_MIN = 0.1
+RECONNECT_BACKOFF_MAX = 5.0
+
+#Longest wait on a pending reconnection before checking whether the watchdog was stopped (seconds)
+RECONNECT_POLL = 0.05
+##@endcond
+
+
+class WatchdogEvent(namedtuple('WatchdogEvent', ('kind', 'timestamp', 'reason', 'downtime', 'attempts'))):
+    """A watchdog event.
+
+        kind is 'disconnected' (reason says why), 'reconnected' (with the downtime in seconds and
+        the number of attempts it took) or 'restore_failed' (reason holds the error).
+    """
+
+    __slots__ = ()
+
+
+class DcDcWatchdog(object):
+    """Detect a lost converter, reconnect it and re-apply its volatile settings.
+
+        The converter is checked once per refresh period. It is considered lost when GetConnected()
+        returns 0 or, with backends that count their refreshes, when no refresh has happened for
+        stale_periods periods. The watchdog then calls Reconnect() until it succeeds, with
+        exponential backoff between attempts bounded by backoff_max, and finally
+        RestoreVolatileSettings(): volatile settings (VOut, output enables) are lost when the
+        converter resets, e.g. in a brownout.
+
+            with DcDcWatchdog(converter) as watchdog:
+                watchdog.addListener(print)
+
+        @see DcDcConverter.Reconnect
+        @see DcDcConverter.RestoreVolatileSettings
+    """
+
+    def __init__(self, converter, interval=None, stale_periods=3, restore=RESTORED_SETTERS,
+                 backoff_min=RECONNECT_BACKOFF_MIN, backoff_max=RECONNECT_BACKOFF_MAX):
+        """Create the watchdog (it is not started).
+
+            @param converter connected DcDcConverter
+            @param interval time between checks (seconds), defaults to the refresh period
+            @param stale_periods refresh periods without a refresh before the device is considered lost
+            @param restore setters to re-apply after reconnecting, see DcDcConverter.VOLATILE_SETTERS
+            @param backoff_min first delay between reconnection attempts (seconds)
+            @param backoff_max longest delay between reconnection attempts (seconds)
+        """
+        self.converter = converter
+        self.interval = converter.timer / 1000 if interval is None else interval
+        self.stale_periods = stale_periods
+        self.restore = restore
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+
+        self.disconnects = 0
+        self.reconnects = 0
+        self.attempts = 0
+        self.downtime_total = 0.0
+        self.downtime_last = 0.0
+        self.downtime_max = 0.0
+        self.down_since = None
+
+        self._refresh_count = None
+        self._refreshed_at = monotonic()
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """Start the watchdog thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='DcDcWatchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watchdog thread (interrupting a reconnection) and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def addListener(self, listener):
+        """Call a function with every watchdog event, on the watchdog thread.
+
+            @param listener callable(WatchdogEvent)
+        """
+        self._listeners.append(listener)
+
+    def removeListener(self, listener):
+        """Stop calling a listener added with addListener.
+
+            @param listener callable to remove
+        """
+        self._listeners.remove(listener)
+
+    def stats(self):
+        """Get the disconnect and downtime metrics.
+
+            @return dict with disconnects, reconnects, attempts, downtime_total, downtime_last,
+                    downtime_max (seconds) and down (seconds down so far, 0 while connected)
+        """
+        down_since = self.down_since
+        return {
+            'disconnects': self.disconnects,
+            'reconnects': self.reconnects,
+            'attempts': self.attempts,
+            'downtime_total': self.downtime_total,
+            'downtime_last': self.downtime_last,
+            'downtime_max': self.downtime_max,
+            'down': 0.0 if down_since is None else monotonic() - down_since,
+        }
+
+    def check(self):
+        """Check the connection once.
+
+            @return None if the converter looks healthy, otherwise the reason it does not
+        """
+        if not self.converter.GetConnected():
+            return 'not connected'
+
+        count = self.converter.backend.refresh_count()
+        now = monotonic()
+        if count is None or count != self._refresh_count:
+            self._refresh_count = count
+            self._refreshed_at = now
+        elif now - self._refreshed_at > self.stale_periods * self.converter.timer / 1000:
+            return 'no refresh for {:.1f} s'.format(now - self._refreshed_at)
+        return None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                reason = self.check()
+            except Exception as err:
+                reason = 'check failed: {}'.format(err)
+            if reason is not None:
+                self._recover(reason)
+
+    def _recover(self, reason):
+        self.down_since = monotonic()
+        self.disconnects += 1
+        logger.warning("DC-DC converter lost ({}); reconnecting".format(reason))
+        self._emit('disconnected', reason)
+
+        attempts = 0
+        delay = self.backoff_min
+        while True:
+            attempts += 1
+            self.attempts += 1
+            try:
+                #Reconnect() keeps trying for connectiontimeout seconds: wait in slices so stop() is not held up
+                future = self.converter.Reconnect()
+                while not wait((future,), RECONNECT_POLL).done:
+                    if self._stop.is_set():
+                        return
+                future.result()
+                break
+            except ConnectionError as err:
+                logger.info("Reconnection attempt {} failed: {}".format(attempts, err))
+            except Exception as err:
+                logger.error("Reconnection attempt {} failed: {!r}".format(attempts, err))
+            if self._stop.wait(delay):
+                return
+            delay = min(delay * 2, self.backoff_max)
+
+        try:
+            self.converter.RestoreVolatileSettings(self.restore)
+        except Exception as err:
+            logger.error("Restoring volatile settings failed: {}".format(err))
+            self._emit('restore_failed', str(err))
+
+        downtime = monotonic() - self.down_since
+        self.down_since = None
+        self.reconnects += 1
+        self.downtime_last = downtime
+        self.downtime_total += downtime
+        self.downtime_max = max(self.downtime_max, downtime)
+        self._refresh_count = None
+        logger.info("DC-DC converter reconnected after {:.3f} s ({} attempts)".format(downtime, attempts))
+        self._emit('reconnected', None, downtime, attempts)
+
+    def _emit(self, kind, reason=None, downtime=None, attempts=None):
+        event = WatchdogEvent(kind, time(), reason, downtime, attempts)
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as err:
+                logger.error("Watchdog listener failed: {}".format(err))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Shared fixtures: every test runs against the in-process simulator, no hardware needed
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+
+#API refresh period used by the tests (seconds)
+TIMER = 0.02
+
+
+class ManualClock(object):
+    """Clock for SimulatedBackend that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return ManualClock()
+
+@pytest.fixture
+def backend():
+    return SimulatedBackend()
+
+@pytest.fixture
+def converter(backend):
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    yield converter
+    converter.CloseDevice()
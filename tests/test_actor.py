@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the priority command actor
+"""
+
+import threading
+
+import pytest
+
+from DcDcConverter import DcDcConverter
+from DcDcActor import CommandActor, priorityOf, PRIORITY_CONTROL, PRIORITY_COMMAND, PRIORITY_READ
+
+
+def test_priority_of():
+    assert priorityOf('dcdcSetEnabledOutput') == PRIORITY_CONTROL
+    assert priorityOf('GetVin') == PRIORITY_READ
+    assert priorityOf('read_state') == PRIORITY_READ
+    assert priorityOf('SaveFlashValues') == PRIORITY_COMMAND
+
+def test_calls_run_on_the_actor_thread(converter, backend):
+    threads = []
+    original = backend.dcdcGetVin
+    backend.dcdcGetVin = lambda: threads.append(threading.current_thread().name) or original()
+    converter.EnableCommandActor()
+    assert converter.GetVin() == 12.0
+    assert threads == ['DcDcActor']
+
+def test_control_commands_jump_the_queue(converter):
+    actor = converter.EnableCommandActor()
+    release = threading.Event()
+    order = []
+    actor.submit(release.wait)
+    reads = [actor.submit(order.append, 'read', priority=PRIORITY_READ) for index in range(3)]
+    control = actor.submit(order.append, 'control', priority=PRIORITY_CONTROL)
+    release.set()
+    control.result(1)
+    for read in reads:
+        read.result(1)
+    assert order == ['control', 'read', 'read', 'read']
+
+def test_expired_calls_are_dropped(converter):
+    actor = converter.EnableCommandActor()
+    release = threading.Event()
+    actor.submit(release.wait)
+    late = actor.submit(converter.GetVin, timeout=0)
+    release.set()
+    with pytest.raises(TimeoutError):
+        late.result(1)
+
+def test_remove_layer_stops_the_actor(converter):
+    actor = converter.EnableCommandActor()
+    converter.RemoveLayer(actor)
+    assert not actor._thread.is_alive()
+    with pytest.raises(RuntimeError):
+        actor.submit(converter.GetVin)
+    assert converter.GetVin() == 12.0
+
+def test_close_device_stops_the_actor(backend):
+    converter = DcDcConverter(1, 0.02, 1, backend=backend)
+    actor = converter.EnableCommandActor()
+    converter.CloseDevice()
+    assert not actor._thread.is_alive()
+    assert converter.DCDCUsbLib is backend
+
+def test_stop_cancels_queued_calls():
+    actor = CommandActor()
+    release = threading.Event()
+    actor.submit(release.wait)
+    queued = actor.submit(int)
+    stopper = threading.Thread(target=actor.stop)
+    stopper.start()
+    while not actor._stopped:
+        pass
+    release.set()
+    stopper.join(1)
+    assert queued.cancelled()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the vectorized telemetry analytics
+"""
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from DcDcAnalytics import (
+    TelemetrySummary, downsample, runs, segments, hysteresis, brownouts, ignitionCycles, stateDurations, summarise,
+)
+from DcDcTelemetryLog import TelemetryRecorder, TelemetryLog
+
+
+@pytest.fixture
+def telemetry():
+    """Ten minutes at 1 Hz: ignition on for 100 s out of every 200, a sag every 150 s."""
+    timestamps = numpy.arange(600, dtype=numpy.float64)
+    vign = numpy.where((timestamps % 200) < 100, 12.5, 0.5)
+    vin = numpy.where((timestamps % 150) < 3, 9.0, 12.0) + 0.01 * (timestamps % 7)
+    states = ((timestamps // 50) % 3).astype(numpy.int64)
+    return {'timestamp': timestamps, 'vin': vin, 'vout': vin - 0.5, 'vign': vign, 'state': states, 'mode': states % 2}
+
+
+def test_runs_and_segments():
+    starts, ends = runs([False, True, True, False, True])
+    assert starts.tolist() == [1, 4]
+    assert ends.tolist() == [3, 5]
+    start_times, end_times = segments([0.0, 1.0, 2.0, 3.0, 4.0], [False, True, True, False, True], min_duration=0.5)
+    assert (start_times.tolist(), end_times.tolist()) == ([1.0], [3.0])
+    assert [len(part) for part in segments([], [])] == [0, 0]
+
+def test_hysteresis_holds_between_levels():
+    values = [10.0, 10.8, 11.2, 10.8, 10.6, 10.4, 10.8, 11.0]
+    assert hysteresis(values, 11.0, 10.5).tolist() == [0, 0, 1, 1, 1, 0, 0, 1]
+    assert hysteresis([10.8], 11.0, 10.5, initial=1).tolist() == [1]
+
+def test_downsample():
+    result = downsample([0.0, 1.0, 2.0, 10.0, 11.0], [1.0, 3.0, 2.0, 5.0, 7.0], 10.0)
+    assert result.time.tolist() == [0.0, 10.0]
+    assert result.min.tolist() == [1.0, 5.0]
+    assert result.max.tolist() == [3.0, 7.0]
+    assert result.mean.tolist() == [2.0, 6.0]
+    assert result.count.tolist() == [3, 2]
+
+def test_brownouts_and_ignition_cycles(telemetry):
+    start_times, end_times = brownouts(telemetry['timestamp'], telemetry['vin'])
+    assert start_times.tolist() == [0.0, 150.0, 300.0, 450.0]
+    assert end_times.tolist() == [3.0, 153.0, 303.0, 453.0]
+    count, (on_starts, on_ends) = ignitionCycles(telemetry['timestamp'], telemetry['vign'])
+    assert count == 3
+    assert on_starts.tolist() == [0.0, 200.0, 400.0]
+
+def test_state_durations_skip_gaps():
+    durations = stateDurations([0.0, 1.0, 3.0, 100.0], [1, 2, 1, 2], max_gap=10.0)
+    assert durations[1] == 1.0
+    assert durations[2] == 2.0
+    assert durations.sum() == 3.0
+
+@pytest.mark.parametrize('chunk', [1, 7, 100, 600])
+def test_chunked_summary_matches_whole_arrays(telemetry, chunk):
+    summary = TelemetrySummary(interval=60.0)
+    for start in range(0, 600, chunk):
+        summary.update(dict((field, column[start:start + chunk]) for field, column in telemetry.items()))
+
+    assert summary.samples == 600
+    assert summary.ignition_cycles == ignitionCycles(telemetry['timestamp'], telemetry['vign'])[0]
+    expected = brownouts(telemetry['timestamp'], telemetry['vin'])
+    assert summary.brownouts() == list(zip(*[part.tolist() for part in expected]))
+    durations = stateDurations(telemetry['timestamp'], telemetry['state'])
+    assert summary.stateDurations() == dict((value, durations[value]) for value in numpy.flatnonzero(durations))
+    whole = downsample(telemetry['timestamp'], telemetry['vin'], 60.0)
+    for part, expected in zip(summary.downsampled('vin'), whole):
+        assert part.tolist() == pytest.approx(expected.tolist())
+
+def test_summary_keeps_a_brownout_in_progress(telemetry):
+    summary = TelemetrySummary()
+    summary.update(dict((field, column[:152]) for field, column in telemetry.items()))
+    assert summary.brownouts()[-1] == (150.0, 151.0)
+
+def test_summarise_log(tmp_path, telemetry):
+    directory = str(tmp_path / 'log')
+    with TelemetryRecorder(directory, 256) as recorder:
+        for row in range(600):
+            values = [telemetry[field][row] for field in ('timestamp', 'vin', 'vign', 'vout')]
+            recorder.appendValues(*(values + [int(telemetry['state'][row]), int(telemetry['mode'][row])] + [0] * 10))
+    summary = summarise(TelemetryLog(directory), start=100.0, chunk_rows=64, interval=100.0)
+    assert summary.samples == 500
+    assert summary.first_time == 100.0
+    assert summary.as_dict()['vin']['count'] == [100] * 5
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the asyncio client
+"""
+
+import asyncio
+
+import pytest
+
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+from DcDcFlash import FlashWearCounter
+from AsyncDcDcConverter import AsyncDcDcConverter
+
+from conftest import TIMER
+
+#Converter methods that do no device I/O, used through client.converter
+NOT_MIRRORED = frozenset((
+    'Connect', 'AddLayer', 'RemoveLayer', 'EnableReadCache', 'EnableCommandActor',
+    'EnableInstrumentation', 'EnableTrace', 'Subscribe', 'Unsubscribe',
+))
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_every_converter_method_is_mirrored():
+    methods = set(name for name in dir(DcDcConverter) if name[:1].isupper())
+    mirrored = set(name for name in dir(AsyncDcDcConverter) if name[:1].isupper())
+    assert methods - mirrored == NOT_MIRRORED
+
+def test_calls_run_off_the_event_loop():
+    async def session():
+        async with AsyncDcDcConverter(1, TIMER, 1, SimulatedBackend()) as client:
+            snapshot = await client.GetSnapshot()
+            await client.SetEnabledOutput(0)
+            return snapshot.vin, await client.GetConnected()
+    assert run(session()) == (12.0, 1)
+
+def test_open_without_device_raises():
+    with pytest.raises(ConnectionError):
+        run(AsyncDcDcConverter.open(2, TIMER, 0.05, SimulatedBackend()))
+
+def test_load_flash_values_waits_for_completion():
+    async def session():
+        async with AsyncDcDcConverter(1, TIMER, 1, SimulatedBackend(loadstep=10)) as client:
+            state = await client.LoadFlashValues(True, 2)
+            table = await client.GetVariableTable()
+            return state, table['VOut'].value
+    assert run(session()) == (100, 12.0)
+
+def test_load_flash_values_without_waiting():
+    async def session():
+        async with AsyncDcDcConverter(1, TIMER, 1, SimulatedBackend(loadstep=10)) as client:
+            state = await client.LoadFlashValues()
+            return state, await client.GetLoadState()
+    state, load_state = run(session())
+    assert state is None
+    assert load_state < 100
+
+def test_flash_transaction(tmp_path):
+    backend = SimulatedBackend()
+
+    async def session():
+        async with AsyncDcDcConverter(1, TIMER, 1, backend) as client:
+            async with client.FlashTransaction(FlashWearCounter(str(tmp_path / 'writes.json'))) as flash:
+                flash.set('TimerOffDelay', 120)
+    run(session())
+    assert backend.flash_writes == 1
+    assert backend.flash[9][1] == '120'
+
+def test_reconnect():
+    async def session():
+        async with AsyncDcDcConverter(1, TIMER, 1, SimulatedBackend()) as client:
+            await client.SetVOutVolatile(13.0)
+            await client.Reconnect()
+            await client.RestoreVolatileSettings()
+            return await client.GetConnected(), client.converter.backend.device_state['vout']
+    assert run(session()) == (1, 13.0)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the transport backends and the simulator
+"""
+
+import pytest
+
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+from DcDcBackends import (
+    DcDcBackend, HidBackend, UnsupportedOperation, SNAPSHOT_FUNCTIONS, decodeStateReport, voutToStep,
+)
+
+
+def test_simulator_getters_report_device_state(converter):
+    assert converter.GetConnected() == 1
+    assert converter.GetVin() == 12.0
+    assert converter.GetMode() == 1
+    assert converter.GetVersion() == '1.3'
+
+def test_simulator_state_changes_wait_for_refresh(clock):
+    backend = SimulatedBackend(clock=clock)
+    assert backend.dcdcOpenDeviceByCnt(1, 100) == 1
+
+    backend.SetDeviceState(vin=13.5)
+    assert backend.dcdcGetVin() == 12.0
+    clock.advance(0.1)
+    assert backend.dcdcGetVin() == 13.5
+    assert backend.refresh_count() == 2
+
+def test_simulator_unplug(clock):
+    backend = SimulatedBackend(clock=clock)
+    backend.dcdcOpenDeviceByCnt(1, 100)
+    backend.Unplug()
+    assert backend.dcdcGetConnected() == 0
+    backend.Plug()
+    assert backend.dcdcGetConnected() == 1
+
+def test_missing_device_raises_connection_error():
+    with pytest.raises(ConnectionError):
+        DcDcConverter(2, 0.02, 0.05, backend=SimulatedBackend())
+
+def test_read_state_matches_getters(clock):
+    backend = SimulatedBackend(clock=clock)
+    backend.dcdcOpenDeviceByCnt(1, 100)
+    state = backend.read_state()
+    assert state[0] == 1
+    assert list(state[1:]) == [getattr(backend, name)() for name, key in SNAPSHOT_FUNCTIONS]
+    assert DcDcBackend.read_state(backend) == state
+
+def test_unsupported_functions_raise():
+    backend = DcDcBackend()
+    with pytest.raises(UnsupportedOperation) as err:
+        backend.dcdcLoadFlashValues()
+    assert isinstance(err.value, NotImplementedError)
+    assert 'dcdcLoadFlashValues' in str(err.value)
+
+def test_hid_backend_has_no_flash_access():
+    assert HidBackend.dcdcSaveFlashValues is DcDcBackend.dcdcSaveFlashValues
+
+def test_decode_state_report():
+    report = bytearray(24)
+    report[0] = 0x82
+    report[1] = 0x01 | (0x02 << 2) | (0x03 << 5)
+    report[2] = 7
+    report[3] = 77
+    report[6] = 0x08
+    report[19:21] = (0x01, 0x2C)
+    report[23] = (1 << 5) | 3
+    values = decodeStateReport(report)
+    assert values['mode'] == 1
+    assert values['voltage_cfg'] == 2
+    assert values['time_cfg'] == 3
+    assert values['vin'] == pytest.approx(12.0, abs=0.01)
+    assert values['enabled_output'] == 1
+    assert values['enabled_power_switch'] == 0
+    assert values['timer_off_delay'] == 300
+    assert (values['version_major'], values['version_minor']) == (1, 3)
+
+def test_vout_to_step_is_monotonic_and_clamped():
+    steps = [voutToStep(vout / 10) for vout in range(60, 250, 5)]
+    assert steps == sorted(steps, reverse=True)
+    assert voutToStep(1.0) == 255
+    assert voutToStep(0.5) == 255
+    assert voutToStep(1000.0) == 0
+
+@pytest.mark.parametrize('vout, step', [(6.0, 156), (12.0, 51), (18.0, 19), (24.0, 4)])
+def test_vout_to_step_values(vout, step):
+    assert voutToStep(vout) == step
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Smoke tests for the benchmark suite
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+import DcDcBenchmark
+from DcDcBenchmark import runBenchmarks, benchAnalytics, _summary, _timed
+
+
+def test_summary():
+    summary = _summary([3.0, 1.0, 2.0])
+    assert (summary['count'], summary['min'], summary['max'], summary['p50']) == (3, 1.0, 3.0, 2.0)
+    assert summary['mean'] == pytest.approx(2.0)
+    assert _summary([]) == {'count': 0}
+
+def test_timed_counts_iterations():
+    calls = []
+    result = _timed(lambda: calls.append(1), 7)
+    assert len(calls) == 7
+    assert result['iterations'] == 7
+    assert result['per_call'] == pytest.approx(result['total'] / 7)
+
+def test_timed_without_clock_resolution_is_valid_json(monkeypatch):
+    monkeypatch.setattr(DcDcBenchmark, 'perf_counter', lambda: 5.0)
+    result = _timed(lambda: None, 3)
+    assert result['per_second'] is None
+    json.dumps(result, allow_nan=False)
+
+def test_run_benchmarks_is_json_serialisable():
+    results = runBenchmarks(iterations=10, samples=3, timer=0.02, rows=1000)
+    assert set(results['results']) == {
+        'call_overhead', 'full_state', 'flash_table', 'connect', 'sampling_jitter', 'analytics',
+    }
+    assert results['results']['call_overhead']['GetVin']['iterations'] == 10
+    assert results['results']['flash_table']['variables'] > 0
+    assert results['results']['sampling_jitter']['count'] >= 1
+    json.dumps(results)
+
+def test_analytics_benchmark():
+    pytest.importorskip('numpy')
+    results = benchAnalytics(1000, 1)
+    assert results['rows'] == 1000
+    assert results['downsample']['samples_per_second'] > 0
+
+def test_command_line_writes_json(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = tmp_path / 'bench.json'
+    subprocess.check_call(
+        [sys.executable, 'DcDcBenchmark.py', '--iterations', '10', '--samples', '3', '--rows', '1000',
+         '--output', str(output)],
+        cwd=root,
+    )
+    with open(str(output)) as results:
+        assert 'results' in json.load(results)
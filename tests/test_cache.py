@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the refresh-epoch read cache
+"""
+
+import threading
+
+from time import sleep
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+
+
+class CountingBackend(SimulatedBackend):
+    """Simulator counting the GetVin calls that reach it, optionally slowly."""
+
+    delay = 0.0
+
+    def __init__(self, *args, **kwargs):
+        SimulatedBackend.__init__(self, *args, **kwargs)
+        self.vin_calls = 0
+
+    def dcdcGetVin(self):
+        self.vin_calls += 1
+        sleep(self.delay)
+        return SimulatedBackend.dcdcGetVin(self)
+
+
+@pytest.fixture
+def cached(clock):
+    backend = CountingBackend(clock=clock)
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    cache = converter.EnableReadCache()
+    yield converter, backend, cache
+    converter.CloseDevice()
+
+
+def test_reads_in_one_epoch_hit_the_cache(cached):
+    converter, backend, cache = cached
+    assert [converter.GetVin() for call in range(5)] == [12.0] * 5
+    assert backend.vin_calls == 1
+    assert (cache.hits, cache.misses) == (4, 1)
+
+def test_next_epoch_reads_again(cached, clock):
+    converter, backend, cache = cached
+    converter.GetVin()
+    backend.SetDeviceState(vin=13.0)
+    assert converter.GetVin() == 12.0
+    clock.advance(TIMER * 1.5)
+    assert converter.GetVin() == 13.0
+    assert backend.vin_calls == 2
+
+def test_set_commands_invalidate_affected_values(cached):
+    converter, backend, cache = cached
+    converter.GetVOut()
+    converter.GetVin()
+    converter.SetVOutVolatile(13.0)
+    assert 'dcdcGetVOut' not in cache.entries
+    assert 'dcdcGetVin' in cache.entries
+
+def test_concurrent_readers_share_one_call(clock):
+    backend = CountingBackend(clock=clock)
+    backend.delay = 0.1
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    cache = converter.EnableReadCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(converter.GetVin())) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    converter.CloseDevice()
+    assert results == [12.0] * 8
+    assert backend.vin_calls == 1
+    assert cache.misses == 1
+
+def test_errors_are_not_cached(cached, monkeypatch):
+    converter, backend, cache = cached
+    monkeypatch.setattr(CountingBackend, 'delay', 'not a number')
+    with pytest.raises(TypeError):
+        converter.GetVin()
+    monkeypatch.setattr(CountingBackend, 'delay', 0.0)
+    assert converter.GetVin() == 12.0
+    assert cache.misses == 2
+
+def test_remove_layer_stops_caching(cached):
+    converter, backend, cache = cached
+    converter.RemoveLayer(cache)
+    converter.GetVin()
+    converter.GetVin()
+    assert backend.vin_calls == 2
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the background, event-driven connection
+"""
+
+import threading
+
+from time import monotonic
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+
+
+def test_connect_false_does_not_open_the_device():
+    backend = SimulatedBackend()
+    converter = DcDcConverter(1, TIMER, 1, backend=backend, connect=False)
+    assert backend.opened_at is None
+    assert converter.refresh_origin is None
+
+def test_connect_resolves_after_the_first_refresh():
+    backend = SimulatedBackend()
+    converter = DcDcConverter(1, TIMER, 1, backend=backend, connect=False)
+    future = converter.Connect()
+    assert future.result(1) is converter
+    assert backend.refresh_count() > 0
+    assert converter.GetVin() == 12.0
+    converter.CloseDevice()
+
+def test_connect_waits_for_a_device_plugged_in_later():
+    backend = SimulatedBackend(devices=0)
+    converter = DcDcConverter(1, TIMER, 2, backend=backend, connect=False)
+    future = converter.Connect()
+    assert converter.Connect() is future
+    timer = threading.Timer(0.1, backend.Plug)
+    timer.start()
+    try:
+        assert future.result(2) is converter
+    finally:
+        timer.cancel()
+    assert converter.GetConnected() == 1
+    converter.CloseDevice()
+
+def test_connect_times_out_with_connection_error():
+    converter = DcDcConverter(1, TIMER, 0.1, backend=SimulatedBackend(devices=0), connect=False)
+    start = monotonic()
+    with pytest.raises(ConnectionError):
+        converter.Connect().result(2)
+    assert monotonic() - start < 1
+
+def test_connect_after_failure_starts_again():
+    backend = SimulatedBackend(devices=0)
+    converter = DcDcConverter(1, TIMER, 0.05, backend=backend, connect=False)
+    failed = converter.Connect()
+    with pytest.raises(ConnectionError):
+        failed.result(1)
+    backend.Plug()
+    retried = converter.Connect()
+    assert retried is not failed
+    assert retried.result(1) is converter
+    converter.CloseDevice()
+
+def test_reconnect_reopens_the_device(converter, backend):
+    opened_at = backend.opened_at
+    assert converter.Reconnect().result(1) is converter
+    assert backend.opened_at is not None and backend.opened_at >= opened_at
+    assert converter.GetConnected() == 1
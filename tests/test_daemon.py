@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the Unix socket daemon and its client
+"""
+
+import os
+import stat
+import errno
+import socket
+
+import pytest
+
+from DcDcActor import CommandActor
+from DcDcSimulator import SimulatedBackend
+from DcDcDaemon import DcDcDaemon, DcDcClient, DaemonError, _encode, _decode
+
+
+class RecordingBackend(SimulatedBackend):
+    """Simulator recording the values passed to SetVariableData, as the DLL would receive them."""
+
+    def __init__(self):
+        SimulatedBackend.__init__(self)
+        self.written = []
+
+    def dcdcSetVariableData(self, cnt, value):
+        self.written.append(value)
+        return SimulatedBackend.dcdcSetVariableData(self, cnt, value)
+
+
+@pytest.fixture
+def backend():
+    return RecordingBackend()
+
+@pytest.fixture
+def daemon(converter, tmp_path):
+    daemon = DcDcDaemon(converter, str(tmp_path / 'dcdc.sock'), mode=0o600)
+    yield daemon
+    daemon.close()
+
+@pytest.fixture
+def client(daemon):
+    client = DcDcClient(daemon.path, timeout=2)
+    yield client
+    client.close()
+
+
+def test_encoding_round_trip():
+    values = [None, -5, 2.5, 'VOut']
+    assert _decode(_encode(values)) == values
+    with pytest.raises(TypeError):
+        _encode([b'bytes'])
+
+def test_snapshot_and_wait(client):
+    assert client.snapshot().vin == 12.0
+    count = client.count
+    client.wait(timeout=1)
+    assert client.count > count
+
+def test_calls(client, backend):
+    assert client.GetVin() == 12.0
+    assert client.GetVersion() == '1.3'
+    client.SetEnabledOutput(0)
+    assert backend.device_state['enabled_output'] == 0
+
+def test_set_variable_data_sends_bytes(client, converter, backend):
+    converter.LoadFlashValues(wait=True, timeout=1)
+    assert client.SetVariableData(1, '13.00') == 1
+    assert backend.written == [b'13.00']
+
+@pytest.mark.parametrize('method', ['GetSnapshot', 'GetVariableTable', 'CloseDevice', 'Reconnect'])
+def test_unsupported_methods_are_refused(client, method):
+    with pytest.raises(AttributeError):
+        getattr(client, method)
+    with pytest.raises(DaemonError):
+        client.call(method)
+
+def test_errors_are_reported(client):
+    with pytest.raises(DaemonError):
+        client.SetEnabledOutput()
+
+def test_socket_permissions(daemon):
+    assert stat.S_IMODE(os.stat(daemon.path).st_mode) == 0o600
+
+def test_running_daemon_is_not_replaced(converter, daemon, client):
+    with pytest.raises(OSError) as err:
+        DcDcDaemon(converter, daemon.path)
+    assert err.value.errno == errno.EADDRINUSE
+    assert client.GetVin() == 12.0
+
+def test_stale_socket_is_replaced(converter, tmp_path):
+    path = str(tmp_path / 'dcdc.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    with DcDcDaemon(converter, path) as daemon:
+        client = DcDcClient(daemon.path, timeout=2)
+        assert client.GetVin() == 12.0
+        client.close()
+
+def test_close_removes_the_socket_and_actor(converter, tmp_path):
+    daemon = DcDcDaemon(converter, str(tmp_path / 'dcdc.sock'))
+    assert any(isinstance(layer, CommandActor) for layer in converter._layers)
+    daemon.close()
+    assert not os.path.exists(daemon.path)
+    assert converter._layers == []
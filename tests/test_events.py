@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for level, hysteresis and edge subscriptions
+"""
+
+import threading
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+from DcDcSampler import DcDcSampler
+from DcDcEvents import EventEngine
+
+
+@pytest.fixture
+def engine(converter):
+    engine = EventEngine(converter, DcDcSampler(converter, 2))
+    yield engine
+    engine.close()
+
+@pytest.fixture
+def snapshot(converter):
+    return converter.GetSnapshot()
+
+
+def feed(engine, snapshot, field, values):
+    for value in values:
+        engine.evaluate(snapshot._replace(**{field: value}))
+
+
+def test_below_with_hysteresis(engine, snapshot):
+    events = []
+    engine.subscribe('vin', events.append, below=11.0, hysteresis=0.5)
+    feed(engine, snapshot, 'vin', [12.0, 10.9, 11.2, 10.0, 11.6, 10.5])
+    assert [event.value for event in events] == [10.9, 10.5]
+    assert events[0].previous == 12.0
+
+def test_level_fires_on_first_evaluation(engine, snapshot):
+    events = []
+    engine.subscribe('vin', events.append, above=11.0)
+    feed(engine, snapshot, 'vin', [12.0, 12.5])
+    assert [(event.value, event.previous) for event in events] == [(12.0, None)]
+
+def test_edges(engine, snapshot):
+    rising, falling, changes = [], [], []
+    engine.subscribe('enabled_output', rising.append, edge='rising')
+    engine.subscribe('enabled_output', falling.append, edge='falling')
+    engine.subscribe('enabled_output', changes.append, edge='change')
+    feed(engine, snapshot, 'enabled_output', [1, 0, 0, 1])
+    assert [event.value for event in rising] == [1]
+    assert [event.value for event in falling] == [0]
+    assert [event.value for event in changes] == [0, 1]
+
+def test_flag_edge(engine, snapshot):
+    events = []
+    engine.subscribe('flags_status1.output', events.append, edge='falling')
+    feed(engine, snapshot, 'flags_status1', [0x08, 0x18, 0x10])
+    assert [(event.value, event.previous) for event in events] == [(0, 1)]
+
+def test_unsubscribe(engine, snapshot):
+    events = []
+    subscription = engine.subscribe('vin', events.append, edge='change')
+    feed(engine, snapshot, 'vin', [12.0, 11.0])
+    subscription.cancel()
+    feed(engine, snapshot, 'vin', [10.0])
+    assert len(events) == 1
+
+@pytest.mark.parametrize('field', ['vinn', 'flags_status1.outputt', 'vin.output'])
+def test_unknown_field_is_rejected(engine, field):
+    with pytest.raises(ValueError):
+        engine.subscribe(field, print, edge='change')
+
+def test_invalid_options_are_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.subscribe('vin', print, above=1.0, below=2.0)
+    with pytest.raises(ValueError):
+        engine.subscribe('vin', print, edge='sideways')
+
+def test_converter_subscribe(converter, backend):
+    triggered = threading.Event()
+    converter.Subscribe('vin', lambda event: triggered.set(), below=11.0)
+    backend.SetDeviceState(vin=10.0)
+    assert triggered.wait(2)
+
+def test_subscribe_before_connecting():
+    backend = SimulatedBackend(state={'vin': 10.0})
+    converter = DcDcConverter(1, TIMER, 1, backend=backend, connect=False)
+    triggered = threading.Event()
+    converter.Subscribe('vin', lambda event: triggered.set(), below=11.0)
+    assert not triggered.wait(3 * TIMER)
+    converter.Connect().result()
+    assert triggered.wait(2)
+    converter.CloseDevice()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for table-driven flag decoding
+"""
+
+import pytest
+
+from DcDcFlags import FlagDecoder, FLAG_NAMES, decoder
+
+
+def test_flags_of_a_byte():
+    assert decoder.flags('flags_status1', 0x18) == ('output', 'aux_vout')
+    assert decoder.flags('flags_status1', 0) == ()
+    assert decoder.flags('flags_timer', 0x81) == ('bit0', 'bit7')
+    assert decoder.flags('flags_status1', 0x104) == ('power_switch',)
+
+def test_enum_names():
+    assert decoder.name('mode', 1) == 'Automotive'
+    assert decoder.name('mode', 9) == 'ERROR'
+    assert decoder.name('state', 7) == '7'
+
+def test_custom_names():
+    custom = FlagDecoder(
+        flag_names={'flags_voltage': ('low', 'high', 'a', 'b', 'c', 'd', 'e', 'f')},
+        enum_names={'state': {7: 'Running'}},
+    )
+    assert custom.flags('flags_voltage', 3) == ('low', 'high')
+    assert custom.name('state', 7) == 'Running'
+    assert custom.flag_names['flags_status1'] == FLAG_NAMES['flags_status1']
+    with pytest.raises(ValueError):
+        FlagDecoder(flag_names={'flags_voltage': ('low',)})
+
+def test_decode_snapshot(converter):
+    decoded = decoder.decode(converter.GetSnapshot())
+    assert decoded['mode'] == 'Automotive'
+    assert set(decoded) == set(FLAG_NAMES) | {'mode', 'state'}
+    assert decoder.decode(converter.GetSnapshot()._asdict()) == decoded
+
+def test_flag_arrays():
+    numpy = pytest.importorskip('numpy')
+    flags = decoder.flagArrays('flags_status1', [0x08, 0x18, 0.0, 0x10c])
+    assert flags['output'].tolist() == [True, True, False, True]
+    assert flags['aux_vout'].tolist() == [False, True, False, False]
+    assert flags['power_switch'].dtype == numpy.bool_
+
+def test_name_array():
+    numpy = pytest.importorskip('numpy')
+    names = decoder.nameArray('mode', numpy.array([0, 3, 200], dtype=numpy.uint8))
+    assert names.tolist() == ['Dumb', 'UPS', 'ERROR']
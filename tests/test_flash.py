@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for transactional flash writes and wear accounting
+"""
+
+import threading
+import multiprocessing
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+from DcDcBackends import DcDcBackend, UnsupportedOperation
+from DcDcFlash import FlashWearCounter, FlashWearError, FlashWriteError, formatValue
+
+
+class NoFlashBackend(SimulatedBackend):
+    """Simulator without flash access, like the hidraw backend."""
+
+    dcdcLoadFlashValues = DcDcBackend.dcdcLoadFlashValues
+
+
+class RejectingBackend(SimulatedBackend):
+    """Simulator whose device refuses new VOut values."""
+
+    def dcdcSetVariableData(self, cnt, value):
+        if cnt == 1:
+            return 0
+        return SimulatedBackend.dcdcSetVariableData(self, cnt, value)
+
+
+def _increment(path, count):
+    counter = FlashWearCounter(path)
+    for increment in range(count):
+        counter.increment('sim://dcdc/1')
+
+
+@pytest.fixture
+def counter(tmp_path):
+    return FlashWearCounter(str(tmp_path / 'wear' / 'flash_writes.json'))
+
+
+@pytest.mark.parametrize('value, current, text', [
+    (12.5, '12.00', '12.50'), (3.14159, '1.5', '3.1'), (2.0, '7', '2.00'),
+    (True, '0', '1'), (60, '30', '60'), ('abc', 'x', 'abc'), (b'1.0', '2', '1.0'),
+])
+def test_format_value(value, current, text):
+    assert formatValue(value, current) == text
+
+def test_counter_persists_per_device(counter):
+    assert counter.count('sim://dcdc/1') == 0
+    assert counter.increment('sim://dcdc/1') == 1
+    assert counter.increment('sim://dcdc/1') == 2
+    assert counter.increment('sim://dcdc/2') == 1
+    assert FlashWearCounter(counter.path).count('sim://dcdc/1') == 2
+
+def test_counters_sharing_a_file_never_lose_increments(tmp_path):
+    path = str(tmp_path / 'flash_writes.json')
+    threads = [threading.Thread(target=_increment, args=(path, 50)) for thread in range(4)]
+    processes = [multiprocessing.Process(target=_increment, args=(path, 50)) for process in range(4)]
+    for worker in threads + processes:
+        worker.start()
+    for worker in threads + processes:
+        worker.join()
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert FlashWearCounter(path).count('sim://dcdc/1') == 400
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ['flash_writes.json', 'flash_writes.json.lock']
+
+def test_transaction_saves_once(converter, backend, counter):
+    with converter.FlashTransaction(counter) as flash:
+        flash.set('VOut', 12.5)
+        flash.set('TimerOffDelay', 90)
+        flash.SetVariableData(0, 1)
+    assert flash.saved
+    assert backend.flash_writes == 1
+    assert backend.flash[1][1] == '12.50'
+    assert backend.flash[9][1] == '90'
+    assert counter.count('sim://dcdc/1') == 1
+
+def test_unchanged_values_are_not_saved(converter, backend, counter):
+    with converter.FlashTransaction(counter) as flash:
+        flash.set('VOut', 12.0)
+        flash.set('TimerOffDelay', '60')
+        assert flash.diff() == {}
+    assert not flash.saved
+    assert backend.flash_writes == 0
+    assert counter.count('sim://dcdc/1') == 0
+
+def test_exception_discards_staged_values(converter, backend, counter):
+    with pytest.raises(RuntimeError):
+        with converter.FlashTransaction(counter) as flash:
+            flash.set('VOut', 13.0)
+            raise RuntimeError
+    assert backend.flash_writes == 0
+    assert backend.flash[1][1] == '12.00'
+
+def test_unknown_variable_raises_key_error(converter, counter):
+    with converter.FlashTransaction(counter) as flash:
+        with pytest.raises(KeyError):
+            flash.set('Nope', 1)
+
+def test_budget_is_enforced(converter, backend, counter):
+    counter.increment('sim://dcdc/1')
+    flash = converter.FlashTransaction(counter, budget=1)
+    flash.begin()
+    flash.set('VOut', 13.0)
+    with pytest.raises(FlashWearError):
+        flash.commit()
+    assert backend.flash_writes == 0
+
+    with converter.FlashTransaction(counter, budget=None) as flash:
+        flash.set('VOut', 13.0)
+    assert backend.flash_writes == 1
+
+def test_rejected_edit_is_not_saved(counter):
+    backend = RejectingBackend()
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    try:
+        with pytest.raises(FlashWriteError):
+            with converter.FlashTransaction(counter) as flash:
+                flash.set('VOut', 13.0)
+    finally:
+        converter.CloseDevice()
+    assert backend.flash_writes == 0
+    assert counter.count('sim://dcdc/1') == 0
+
+def test_backend_without_flash_raises_unsupported(counter):
+    converter = DcDcConverter(1, TIMER, 1, backend=NoFlashBackend())
+    try:
+        with pytest.raises(UnsupportedOperation) as err:
+            with converter.FlashTransaction(counter):
+                pass
+        assert 'not supported' in str(err.value)
+    finally:
+        converter.CloseDevice()
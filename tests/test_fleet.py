@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the multi-process fleet supervisor
+"""
+
+from time import sleep
+from functools import partial
+
+import pytest
+
+from DcDcFleet import DcDcFleet
+from DcDcSimulator import SimulatedBackend
+
+from conftest import TIMER
+
+
+class SlowIgnitionBackend(SimulatedBackend):
+    """Simulator whose GetVIgn takes longer than the tests are willing to wait."""
+
+    def dcdcGetVIgn(self):
+        sleep(0.3)
+        return 99.0
+
+
+class TornReadBackend(SimulatedBackend):
+    """Simulator whose state reads fail halfway through after the first one."""
+
+    reads = 0
+
+    def read_state(self):
+        self.reads += 1
+        values = SimulatedBackend.read_state(self)
+        if self.reads == 1:
+            return values
+        return self._torn()
+
+    def _torn(self):
+        yield -1.0
+        raise OSError("HID report lost")
+
+
+@pytest.fixture
+def fleet():
+    fleet = DcDcFleet(2, TIMER, 1, backend_factory=partial(SimulatedBackend, 2))
+    yield fleet
+    fleet.close()
+
+
+def test_call_and_broadcast(fleet):
+    assert fleet.call(0, 'GetVin') == 12.0
+    fleet.call(1, 'SetEnabledOutput', 0)
+    sleep(2 * TIMER)
+    assert fleet.broadcast('GetEnabledOutput') == [1, 0]
+
+def test_method_errors_are_returned(fleet):
+    with pytest.raises(AttributeError):
+        fleet.call(0, 'NoSuchMethod')
+    assert isinstance(fleet.broadcast('NoSuchMethod')[1], AttributeError)
+
+def test_snapshots_are_published(fleet):
+    sleep(3 * TIMER)
+    snapshots = fleet.snapshots()
+    assert [snapshot.vin for snapshot in snapshots] == [12.0, 12.0]
+    assert fleet.view().tolist()[1] == list(snapshots[1])
+
+def test_late_reply_is_not_taken_for_the_next_call():
+    with DcDcFleet(1, TIMER, 1, backend_factory=SlowIgnitionBackend) as fleet:
+        with pytest.raises(TimeoutError):
+            fleet.call(0, 'GetVIgn', timeout=0.05)
+        assert fleet.call(0, 'GetVin', timeout=2) == 12.0
+        assert fleet.call(0, 'GetMode', timeout=2) == 1
+
+        results = fleet.broadcast('GetVIgn', timeout=0.05)
+        assert isinstance(results[0], TimeoutError)
+        assert fleet.broadcast('GetVin', timeout=2) == [12.0]
+
+def test_snapshot_of_dead_worker_raises(fleet):
+    sleep(3 * TIMER)
+    fleet._processes[0].terminate()
+    fleet._processes[0].join()
+    #Left odd, as if the worker died in the middle of publishing
+    fleet._sequences[0] |= 1
+    with pytest.raises(ConnectionError):
+        fleet.snapshot(0)
+
+def test_failed_reads_are_not_published():
+    with DcDcFleet(1, TIMER, 1, backend_factory=TornReadBackend) as fleet:
+        sleep(3 * TIMER)
+        first = fleet.snapshot(0)
+        sleep(3 * TIMER)
+        assert fleet.snapshot(0) == first
+    assert first.vin == 12.0
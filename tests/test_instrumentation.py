@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for per-call instrumentation and latency histograms
+"""
+
+import pytest
+
+from DcDcInstrumentation import CallStats, BUCKET_BOUNDS
+
+
+def test_call_stats_histogram():
+    stats = CallStats('dcdcGetVin')
+    for elapsed in (5e-6, 15e-6, 15e-6, 3e-3, 20.0):
+        stats.record(elapsed, False)
+    stats.record(1e-3, True)
+    assert stats.calls == 6
+    assert stats.errors == 1
+    assert stats.minimum == 5e-6
+    assert stats.maximum == 20.0
+    assert stats.buckets[0] == 1
+    assert stats.buckets[1] == 2
+    assert stats.buckets[-1] == 1
+    assert stats.percentile(0.5) == 20e-6
+    assert stats.percentile(1.0) == 20.0
+    assert stats.mean() == pytest.approx(sum((5e-6, 15e-6, 15e-6, 3e-3, 20.0, 1e-3)) / 6)
+
+def test_empty_call_stats():
+    stats = CallStats('dcdcGetVin').as_dict()
+    assert stats['calls'] == 0
+    assert stats['p99'] == 0.0
+    assert len(stats['histogram']) == len(BUCKET_BOUNDS) + 1
+
+def test_counts_calls_reaching_the_backend(converter):
+    instrumentation = converter.EnableInstrumentation()
+    converter.GetVin()
+    converter.GetVin()
+    converter.GetSnapshot()
+    stats = instrumentation.stats()
+    assert stats['dcdcGetVin']['calls'] == 2
+    assert stats['read_state']['calls'] == 1
+    assert 'dcdcGetVOut' not in stats
+    assert instrumentation.stats('dcdcGetVOut')['calls'] == 0
+
+def test_errors_are_counted_and_reraised(converter, backend, monkeypatch):
+    def unplugged():
+        raise OSError("device unplugged")
+    monkeypatch.setattr(backend, 'dcdcGetVin', unplugged)
+    instrumentation = converter.EnableInstrumentation()
+    with pytest.raises(OSError):
+        converter.GetVin()
+    assert instrumentation.stats('dcdcGetVin')['errors'] == 1
+
+def test_hooks_see_every_call(converter):
+    instrumentation = converter.EnableInstrumentation()
+    calls = []
+    hook = lambda name, args, result, error, elapsed: calls.append((name, args, result, error))
+    instrumentation.addHook(hook)
+    instrumentation.addHook(lambda *args: 1 / 0)
+    converter.SetEnabledOutput(1)
+    converter.GetVin()
+    instrumentation.removeHook(hook)
+    converter.GetVin()
+    assert calls == [('dcdcSetEnabledOutput', (1,), None, None), ('dcdcGetVin', (), 12.0, None)]
+
+def test_reset_and_remove(converter, backend):
+    instrumentation = converter.EnableInstrumentation()
+    converter.GetVin()
+    instrumentation.reset()
+    assert instrumentation.stats() == {}
+    converter.RemoveLayer(instrumentation)
+    converter.GetVin()
+    assert instrumentation.stats() == {}
+    assert converter.DCDCUsbLib is backend
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for lazy module and DLL loading
+"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+import DcDcBackends
+
+#Modules only imported by the DcDcConverter methods that need them
+FEATURE_MODULES = (
+    'DcDcVariables', 'DcDcFlash', 'DcDcCache', 'DcDcActor', 'DcDcInstrumentation', 'DcDcEvents',
+    'DcDcFlags', 'DcDcTrace', 'DcDcProfiles',
+)
+
+
+def test_importing_the_converter_skips_feature_modules():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    loaded = subprocess.check_output(
+        [sys.executable, '-c', 'import sys, DcDcConverter; print(" ".join(sys.modules))'], cwd=root,
+    ).decode().split()
+    assert 'DcDcConverter' in loaded
+    assert not set(FEATURE_MODULES) & set(loaded)
+    assert 'ctypes.util' not in loaded
+    assert 'concurrent.futures.thread' not in loaded
+
+def test_features_load_on_first_use(converter):
+    layer = converter.EnableInstrumentation()
+    assert type(layer).__module__ == 'DcDcInstrumentation'
+    converter.RemoveLayer(layer)
+
+def test_dll_is_loaded_once_per_path(monkeypatch, tmp_path):
+    loaded = object()
+    path = str(tmp_path / 'DCDCUsbLib.dll')
+    monkeypatch.setattr(DcDcBackends, '_dll', loaded)
+    monkeypatch.setattr(DcDcBackends, '_dll_path', os.path.normcase(os.path.abspath(path)))
+    assert DcDcBackends._loadDll(path) is loaded
+    with pytest.raises(ValueError):
+        DcDcBackends._loadDll(str(tmp_path / 'other' / 'DCDCUsbLib.dll'))
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for configuration profiles
+"""
+
+import json
+import pickle
+
+from functools import partial
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend, DEFAULT_VARIABLES
+from DcDcFleet import DcDcFleet
+import DcDcProfiles
+from DcDcFlash import FlashWearCounter
+from DcDcProfiles import Profile, ProfileError, compileProfile, applyProfile, loadProfiles, rollout, schemaOf
+
+
+@pytest.fixture
+def counter(tmp_path):
+    return FlashWearCounter(str(tmp_path / 'flash_writes.json'))
+
+@pytest.fixture
+def table(converter):
+    converter.LoadFlashValues(wait=True, timeout=1)
+    return converter.GetVariableTable()
+
+
+def test_compile_encodes_values_like_the_device(table):
+    compiled = compileProfile(Profile('ups', {'Mode': 3, 'VOut': '12.5 V', 'VInLow': 11, 'TimerOffDelay': '120'}), table)
+    assert compiled.name == 'ups'
+    assert compiled.entries == ((0, '3'), (1, '12.50'), (2, '11.00'), (9, '120'))
+    assert compiled.schema == schemaOf(table)
+
+def test_compile_reports_every_error(table):
+    with pytest.raises(ProfileError) as err:
+        compileProfile({'Nope': 1, 'Mode': 1.5, 'VOut': 'high', 'TimerWait': 5}, table)
+    message = str(err.value)
+    assert 'Nope: no such variable' in message
+    assert 'Mode: expected an integer' in message
+    assert 'VOut: expected a number in V' in message
+    assert 'TimerWait' not in message
+    assert isinstance(err.value, ValueError)
+
+def test_apply_saves_once(converter, backend, table, counter):
+    compiled = compileProfile({'Mode': 3, 'VOut': 12.5, 'TimerWait': 5}, table)
+    changes = applyProfile(converter, compiled, counter)
+    assert changes == {0: ('1', '3'), 1: ('12.00', '12.50')}
+    assert backend.flash_writes == 1
+    assert backend.flash[0][1] == '3'
+
+    assert converter.ApplyProfile(compiled, counter) == {}
+    assert backend.flash_writes == 1
+
+def test_apply_uncompiled_profile(converter, backend, counter):
+    assert converter.ApplyProfile(Profile('long', {'TimerOffDelay': 300}), counter) == {9: ('60', '300')}
+    assert backend.flash[9][1] == '300'
+
+def test_apply_rejects_a_different_schema(converter, table, counter):
+    compiled = compileProfile({'Mode': 3}, table)
+    variables = DEFAULT_VARIABLES[:-1]
+    other = DcDcConverter(1, TIMER, 1, backend=SimulatedBackend(variables=variables))
+    try:
+        with pytest.raises(ProfileError):
+            applyProfile(other, compiled, counter)
+    finally:
+        other.CloseDevice()
+
+def test_load_profiles(tmp_path):
+    path = tmp_path / 'profiles.json'
+    path.write_text(json.dumps({'ups': {'Mode': 3}, 'car': {'Mode': 1}}))
+    profiles = loadProfiles(str(path))
+    assert profiles['ups'] == Profile('ups', {'Mode': 3})
+    assert set(profiles) == {'ups', 'car'}
+
+def test_rollout_to_converters(table, counter):
+    backends = [SimulatedBackend(), SimulatedBackend(variables=DEFAULT_VARIABLES[:-1])]
+    converters = [DcDcConverter(1, TIMER, 1, backend=backend) for backend in backends]
+    compiled = compileProfile({'TimerOffDelay': 90}, table)
+    try:
+        results = rollout(converters, compiled, counter)
+    finally:
+        for converter in converters:
+            converter.CloseDevice()
+    assert results[0] == {9: ('60', '90')}
+    assert isinstance(results[1], ProfileError)
+    assert [backend.flash_writes for backend in backends] == [1, 0]
+
+def test_rollout_shares_one_default_counter(table, tmp_path, monkeypatch):
+    counters = []
+    def counter():
+        counters.append(FlashWearCounter(str(tmp_path / 'flash_writes.json')))
+        return counters[-1]
+    monkeypatch.setattr(DcDcProfiles, 'FlashWearCounter', counter)
+
+    backends = [SimulatedBackend() for backend in range(4)]
+    converters = [DcDcConverter(1, TIMER, 1, backend=backend) for backend in backends]
+    compiled = compileProfile({'TimerOffDelay': 90}, table)
+    try:
+        results = rollout(converters, compiled)
+    finally:
+        for converter in converters:
+            converter.CloseDevice()
+    assert results == [{9: ('60', '90')}] * 4
+    assert len(counters) == 1
+    assert counters[0].count('sim://dcdc/1') == 4
+
+def test_counter_survives_pickling(counter):
+    counter.increment('sim://dcdc/1')
+    copy = pickle.loads(pickle.dumps(counter))
+    assert copy.path == counter.path
+    assert copy.increment('sim://dcdc/1') == 2
+
+def test_rollout_to_a_fleet(table, counter):
+    compiled = compileProfile({'TimerOffDelay': 90}, table)
+    with DcDcFleet(2, TIMER, 1, backend_factory=partial(SimulatedBackend, 2)) as fleet:
+        results = rollout(fleet, compiled, counter, timeout=10)
+    assert results == [{9: ('60', '90')}] * 2
+    assert counter.count('sim://dcdc/1') == 1
+    assert counter.count('sim://dcdc/2') == 1
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the background telemetry sampler
+"""
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+from DcDcSampler import DcDcSampler
+from DcDcSnapshot import SNAPSHOT_WIDTH
+
+
+@pytest.fixture
+def stepped(clock):
+    """Converter whose input voltage only changes when the test moves the clock."""
+    backend = SimulatedBackend(clock=clock)
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    yield converter, backend, clock
+    converter.CloseDevice()
+
+def _sample(sampler, backend, clock, vin):
+    backend.SetDeviceState(vin=vin)
+    clock.advance(1)
+    sampler.sample()
+
+
+def test_empty_sampler(converter):
+    sampler = DcDcSampler(converter, 4)
+    assert sampler.latest() is None
+    assert sampler.history() == []
+    assert len(sampler.window()) == 0
+
+def test_ring_buffer_keeps_the_most_recent_rows_in_order(stepped):
+    converter, backend, clock = stepped
+    sampler = DcDcSampler(converter, 3)
+    for vin in (10.0, 11.0, 12.0, 13.0, 14.0):
+        _sample(sampler, backend, clock, vin)
+
+    assert sampler.count == 5
+    assert sampler.latest().vin == 14.0
+    assert [snapshot.vin for snapshot in sampler.history()] == [12.0, 13.0, 14.0]
+    assert list(sampler.column('vin')) == [12.0, 13.0, 14.0]
+    assert list(sampler.column('vin', 2)) == [13.0, 14.0]
+    window = sampler.window(2)
+    assert window.shape == (2, SNAPSHOT_WIDTH)
+    assert window.tolist() == [list(snapshot) for snapshot in sampler.history(2)]
+
+def test_listeners_get_every_snapshot(stepped):
+    converter, backend, clock = stepped
+    sampler = DcDcSampler(converter, 2)
+    seen = []
+    sampler.addListener(lambda snapshot: seen.append(snapshot.vin))
+    sampler.addListener(lambda snapshot: 1 / 0)
+    _sample(sampler, backend, clock, 11.0)
+    sampler.removeListener(sampler._listeners[0])
+    _sample(sampler, backend, clock, 13.0)
+    assert seen == [11.0]
+
+def test_thread_samples_once_per_refresh(converter):
+    with DcDcSampler(converter, 100) as sampler:
+        count = 0
+        while count < 5:
+            count = sampler.wait(count, 1)
+            assert count, "sampler did not take a sample in time"
+    timestamps = list(sampler.column('timestamp'))
+    intervals = [later - earlier for earlier, later in zip(timestamps, timestamps[1:])]
+    assert min(intervals) > TIMER / 2
+    assert sampler._thread is None
+
+def test_thread_waits_for_the_connection():
+    converter = DcDcConverter(1, TIMER, 1, backend=SimulatedBackend(), connect=False)
+    with DcDcSampler(converter, 100) as sampler:
+        assert sampler.wait(0, 3 * TIMER) == 0
+        converter.Connect().result()
+        assert sampler.wait(0, 1), "sampler did not start sampling once connected"
+    converter.CloseDevice()
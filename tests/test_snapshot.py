@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the single-call snapshot API
+"""
+
+from time import time
+
+import pytest
+
+from DcDcSnapshot import DcDcSnapshot, SnapshotBuffer, SNAPSHOT_FIELDS, SNAPSHOT_WIDTH, SNAPSHOT_COLUMNS
+
+
+def test_snapshot_matches_getters(converter):
+    snapshot = converter.GetSnapshot()
+    assert isinstance(snapshot, DcDcSnapshot)
+    assert snapshot._fields == SNAPSHOT_FIELDS
+    assert snapshot.timestamp == pytest.approx(time(), abs=5)
+    assert snapshot.connected == converter.GetConnected()
+    assert snapshot.vin == converter.GetVin()
+    assert snapshot.vout == converter.GetVOut()
+    assert snapshot.mode == converter.GetMode()
+    assert snapshot.timer_hard_off == converter.GetTimerHardOff()
+
+def test_snapshot_record_has_no_instance_dict(converter):
+    assert not hasattr(converter.GetSnapshot(), '__dict__')
+
+def test_snapshot_reads_the_backend_once(converter, backend, monkeypatch):
+    calls = []
+    read_state = backend.read_state
+    monkeypatch.setattr(backend, 'read_state', lambda: calls.append(1) or read_state())
+    converter.GetSnapshot()
+    assert len(calls) == 1
+
+def test_snapshot_into_buffer_row(converter):
+    buffer = SnapshotBuffer(3)
+    converter.GetSnapshotInto(buffer, 1)
+    assert buffer[0].timestamp == 0
+    assert buffer[1].vin == converter.GetVin()
+    assert buffer[-2] == buffer[1]
+    with pytest.raises(IndexError):
+        buffer[3]
+
+def test_snapshot_into_plain_list(converter):
+    data = [0.0] * (2 * SNAPSHOT_WIDTH)
+    converter.GetSnapshotInto(data, 1)
+    assert data[SNAPSHOT_WIDTH + SNAPSHOT_COLUMNS['vin']] == converter.GetVin()
+    assert data[:SNAPSHOT_WIDTH] == [0.0] * SNAPSHOT_WIDTH
+
+def test_snapshot_batch_fills_rows_at_interval(converter):
+    buffer = SnapshotBuffer(4)
+    converter.GetSnapshotBatch(buffer, start=1, interval=0.01)
+    timestamps = list(buffer.column('timestamp'))
+    assert timestamps[0] == 0
+    assert all(later - earlier >= 0.005 for earlier, later in zip(timestamps[1:], timestamps[2:]))
+    assert list(buffer.column('connected')) == [0, 1, 1, 1]
+
+def test_buffer_view_shape():
+    buffer = SnapshotBuffer(2)
+    view = buffer.view()
+    assert view.shape == (2, SNAPSHOT_WIDTH)
+    buffer.data[SNAPSHOT_WIDTH + 2] = 5.0
+    assert view[1, 2] == 5.0
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the memory-mapped telemetry log
+"""
+
+import os
+import struct
+
+import pytest
+
+from DcDcTelemetryLog import (
+    TelemetryRecorder, TelemetryLog, HEADER, MAGIC, RECORD, RECORD_FIELDS, COUNT_OFFSET, _segmentFiles,
+)
+
+
+def _values(timestamp, vin=12.0):
+    return (timestamp, vin, 12.5, 12.0, 7, 1, 0x18, 0, 0, 0, 0, 0, 0, 0, 60, 3600)
+
+def _record(log, count, start=1000.0, segment_records=4):
+    with TelemetryRecorder(log, segment_records) as recorder:
+        for index in range(count):
+            recorder.appendValues(*_values(start + index, 10.0 + index))
+
+
+def test_recorder_rotates_segments(tmp_path):
+    directory = str(tmp_path / 'log')
+    _record(directory, 10)
+    segments = _segmentFiles(directory)
+    assert len(segments) == 3
+    assert os.path.basename(segments[1]) == 'dcdc-00000000001004000000.tlm'
+    with open(segments[-1], 'rb') as segment:
+        header = segment.read(HEADER.size)
+    magic, version, record_size, capacity, count = HEADER.unpack(header)
+    assert (magic, record_size, capacity, count) == (MAGIC, RECORD.size, 4, 2)
+
+def test_segments_started_at_the_same_time_are_kept(tmp_path):
+    directory = str(tmp_path / 'log')
+    with TelemetryRecorder(directory, 4) as recorder:
+        for index in range(10):
+            recorder.appendValues(*_values(1000.0, 10.0 + index))
+    segments = _segmentFiles(directory)
+    assert [os.path.basename(segment) for segment in segments] == [
+        'dcdc-00000000001000000000.tlm', 'dcdc-00000000001000000000_001.tlm', 'dcdc-00000000001000000000_002.tlm',
+    ]
+    counts = []
+    for path in segments:
+        with open(path, 'rb') as segment:
+            counts.append(HEADER.unpack(segment.read(HEADER.size))[-1])
+    assert counts == [4, 4, 2]
+
+def test_recorder_appends_to_the_last_segment(tmp_path):
+    directory = str(tmp_path / 'log')
+    _record(directory, 2)
+    _record(directory, 1, start=2000.0)
+    segments = _segmentFiles(directory)
+    assert len(segments) == 1
+    with open(segments[0], 'rb') as segment:
+        segment.seek(COUNT_OFFSET)
+        assert struct.unpack('<Q', segment.read(8))[0] == 3
+
+def test_recorder_rejects_foreign_files(tmp_path):
+    directory = tmp_path / 'log'
+    directory.mkdir()
+    (directory / 'dcdc-00000000000000000001.tlm').write_bytes(b'\0' * 128)
+    with pytest.raises(ValueError):
+        TelemetryRecorder(str(directory))
+
+def test_append_snapshot(tmp_path, converter):
+    pytest.importorskip('numpy')
+    directory = str(tmp_path / 'log')
+    snapshot = converter.GetSnapshot()
+    with TelemetryRecorder(directory) as recorder:
+        recorder.append(snapshot)
+    records = TelemetryLog(directory).readArray()
+    assert len(records) == 1
+    for field in RECORD_FIELDS:
+        assert records[field][0] == pytest.approx(getattr(snapshot, field))
+
+def test_read_time_ranges_across_segments(tmp_path):
+    pytest.importorskip('numpy')
+    directory = str(tmp_path / 'log')
+    _record(directory, 10)
+    log = TelemetryLog(directory)
+    assert len(log) == 10
+    assert [len(view) for view in log.read()] == [4, 4, 2]
+    assert list(log.readArray(1003.0, 1006.0)['timestamp']) == [1003.0, 1004.0, 1005.0]
+    assert list(log.readArray(1005.5)['vin']) == [16.0, 17.0, 18.0, 19.0]
+    assert len(log.readArray(2000.0)) == 0
+    assert log.read(end=1001.0)[0].base is not None
+
+def test_refresh_picks_up_new_records(tmp_path):
+    pytest.importorskip('numpy')
+    directory = str(tmp_path / 'log')
+    recorder = TelemetryRecorder(directory, 4)
+    recorder.appendValues(*_values(1000.0))
+    log = TelemetryLog(directory)
+    assert len(log) == 1
+    for index in range(1, 6):
+        recorder.appendValues(*_values(1000.0 + index))
+    recorder.flush()
+    log.refresh()
+    assert len(log) == 6
+    assert log.index[-1][:2] == (1004.0, 1005.0)
+    recorder.close()
+    log.close()
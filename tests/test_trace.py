@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for trace recording and replay
+"""
+
+from ctypes import create_string_buffer, c_int
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+from DcDcTrace import ReplayBackend, readTrace, _pack, _unpack
+
+
+@pytest.fixture
+def trace(tmp_path, clock, monkeypatch):
+    """Trace of a short session: three VIn readings, a variable read and a failed call."""
+    backend = SimulatedBackend(clock=clock)
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    def unplugged():
+        raise OSError("device unplugged")
+    monkeypatch.setattr(backend, 'dcdcGetVOut', unplugged)
+
+    path = str(tmp_path / 'session.trace')
+    recorder = converter.EnableTrace(path)
+    for vin in (12.0, 12.5, 13.0):
+        backend.SetDeviceState(vin=vin)
+        clock.advance(1)
+        converter.GetVin()
+    converter.LoadFlashValues(wait=True, timeout=1)
+    name, value, unit, comment = (create_string_buffer(256) for buffer in range(4))
+    converter.GetVariableData(1, name, value, unit, comment)
+    with pytest.raises(OSError):
+        converter.GetVOut()
+    converter.RemoveLayer(recorder)
+    converter.CloseDevice()
+    return path
+
+
+@pytest.mark.parametrize('value', [
+    None, 0, -5, 2 ** 40, 1.5, b'\x00\xff', 'VOut', (1, 'a', (None, 2.0)), (),
+])
+def test_pack_round_trip(value):
+    parts = []
+    _pack(value, parts)
+    data = b''.join(parts)
+    assert _unpack(data, 0) == (value, len(data))
+
+def test_pack_ctypes_values():
+    parts = []
+    _pack(c_int(7), parts)
+    assert _unpack(b''.join(parts), 0)[0] == 7
+    with pytest.raises(TypeError):
+        _pack(object(), [])
+
+def test_remove_layer_closes_the_trace(tmp_path, converter):
+    recorder = converter.EnableTrace(str(tmp_path / 'closed.trace'))
+    converter.RemoveLayer(recorder)
+    assert recorder._file.closed
+    converter.GetVin()
+    assert recorder.records == 0
+
+def test_read_trace(trace):
+    records = list(readTrace(trace))
+    vins = [record for record in records if record.name == 'dcdcGetVin']
+    assert [record.result for record in vins] == [12.0, 12.5, 13.0]
+    assert all(later.time >= earlier.time for earlier, later in zip(records, records[1:]))
+
+    read, = [record for record in records if record.name == 'dcdcGetVariableData']
+    assert read.args == (1, None, None, None, None)
+    assert read.outs[:3] == (b'VOut', b'12.00', b'V')
+    failed, = [record for record in records if record.name == 'dcdcGetVOut']
+    assert failed.error == ('OSError', 'device unplugged')
+
+def test_read_trace_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.trace'
+    path.write_bytes(b'not a trace')
+    with pytest.raises(ValueError):
+        list(readTrace(str(path)))
+
+def test_replay_as_fast_as_possible(trace):
+    backend = ReplayBackend(trace, speed=None)
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    assert [converter.GetVin() for call in range(4)] == [12.0, 12.5, 13.0, 13.0]
+
+    value = create_string_buffer(256)
+    converter.GetVariableData(1, create_string_buffer(256), value, create_string_buffer(256), create_string_buffer(256))
+    assert value.value == b'12.00'
+    with pytest.raises(OSError):
+        converter.GetVOut()
+    converter.CloseDevice()
+
+def test_replay_is_deterministic(trace):
+    runs = []
+    for run in range(2):
+        backend = ReplayBackend(trace, speed=None)
+        runs.append([backend.dcdcGetVin() for call in range(3)])
+    assert runs[0] == runs[1]
+
+def test_replay_missing_functions(trace):
+    assert ReplayBackend(trace, speed=None).dcdcGetVIgn() is None
+    assert ReplayBackend(trace, speed=None).dcdcGetConnected() == 1
+    with pytest.raises(LookupError):
+        ReplayBackend(trace, speed=None, strict=True).dcdcGetVIgn()
+
+def test_replay_in_time(trace):
+    backend = ReplayBackend(trace, speed=1e9)
+    assert backend.dcdcGetVin() == 13.0
+    assert backend.finished()
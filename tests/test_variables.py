@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the cached flash variable table
+"""
+
+import pytest
+
+from DcDcVariables import parseValue
+
+
+@pytest.mark.parametrize('text, value', [('12', 12), (' -3 ', -3), ('12.50', 12.5), ('abc', 'abc'), ('', '')])
+def test_parse_value(text, value):
+    assert parseValue(text) == value
+    assert type(parseValue(text)) is type(value)
+
+def test_table_is_indexed_by_id_and_name(converter):
+    converter.LoadFlashValues(wait=True, timeout=1)
+    table = converter.GetVariableTable()
+    assert table['VOut'] is table[1]
+    assert table['VOut'].value == 12.0
+    assert table['VOut'].unit == 'V'
+    assert table.get('Nope', 'default') == 'default'
+    assert 'Mode' in table and 0 in table
+    assert table.values()['TimerOffDelay'] == 60
+
+def test_table_is_cached_until_the_next_load(converter):
+    converter.LoadFlashValues(wait=True, timeout=1)
+    table = converter.GetVariableTable()
+    assert converter.GetVariableTable() is table
+    converter.LoadFlashValues(wait=True, timeout=1)
+    assert converter.GetVariableTable() is not table
+
+def test_table_read_while_loading_is_not_cached(converter):
+    converter.LoadFlashValues()
+    assert converter.GetVariableTable()['VOut'].value == ''
+    while converter.GetLoadState() < 100:
+        pass
+    assert converter.GetVariableTable()['VOut'].value == 12.0
+
+def test_set_variable_data_updates_the_table(converter):
+    converter.LoadFlashValues(wait=True, timeout=1)
+    table = converter.GetVariableTable()
+    converter.SetVariableData(1, b'13.00')
+    assert table['VOut'].value == 13.0
+    assert converter.GetVariableTable()['VOut'].text == '13.00'
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the VOut ramp and band-hold controller
+"""
+
+import threading
+
+from time import sleep
+
+import pytest
+
+from DcDcSimulator import SimulatedBackend
+from DcDcVoutController import VoutController
+
+from conftest import TIMER
+
+
+@pytest.fixture
+def backend():
+    return SimulatedBackend(state={'vout': 24.98})
+
+
+def test_ramp_within_half_a_step_returns(converter):
+    controller = VoutController(converter)
+    thread = threading.Thread(target=controller.ramp, args=(25.03,), daemon=True)
+    thread.start()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert controller.commands == 0
+
+def test_ramp_reaches_target(converter):
+    result = VoutController(converter, slew_rate=None).ramp(23.5)
+    assert result.settled
+    assert result.vout == pytest.approx(23.5)
+    assert result.set_commands == 1
+
+def test_slew_limited_ramp_is_bounded(converter):
+    controller = VoutController(converter, slew_rate=10.0)
+    result = controller.ramp(24.0)
+    assert result.settled
+    #0.98 V at 0.2 V per tick
+    assert 4 <= result.commands <= 7
+
+def test_single_step_uses_incdec(converter):
+    result = VoutController(converter, slew_rate=None).ramp(25.08)
+    assert result.incdec_commands == 1
+    assert result.set_commands == 0
+
+def test_hold_corrects_drift(converter, backend):
+    controller = VoutController(converter)
+    controller.startHold(24.98, band=0.2)
+    try:
+        backend.SetDeviceState(vout=23.0)
+        for attempt in range(100):
+            if controller.corrections:
+                break
+            sleep(TIMER)
+    finally:
+        controller.stopHold()
+    assert controller.corrections >= 1
+    assert backend.device_state['vout'] == pytest.approx(24.98)
+
+def test_hold_does_not_count_offsets_below_a_step(converter, backend):
+    controller = VoutController(converter)
+    controller.startHold(24.98, band=0.02)
+    try:
+        backend.SetDeviceState(vout=25.02)
+        sleep(5 * TIMER)
+    finally:
+        controller.stopHold()
+    assert controller.corrections == 0
+    assert controller.commands == 0
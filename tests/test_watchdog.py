@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+@date Created on 16 Oct 2026
+
+@author Jack Andrews <jackjackandrews2@gmail.com>
+
+@brief Tests for the reconnect watchdog and volatile settings restoration
+"""
+
+import threading
+
+from time import sleep, monotonic
+
+import pytest
+
+from conftest import TIMER
+from DcDcConverter import DcDcConverter
+from DcDcSimulator import SimulatedBackend
+from DcDcWatchdog import DcDcWatchdog
+
+
+@pytest.fixture
+def quick(backend):
+    """Converter giving up quickly on each reconnection attempt."""
+    converter = DcDcConverter(1, TIMER, 0.05, backend=backend)
+    yield converter
+    converter.CloseDevice()
+
+def _reset(backend):
+    #What the converter looks like after a brownout: volatile settings back to their defaults
+    backend.SetDeviceState(vout=12.0, enabled_output=0, enabled_aux_vout=0)
+
+
+def test_volatile_settings_are_recorded(converter):
+    converter.SetVOutVolatile(13.0)
+    converter.IncDecVOutVolatile(1)
+    converter.IncDecVOutVolatile(1)
+    converter.IncDecVOutVolatile(0)
+    converter.SetEnabledOutput(1)
+    assert converter.volatile_settings == {'SetVOutVolatile': 13.0, 'IncDecVOutVolatile': 1, 'SetEnabledOutput': 1}
+    converter.SetVOutVolatile(12.5)
+    assert 'IncDecVOutVolatile' not in converter.volatile_settings
+
+def test_restore_volatile_settings(converter, backend):
+    converter.SetVOutVolatile(13.0)
+    converter.IncDecVOutVolatile(1)
+    converter.SetEnabledAuxVOut(1)
+    _reset(backend)
+    converter.RestoreVolatileSettings(('SetVOutVolatile', 'IncDecVOutVolatile'))
+    assert backend.device_state['vout'] == pytest.approx(13.1)
+    assert backend.device_state['enabled_aux_vout'] == 0
+
+def test_steps_are_replayed_only_after_a_reset(clock):
+    backend = SimulatedBackend(clock=clock)
+    converter = DcDcConverter(1, TIMER, 1, backend=backend)
+    converter.IncDecVOutVolatile(1)
+    converter.IncDecVOutVolatile(1)
+    for reconnect in range(3):
+        clock.advance(TIMER * 1.5)
+        converter.RestoreVolatileSettings(('IncDecVOutVolatile',))
+        assert backend.device_state['vout'] == pytest.approx(12.2)
+
+    _reset(backend)
+    clock.advance(TIMER * 1.5)
+    converter.RestoreVolatileSettings(('IncDecVOutVolatile',))
+    assert backend.device_state['vout'] == pytest.approx(12.2)
+    converter.CloseDevice()
+
+def test_check_reports_a_lost_device(converter, backend):
+    watchdog = DcDcWatchdog(converter)
+    assert watchdog.check() is None
+    backend.Unplug()
+    assert watchdog.check() == 'not connected'
+
+def test_check_reports_stale_refreshes(clock):
+    converter = DcDcConverter(1, TIMER, 1, backend=SimulatedBackend(clock=clock))
+    watchdog = DcDcWatchdog(converter, stale_periods=3)
+    assert watchdog.check() is None
+    sleep(4 * TIMER)
+    assert watchdog.check().startswith('no refresh for')
+    clock.advance(TIMER * 1.5)
+    assert watchdog.check() is None
+    converter.CloseDevice()
+
+def test_reconnects_and_restores_settings(quick, backend):
+    quick.SetVOutVolatile(13.0)
+    quick.SetEnabledOutput(1)
+    quick.SetEnabledPowerSwitch(1)
+
+    events = []
+    reconnected = threading.Event()
+    def listener(event):
+        events.append(event)
+        if event.kind == 'reconnected':
+            reconnected.set()
+
+    with DcDcWatchdog(quick, interval=0.01, backoff_min=0.01, backoff_max=0.02) as watchdog:
+        watchdog.addListener(listener)
+        backend.Unplug()
+        _reset(backend)
+        backend.SetDeviceState(enabled_power_switch=0)
+        sleep(0.2)
+        assert watchdog.stats()['down'] > 0
+        backend.Plug()
+        assert reconnected.wait(2)
+
+    assert [event.kind for event in events] == ['disconnected', 'reconnected']
+    assert events[0].reason == 'not connected'
+    assert events[1].attempts >= 2
+    assert events[1].downtime >= 0.1
+    assert backend.device_state['vout'] == 13.0
+    assert backend.device_state['enabled_output'] == 1
+    #Not restored by default: it would pulse the PC's power button
+    assert backend.device_state['enabled_power_switch'] == 0
+
+    stats = watchdog.stats()
+    assert (stats['disconnects'], stats['reconnects'], stats['down']) == (1, 1, 0.0)
+    assert stats['downtime_max'] == stats['downtime_last'] == stats['downtime_total']
+
+def test_stop_interrupts_reconnection(quick, backend):
+    watchdog = DcDcWatchdog(quick, interval=0.01, backoff_min=0.01)
+    watchdog.start()
+    backend.Unplug()
+    sleep(0.1)
+    watchdog.stop()
+    assert watchdog.disconnects == 1
+    assert watchdog.reconnects == 0
+
+def test_stop_does_not_wait_for_the_connection_timeout(backend):
+    converter = DcDcConverter(1, TIMER, 30, backend=backend)
+    watchdog = DcDcWatchdog(converter, interval=0.01, backoff_min=0.01)
+    watchdog.start()
+    backend.Unplug()
+    sleep(0.1)
+    started = monotonic()
+    watchdog.stop()
+    assert monotonic() - started < 1
+    assert watchdog.reconnects == 0
+    #Let the abandoned connection thread finish
+    backend.Plug()
+    converter.Connect().result(2)
+    converter.CloseDevice()
+
+def test_unexpected_errors_do_not_end_the_recovery(quick, backend, monkeypatch):
+    reconnect = quick.Reconnect
+    failures = []
+    def flaky():
+        if not failures:
+            failures.append(1)
+            raise OSError("bus reset")
+        return reconnect()
+
+    with DcDcWatchdog(quick, interval=0.01, backoff_min=0.01, backoff_max=0.02) as watchdog:
+        monkeypatch.setattr(quick, 'Reconnect', flaky)
+        backend.Unplug()
+        sleep(0.05)
+        backend.Plug()
+        deadline = monotonic() + 2
+        while watchdog.reconnects == 0 and monotonic() < deadline:
+            sleep(0.01)
+    assert failures
+    assert watchdog.reconnects == 1